@@ -6,23 +6,22 @@ import uuid
 import logging
 import re
 import shutil
+import time
 from pathlib import Path
 from typing import Any, Literal
 from urllib.parse import quote
 from datetime import datetime
 
 import httpx
-from fastapi import APIRouter, File, HTTPException, UploadFile
+from fastapi import APIRouter, BackgroundTasks, File, Header, HTTPException, Query, Response, UploadFile
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field, model_validator
 
-from backend.app import models, question_bank, reaction_time, reporting, scoring_rules, storage
-from backend.app.llm_judge import judge_answer
-from backend.app.transcribe import transcribe_audio
+from backend.app import models, pipeline, question_bank, reporting, scoring_queue, storage, uploads
 
-router = APIRouter()
+router = APIRouter(route_class=uploads.UploadRoute)
 logger = logging.getLogger(__name__)
 
-QUESTION_BANK = question_bank.load_all_questions()
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 FOCUS_LEVELS_PATH = PROJECT_ROOT / "frontend" / "focus-levels.js"
 FOCUS_IMAGE_DIR = PROJECT_ROOT / "static" / "images" / "games" / "spot-the-diff"
@@ -225,15 +224,23 @@ def render_legacy_focus_levels_js(payload: FocusLevelUpdateRequest) -> str:
 
 
 @router.post("/focus-level-image")
+@uploads.limit_request_body(uploads.MAX_IMAGE_BYTES)
 async def upload_focus_level_image(image: UploadFile = File(...)) -> dict[str, str]:
     if image.content_type and not image.content_type.startswith("image/"):
         raise HTTPException(status_code=400, detail="Only image uploads are allowed")
     safe_name = sanitize_focus_image_filename(image.filename)
-    destination = unique_focus_image_path(safe_name)
-    content = await image.read()
-    if not content:
-        raise HTTPException(status_code=400, detail="Uploaded image is empty")
-    destination.write_bytes(content)
+    target = unique_focus_image_path(safe_name)
+    try:
+        stored = await uploads.save_upload(
+            image,
+            target.parent,
+            target.name,
+            kinds=uploads.IMAGE_KINDS,
+            max_bytes=uploads.MAX_IMAGE_BYTES,
+        )
+    except uploads.UploadError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail) from None
+    destination = stored.path
     return {
         "image": f"{FOCUS_IMAGE_URL_PREFIX}{quote(destination.name)}",
         "filename": destination.name,
@@ -265,32 +272,64 @@ async def create_session(payload: models.SessionCreateRequest) -> models.Session
     return models.SessionCreateResponse(session_id=session_id)
 
 
+def _session_summary(row: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "session_id": row.get("id"),
+        "patient_id": row.get("patient_id"),
+        "patient_name": row.get("patient_name") or row.get("patient_id"),
+        "patient_gender": row.get("patient_gender"),
+        "created_at": row.get("created_at"),
+    }
+
+
 @router.get("/sessions")
 async def list_sessions(
+    response: Response,
     patient_id: str | None = None,
     patient_name: str | None = None,
     limit: int = 200,
-) -> list[dict[str, Any]]:
-    rows = storage.list_sessions(patient_id=patient_id, patient_name=patient_name, limit=limit)
-    output: list[dict[str, Any]] = []
-    for row in rows:
-        config_raw = row.get("config_json")
-        try:
-            config = json.loads(config_raw) if config_raw else {}
-        except json.JSONDecodeError:
-            config = {}
-
-        resolved_name = config.get("name") or row.get("patient_id")
-        output.append(
-            {
-                "session_id": row.get("id"),
-                "patient_id": row.get("patient_id"),
-                "patient_name": resolved_name,
-                "patient_gender": config.get("gender"),
-                "created_at": row.get("created_at"),
-            }
+    after: str | None = None,
+    output_format: Literal["json", "ndjson"] = Query("json", alias="format"),
+) -> Any:
+    """List sessions newest first.
+
+    Plain listings page with ``after`` (the ``X-Next-Cursor`` header of the
+    previous page). ``format=ndjson`` streams every matching session, one
+    JSON object per line, paging through storage internally.
+    """
+    if output_format == "ndjson":
+        if patient_name or after:
+            raise HTTPException(status_code=400, detail="ndjson export supports patient_id only")
+        lines = (
+            json.dumps(_session_summary(row), ensure_ascii=False) + "\n"
+            for row in storage.iter_sessions(patient_id=patient_id)
         )
-    return output
+        return StreamingResponse(lines, media_type="application/x-ndjson")
+
+    try:
+        cursor = storage.decode_cursor(after) if after else None
+        rows = storage.list_sessions(
+            patient_id=patient_id, patient_name=patient_name, limit=limit, after=cursor
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from None
+    page_size = max(1, min(limit, storage.SESSION_PAGE_MAX))
+    if rows and len(rows) == page_size and not (patient_name or "").strip():
+        response.headers["X-Next-Cursor"] = storage.encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+    return [_session_summary(row) for row in rows]
+
+
+@router.get("/patients/{patient_id}/timeline", response_model=models.TimelineResponse)
+async def patient_timeline(
+    patient_id: str,
+    after: str | None = None,
+    limit: int = Query(50, ge=1, le=500),
+) -> models.TimelineResponse:
+    try:
+        cursor = storage.decode_cursor(after) if after else None
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from None
+    return models.TimelineResponse(**reporting.build_timeline(patient_id, after=cursor, limit=limit))
 
 
 @router.get("/sessions/{session_id}/next", response_model=models.QuestionResponse)
@@ -299,7 +338,7 @@ async def next_question(session_id: str) -> models.QuestionResponse:
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     instrument = session.get("instrument")
-    questions = question_bank.filter_questions(QUESTION_BANK, instrument)
+    questions = question_bank.get_question_bank().for_instrument(instrument)
     responses = storage.list_responses(session_id)
     index = len(responses)
     if index >= len(questions):
@@ -309,21 +348,18 @@ async def next_question(session_id: str) -> models.QuestionResponse:
 
 
 @router.post("/sessions/{session_id}/responses", response_model=models.ResponseCreateResponse)
+@uploads.limit_request_body(uploads.MAX_AUDIO_BYTES)
 async def submit_response(
     session_id: str,
     question_id: str,
+    response: Response,
+    background_tasks: BackgroundTasks,
     reaction_time_vad_ms: float | None = None,
     manual_confirmed: bool | None = None,
     answer_text: str | None = None,
     audio: UploadFile = File(...),
 ) -> models.ResponseCreateResponse:
     response_id = str(uuid.uuid4())
-    upload_dir = Path("./data/uploads")
-    upload_dir.mkdir(parents=True, exist_ok=True)
-    audio_path = upload_dir / f"{response_id}_{audio.filename}"
-    content = await audio.read()
-    audio_path.write_bytes(content)
-
     session = storage.get_session(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
@@ -332,73 +368,62 @@ async def submit_response(
     except json.JSONDecodeError:
         config = {}
 
-    question = next((q for q in QUESTION_BANK if q["question_id"] == question_id), None)
+    question = question_bank.get_question_bank().get(question_id)
     if not question:
         raise HTTPException(status_code=404, detail="Question not found")
 
-    exclude_from_scoring = bool(question.get("exclude_from_scoring"))
-    recording_disabled = bool(question.get("recording_disabled"))
-
-    transcript = str(answer_text).strip() if answer_text is not None else None
-    if transcript == "":
-        transcript = None
-    transcription_payload: dict[str, Any] | None = None
-    openai_api_key = os.getenv("OPENAI_API_KEY")
-    if transcript and not recording_disabled:
-        transcription_payload = None
-    elif openai_api_key and not recording_disabled:
-        transcription_payload = transcribe_audio(
-            str(audio_path),
-            response_format="verbose_json",
-            timestamp_granularities=["word"],
+    try:
+        stored = await uploads.save_upload(
+            audio,
+            Path("./data/uploads"),
+            response_id,
+            kinds=uploads.AUDIO_KINDS,
+            max_bytes=uploads.MAX_AUDIO_BYTES,
+            # A quick tap or a failed recorder sends no audio; score it
+            # like a failed transcription rather than losing the answer.
+            allow_empty=True,
         )
-        transcript = transcription_payload.get("text") if transcription_payload else None
-    elif not openai_api_key and not recording_disabled:
-        logger.warning(
-            "OPENAI_API_KEY missing; skipping transcription for session_id=%s question_id=%s",
-            session_id,
-            question_id,
+    except uploads.UploadError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail) from None
+    audio_path = str(stored.path) if stored else None
+
+    if scoring_queue.scoring_mode() == "queue":
+        storage.save_pending_response(
+            response_id=response_id,
+            session_id=session_id,
+            question_id=question_id,
+            reaction_time_vad_ms=reaction_time_vad_ms,
+            manual_confirmed=manual_confirmed,
+            audio_path=audio_path,
+            answer_text=answer_text,
+        )
+        scoring_queue.notify()
+        return models.ResponseCreateResponse(
+            response_id=response_id,
+            transcript=None,
+            reaction_time_whisper_ms=None,
+            reaction_time_vad_ms=reaction_time_vad_ms,
+            manual_confirmed=manual_confirmed,
+            rule_score=None,
+            llm_judge=None,
+            scoring_status="pending",
         )
 
-    reaction_time_whisper_ms = (
-        reaction_time.reaction_time_whisper_ms(transcription_payload)
-        if transcription_payload
-        else None
+    result = await pipeline.score_submission(
+        session_id,
+        question,
+        config,
+        audio_path,
+        answer_text,
+        allow_defer=True,
+        audio_digest=stored.sha256 if stored else None,
     )
-
-    rule_score = None
-    llm_judge = None
-    if transcript and not exclude_from_scoring:
-        context = {
-            "timezone": os.getenv("COGSCREEN_TIMEZONE", "Asia/Taipei"),
-            "patient_age": config.get("age"),
-            "patient_phone": config.get("phone"),
-            "patient_address": config.get("address"),
-            "patient_birthday": config.get("birthday"),
-            "patient_mother_name": config.get("mother_name"),
-            "president_current": config.get("president_current"),
-            "president_previous": config.get("president_previous"),
-        }
-        prepared_rule, skip_scoring = scoring_rules.prepare_rule(question["scoring_rule"], context)
-        if not skip_scoring:
-            rule_score = scoring_rules.score_answer(transcript, prepared_rule)
-        if os.getenv("OPENAI_API_KEY"):
-            llm_expected = []
-            raw_expected = prepared_rule.get("expected", [])
-            if isinstance(raw_expected, list):
-                for item in raw_expected:
-                    text = str(item).strip()
-                    if not text:
-                        continue
-                    if text.startswith("__") and text.endswith("__"):
-                        continue
-                    llm_expected.append(text)
-            llm_judge = judge_answer(
-                transcript,
-                llm_expected,
-                prepared_rule.get("type", "exact"),
-                question_text=str(question.get("text") or ""),
-            )
+    transcript = result["transcript"]
+    reaction_time_whisper_ms = result["reaction_time_whisper_ms"]
+    rule_score = result["rule_score"]
+    llm_judge = result["llm_judge"]
+    timings = result["timings"]
+    save_started = time.perf_counter()
 
     storage.save_response(
         response_id=response_id,
@@ -410,26 +435,52 @@ async def submit_response(
         manual_confirmed=manual_confirmed,
         rule_score=rule_score,
         llm_judge=llm_judge,
+        reaction_time_server_vad_ms=result["reaction_time_server_vad_ms"],
     )
+    timings["save"] = round((time.perf_counter() - save_started) * 1000.0, 2)
+    if result["deferred_judge"]:
+        background_tasks.add_task(pipeline.run_deferred_judge, response_id, result["deferred_judge"])
+    if os.getenv("COGSCREEN_DEBUG_TIMINGS"):
+        response.headers["Server-Timing"] = pipeline.server_timing_header(timings)
 
     return models.ResponseCreateResponse(
         response_id=response_id,
         transcript=transcript,
         reaction_time_whisper_ms=reaction_time_whisper_ms,
         reaction_time_vad_ms=reaction_time_vad_ms,
+        reaction_time_server_vad_ms=result["reaction_time_server_vad_ms"],
         manual_confirmed=manual_confirmed,
         rule_score=rule_score,
         llm_judge=llm_judge,
+        scoring_status="done",
+    )
+
+
+@router.get("/sessions/{session_id}/responses/status", response_model=models.ScoringStatusResponse)
+async def session_scoring_status(session_id: str) -> models.ScoringStatusResponse:
+    if not storage.get_session(session_id):
+        raise HTTPException(status_code=404, detail="Session not found")
+    items = storage.list_scoring_status(session_id)
+    return models.ScoringStatusResponse(
+        session_id=session_id,
+        pending=sum(1 for item in items if item["scoring_status"] == "pending"),
+        responses=items,
     )
 
 
 @router.get("/sessions/{session_id}/report", response_model=models.ReportResponse)
-async def session_report(session_id: str) -> models.ReportResponse:
+async def session_report(
+    session_id: str,
+    if_none_match: str | None = Header(default=None),
+) -> Response:
     try:
-        report_payload = reporting.build_report(session_id)
+        payload_json, etag = reporting.get_report(session_id)
     except ValueError:
         raise HTTPException(status_code=404, detail="Session not found") from None
-    return models.ReportResponse(**report_payload)
+    headers = {"ETag": f'"{etag}"', "Cache-Control": "no-cache"}
+    if reporting.etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload_json, media_type="application/json", headers=headers)
 
 
 @router.get("/sessions/{session_id}/progress", response_model=models.ProgressResponse)
@@ -438,7 +489,7 @@ async def session_progress(session_id: str) -> models.ProgressResponse:
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     instrument = session.get("instrument")
-    questions = question_bank.filter_questions(QUESTION_BANK, instrument)
+    questions = question_bank.get_question_bank().for_instrument(instrument)
     answered = len(storage.list_responses(session_id))
     total = len(questions)
     return models.ProgressResponse(
@@ -446,13 +497,51 @@ async def session_progress(session_id: str) -> models.ProgressResponse:
         answered=answered,
         total_questions=total,
         is_complete=answered >= total,
+        pending_scoring=storage.count_pending_scoring(session_id),
     )
 
 
+@router.post("/reports:batch", response_model=models.ReportBatchResponse)
+async def reports_batch(payload: models.SessionBatchRequest) -> Response:
+    reports = reporting.get_reports(payload.session_ids)
+    missing = [session_id for session_id in dict.fromkeys(payload.session_ids) if session_id not in reports]
+    # Cached payloads are already serialized; splice them in rather than
+    # parsing and re-encoding every report.
+    body = ",".join(f"{json.dumps(session_id)}:{payload_json}" for session_id, (payload_json, _) in reports.items())
+    content = f'{{"reports":{{{body}}},"missing":{json.dumps(missing)}}}'
+    return Response(content=content, media_type="application/json")
+
+
+@router.post("/progress:batch", response_model=models.ProgressBatchResponse)
+async def progress_batch(payload: models.SessionBatchRequest) -> models.ProgressBatchResponse:
+    session_ids = list(dict.fromkeys(payload.session_ids))
+    sessions = storage.get_sessions(session_ids)
+    found = [session_id for session_id in session_ids if session_id in sessions]
+    counts = storage.count_progress_for_sessions(found)
+    bank = question_bank.get_question_bank()
+    progress = {}
+    for session_id in found:
+        total = len(bank.for_instrument(sessions[session_id].get("instrument")))
+        answered = counts[session_id]["answered"]
+        progress[session_id] = models.ProgressResponse(
+            session_id=session_id,
+            answered=answered,
+            total_questions=total,
+            is_complete=answered >= total,
+            pending_scoring=counts[session_id]["pending_scoring"],
+        )
+    missing = [session_id for session_id in session_ids if session_id not in sessions]
+    return models.ProgressBatchResponse(progress=progress, missing=missing)
+
+
 @router.post("/sessions/{session_id}/submit", response_model=models.SubmitResponse)
 async def submit_report(session_id: str) -> models.SubmitResponse:
+    if scoring_queue.scoring_mode() == "queue":
+        timeout = float(os.getenv("COGSCREEN_SUBMIT_WAIT_SECONDS", "60"))
+        if not await scoring_queue.wait_for_session(session_id, timeout):
+            logger.warning("Submitting session_id=%s with scoring still pending", session_id)
     try:
-        report_payload = reporting.build_report(session_id)
+        report_payload = json.loads(reporting.get_report(session_id)[0])
     except ValueError:
         raise HTTPException(status_code=404, detail="Session not found") from None
 
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import subprocess
+import wave
+from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional runtime helper
+    np = None
+
+logger = logging.getLogger(__name__)
+
+PREPROCESS_ENABLED = os.getenv("COGSCREEN_AUDIO_PREPROCESS", "1") not in ("0", "false", "no")
+TARGET_SAMPLE_RATE = 16000
+FRAME_MS = 20
+# Speech kept on either side of the detected voiced region.
+PAD_MS = 200
+# Frame RMS (full scale = 1.0) below which a frame is always silence.
+SILENCE_FLOOR = 0.004
+# Frames louder than this multiple of the quiet-frame level count as voiced.
+NOISE_FACTOR = 4.0
+
+
+class AudioDecodeError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class PreparedAudio:
+    path: Path
+    lead_in_ms: float
+    duration_ms: float
+    source_duration_ms: float
+
+
+def is_available() -> bool:
+    return np is not None
+
+
+def settings_key() -> str:
+    """What :func:`preprocess_for_transcription` does to a file, or "" when it is a no-op.
+
+    Cached transcriptions keyed by the upload digest include this, so that
+    changing the trimming settings does not reuse results for other audio.
+    """
+    if not PREPROCESS_ENABLED or np is None:
+        return ""
+    return json.dumps(["trim", TARGET_SAMPLE_RATE, FRAME_MS, PAD_MS, SILENCE_FLOOR, NOISE_FACTOR])
+
+
+def _decode_wav(path: Path) -> tuple["np.ndarray", int]:
+    with wave.open(str(path), "rb") as wav_file:
+        channels = wav_file.getnchannels()
+        width = wav_file.getsampwidth()
+        rate = wav_file.getframerate()
+        raw = wav_file.readframes(wav_file.getnframes())
+    if width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif width == 2:
+        samples = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+    elif width == 3:
+        bytes_ = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        ints = bytes_[:, 0] | (bytes_[:, 1] << 8) | (bytes_[:, 2] << 16)
+        ints = np.where(ints & 0x800000, ints - 0x1000000, ints)
+        samples = ints.astype(np.float32) / 8388608.0
+    elif width == 4:
+        samples = np.frombuffer(raw, dtype="<i4").astype(np.float32) / 2147483648.0
+    else:
+        raise AudioDecodeError(f"Unsupported WAV sample width: {width}")
+    if channels > 1:
+        samples = samples[: len(samples) - len(samples) % channels].reshape(-1, channels).mean(axis=1)
+    return samples, rate
+
+
+def _decode_ffmpeg(path: Path) -> tuple["np.ndarray", int]:
+    ffmpeg = shutil.which("ffmpeg")
+    if not ffmpeg:
+        raise AudioDecodeError(f"Cannot decode {path.suffix or 'file'} without ffmpeg")
+    result = subprocess.run(
+        [ffmpeg, "-v", "error", "-i", str(path), "-f", "s16le", "-ac", "1", "-ar", str(TARGET_SAMPLE_RATE), "-"],
+        check=False,
+        capture_output=True,
+    )
+    if result.returncode != 0:
+        raise AudioDecodeError("ffmpeg decode failed: " + result.stderr.decode(errors="replace").strip())
+    return np.frombuffer(result.stdout, dtype="<i2").astype(np.float32) / 32768.0, TARGET_SAMPLE_RATE
+
+
+def decode_audio(path: str | Path) -> tuple["np.ndarray", int]:
+    """Decode to mono float32 samples in [-1, 1] and their sample rate.
+
+    PCM WAV is read with the standard library; anything else needs ffmpeg.
+    """
+    if np is None:
+        raise AudioDecodeError("numpy is required for audio decoding")
+    path = Path(path)
+    with open(path, "rb") as handle:
+        head = handle.read(12)
+    if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+        try:
+            return _decode_wav(path)
+        except (wave.Error, EOFError) as exc:
+            # Non-PCM WAV (e.g. float or compressed); let ffmpeg try.
+            logger.debug("Falling back to ffmpeg for %s: %s", path, exc)
+    return _decode_ffmpeg(path)
+
+
+def resample(samples: "np.ndarray", rate: int, target_rate: int = TARGET_SAMPLE_RATE) -> "np.ndarray":
+    """Linear-interpolation resample with a box low-pass when downsampling."""
+    if rate == target_rate or samples.size == 0:
+        return samples.astype(np.float32, copy=False)
+    if rate > target_rate:
+        width = int(round(rate / target_rate))
+        if width > 1:
+            kernel = np.full(width, 1.0 / width, dtype=np.float32)
+            samples = np.convolve(samples, kernel, mode="same")
+    count = int(round(samples.size * target_rate / rate))
+    positions = np.arange(count, dtype=np.float64) * (rate / target_rate)
+    return np.interp(positions, np.arange(samples.size), samples).astype(np.float32)
+
+
+def frames(samples: "np.ndarray", rate: int, frame_ms: int = FRAME_MS) -> "np.ndarray":
+    """View ``samples`` as non-overlapping ``(count, frame_length)`` frames."""
+    frame = max(1, int(rate * frame_ms / 1000))
+    usable = samples.size - samples.size % frame
+    return samples[:usable].reshape(-1, frame)
+
+
+def frame_rms(samples: "np.ndarray", rate: int, frame_ms: int = FRAME_MS) -> "np.ndarray":
+    framed = frames(samples, rate, frame_ms)
+    if framed.size == 0:
+        return np.zeros(0, dtype=np.float32)
+    return np.sqrt(np.mean(framed * framed, axis=1))
+
+
+def voiced_bounds(samples: "np.ndarray", rate: int, frame_ms: int = FRAME_MS) -> tuple[int, int] | None:
+    """Sample indices ``(start, end)`` spanning the voiced frames, or None."""
+    energy = frame_rms(samples, rate, frame_ms)
+    if energy.size == 0:
+        return None
+    noise = float(np.percentile(energy, 10))
+    # Capping at a fraction of the peak keeps soft speech when the recording
+    # has little or no silence to estimate the noise floor from.
+    threshold = max(SILENCE_FLOOR, min(noise * NOISE_FACTOR, float(energy.max()) * 0.1))
+    voiced = np.flatnonzero(energy > threshold)
+    if voiced.size == 0:
+        return None
+    frame = max(1, int(rate * frame_ms / 1000))
+    return int(voiced[0]) * frame, min(samples.size, (int(voiced[-1]) + 1) * frame)
+
+
+def write_wav(path: Path, samples: "np.ndarray", rate: int = TARGET_SAMPLE_RATE) -> None:
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767.0).astype("<i2")
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(rate)
+        wav_file.writeframes(pcm.tobytes())
+
+
+def preprocess_for_transcription(audio_path: str | Path) -> PreparedAudio | None:
+    """Write a trimmed 16 kHz mono WAV next to ``audio_path``.
+
+    ``lead_in_ms`` is the audio cut from the start, to be added back to
+    timestamps measured on the trimmed file. Returns None (send the original)
+    when preprocessing is disabled, NumPy is missing, the file cannot be
+    decoded, or no speech is detected.
+    """
+    if not PREPROCESS_ENABLED or np is None:
+        return None
+    source = Path(audio_path)
+    try:
+        samples, rate = decode_audio(source)
+    except (AudioDecodeError, OSError, ValueError) as exc:
+        logger.info("Skipping audio preprocessing for %s: %s", source.name, exc)
+        return None
+    samples = resample(samples, rate)
+    bounds = voiced_bounds(samples, TARGET_SAMPLE_RATE)
+    if bounds is None:
+        return None
+    pad = int(TARGET_SAMPLE_RATE * PAD_MS / 1000)
+    start = max(0, bounds[0] - pad)
+    end = min(samples.size, bounds[1] + pad)
+    destination = source.with_name(f"{source.stem}.16k.wav")
+    write_wav(destination, samples[start:end])
+    return PreparedAudio(
+        path=destination,
+        lead_in_ms=start * 1000.0 / TARGET_SAMPLE_RATE,
+        duration_ms=(end - start) * 1000.0 / TARGET_SAMPLE_RATE,
+        source_duration_ms=samples.size * 1000.0 / TARGET_SAMPLE_RATE,
+    )
@@ -2,8 +2,14 @@ from __future__ import annotations
 
 import os
 import json
+import threading
+import time
+from collections import OrderedDict
 from typing import Any
 
+from backend.app import openai_client
+from backend.app.scoring_rules import normalize
+
 JUDGE_SCHEMA: dict[str, Any] = {
     "name": "judge_result",
     "schema": {
@@ -27,16 +33,97 @@ JUDGE_SCHEMA: dict[str, Any] = {
 }
 
 
+class JudgeCache:
+    """Thread-safe LRU of judge verdicts with per-entry expiry."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[Any, ...], tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[Any, ...]) -> dict[str, Any] | None:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(entry[1])
+
+    def put(self, key: tuple[Any, ...], value: dict[str, Any], expires_at: float | None = None) -> None:
+        deadline = time.time() + self.ttl_seconds
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+        with self._lock:
+            self._entries[key] = (deadline, dict(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+JUDGE_CACHE = JudgeCache(
+    max_entries=int(os.getenv("COGSCREEN_JUDGE_CACHE_SIZE", "4096")),
+    ttl_seconds=float(os.getenv("COGSCREEN_JUDGE_CACHE_TTL_SECONDS", "86400")),
+)
+
+
 def judge_answer(
     transcript: str,
     expected: list[str],
     rule_type: str,
     question_text: str = "",
+    question_id: str | None = None,
+    expires_at: float | None = None,
 ) -> dict[str, Any]:
-    from openai import OpenAI
+    """Ask the LLM whether ``transcript`` answers the question.
 
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    Verdicts are memoized per (question, expected answers, rule type,
+    normalized transcript, model). ``expires_at`` (epoch seconds) caps the
+    entry lifetime for date-dependent expectations.
+    """
     model = os.getenv("OPENAI_JUDGE_MODEL", "gpt-4o-mini")
+    cache_key = (
+        question_id or question_text,
+        tuple(expected),
+        rule_type,
+        normalize(transcript),
+        model,
+    )
+    cached = JUDGE_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+    result = _request_judgement(transcript, expected, rule_type, question_text, model)
+    # Fallback/empty outputs carry no verdict and are worth retrying later.
+    if isinstance(result, dict) and isinstance(result.get("is_correct"), bool):
+        JUDGE_CACHE.put(cache_key, result, expires_at)
+    return result
+
+
+def _request_judgement(
+    transcript: str,
+    expected: list[str],
+    rule_type: str,
+    question_text: str,
+    model: str,
+) -> dict[str, Any]:
+    client = openai_client.get_client()
     prompt = (
         "You are an evaluator for cognitive screening Q&A. "
         "Primary goal: detect whether the response is on-topic, coherent, and not nonsensical. "
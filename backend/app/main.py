@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
+import asyncio
 import os
 
 from fastapi import FastAPI
@@ -8,7 +9,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from dotenv import load_dotenv
 
-from backend.app import api, storage
+from backend.app import api, offload, openai_client, question_bank, scoring_queue, storage
 
 load_dotenv()
 
@@ -36,4 +37,21 @@ if frontend_path.exists():
 
 @app.on_event("startup")
 async def startup() -> None:
-    storage.init_db()
+    storage.open_pool()
+    question_bank.get_question_bank()
+    interval = question_bank.reload_interval_seconds()
+    if interval > 0:
+        app.state.question_reload_task = asyncio.create_task(question_bank.watch_for_changes(interval))
+    if scoring_queue.scoring_mode() == "queue":
+        scoring_queue.start_workers()
+
+
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    reload_task = getattr(app.state, "question_reload_task", None)
+    if reload_task is not None:
+        reload_task.cancel()
+    await scoring_queue.stop_workers()
+    offload.shutdown()
+    openai_client.close_clients()
+    storage.close_connections()
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import math
+from bisect import bisect_left
+from collections import deque
+from typing import Sequence
+
+# Below this many distinct patterns, one C-level substring scan per pattern
+# beats a Python-level pass over the text (~1 ns per pattern-character vs
+# ~150 ns per character on CPython 3.11), so the automaton is not built.
+AUTOMATON_MIN_PATTERNS = 128
+
+
+class PatternMatcher:
+    """Find which of a fixed list of patterns occur in a text, with spans.
+
+    Built once per compiled rule. Large pattern sets get an Aho-Corasick
+    automaton that finds all of them in a single pass: failure links are
+    folded into a transition table over the patterns' own characters, so
+    each text character costs one dict lookup and characters that appear
+    in no pattern send the scan back to the root. Small sets are scanned
+    per pattern, which is faster in CPython. Both report identical results;
+    an empty pattern matches at offset 0, like ``"" in text``.
+    """
+
+    __slots__ = ("patterns", "automaton", "_delta", "_outputs", "_empty", "_unique")
+
+    def __init__(self, patterns: Sequence[str], automaton: bool | None = None) -> None:
+        self.patterns = tuple(dict.fromkeys(patterns))
+        if automaton is None:
+            automaton = len(self.patterns) >= AUTOMATON_MIN_PATTERNS
+        self.automaton = automaton
+        self._delta: list[dict[str, int]] = []
+        self._outputs: list[tuple[tuple[int, int], ...]] = []
+        self._empty: tuple[int, ...] = ()
+        self._unique = 0
+        if automaton:
+            self._build()
+
+    def _build(self) -> None:
+        goto: list[dict[str, int]] = [{}]
+        ends: list[int | None] = [None]
+        empty = []
+        for index, pattern in enumerate(self.patterns):
+            if not pattern:
+                empty.append(index)
+                continue
+            state = 0
+            for char in pattern:
+                following = goto[state].get(char)
+                if following is None:
+                    following = len(goto)
+                    goto[state][char] = following
+                    goto.append({})
+                    ends.append(None)
+                state = following
+            ends[state] = index
+
+        fail = [0] * len(goto)
+        # (pattern index, length) for every pattern ending at a state,
+        # including suffixes reached through failure links.
+        outputs: list[tuple[tuple[int, int], ...]] = [()] * len(goto)
+        delta: list[dict[str, int]] = [dict(goto[0])] + [{} for _ in range(len(goto) - 1)]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            suffix = fail[state]
+            index = ends[state]
+            own = ((index, len(self.patterns[index])),) if index is not None else ()
+            outputs[state] = own + outputs[suffix]
+            # Transitions of the longest proper suffix, overridden by our own.
+            delta[state] = {**delta[suffix], **goto[state]}
+            for char, child in goto[state].items():
+                fail[child] = delta[suffix].get(char, 0) if state else 0
+                queue.append(child)
+        self._delta = delta
+        self._outputs = outputs
+        self._empty = tuple(empty)
+        self._unique = len(self.patterns) - len(empty)
+
+    def find(self, text: str) -> dict[str, tuple[int, int]]:
+        """``{pattern: (start, end)}`` of the first occurrence of each pattern found."""
+        if not self.automaton:
+            return {
+                pattern: (start, start + len(pattern))
+                for pattern in self.patterns
+                if (start := text.find(pattern)) >= 0
+            }
+        patterns = self.patterns
+        found: dict[str, tuple[int, int]] = {patterns[index]: (0, 0) for index in self._empty}
+        remaining = self._unique
+        delta = self._delta
+        outputs = self._outputs
+        state = 0
+        for position, char in enumerate(text, 1):
+            if not remaining:
+                break
+            state = delta[state].get(char, 0)
+            if state and outputs[state]:
+                for index, length in outputs[state]:
+                    pattern = patterns[index]
+                    if pattern not in found:
+                        found[pattern] = (position - length, position)
+                        remaining -= 1
+        return found
+
+
+class FuzzyPattern:
+    """An expected string prepared for repeated Indel-similarity checks.
+
+    Similarity is ``2 * LCS / (len(a) + len(b))`` (1.0 for two empty
+    strings), the same 0..1 scale as ``difflib.SequenceMatcher.ratio()``
+    and never below it. LCS is computed bit-parallel over a Python int
+    (one add/or/and per answer character), and a comparison gives up as
+    soon as ``score_cutoff`` is out of reach.
+    """
+
+    __slots__ = ("text", "length", "_masks", "_full")
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.length = len(text)
+        masks: dict[str, int] = {}
+        for position, char in enumerate(text):
+            masks[char] = masks.get(char, 0) | (1 << position)
+        self._masks = masks
+        self._full = (1 << self.length) - 1
+
+    def _lcs(self, text: str, start: int, end: int, need: int) -> int:
+        """LCS with ``text[start:end]``, or -1 once ``need`` is unreachable."""
+        masks = self._masks
+        full = self._full
+        length = self.length
+        row = full
+        remaining = end - start
+        for position in range(start, end):
+            match = masks.get(text[position])
+            remaining -= 1
+            if match:
+                low = row & match
+                row = ((row + low) | (row - low)) & full
+            if length - row.bit_count() + remaining < need:
+                return -1
+        return length - row.bit_count()
+
+    def ratio(self, text: str, score_cutoff: float = 0.0) -> float:
+        """Indel similarity with ``text``; 0.0 when below ``score_cutoff``."""
+        total = self.length + len(text)
+        if not total:
+            return 1.0
+        # Length prefilter: the LCS cannot exceed the shorter string.
+        if 2 * min(self.length, len(text)) < score_cutoff * total:
+            return 0.0
+        need = math.ceil(score_cutoff * total / 2 - 1e-9)
+        lcs = self._lcs(text, 0, len(text), need)
+        if lcs < 0:
+            return 0.0
+        score = 2 * lcs / total
+        return score if score >= score_cutoff else 0.0
+
+    def partial_ratio(self, text: str, score_cutoff: float = 0.0) -> tuple[float, int, int]:
+        """Best similarity of any pattern-length window of ``text``, with its span.
+
+        Answers no longer than the pattern fall back to :meth:`ratio` over
+        the whole text. Only windows starting on a character of the pattern
+        are tried (sliding any other window right cannot lower its LCS), and
+        only when they hold enough pattern characters to beat the best
+        window so far. Returns ``(0.0, 0, 0)`` below the cutoff.
+        """
+        width = self.length
+        if not width:
+            return 1.0, 0, 0
+        if len(text) <= width:
+            score = self.ratio(text, score_cutoff)
+            return (score, 0, len(text)) if score else (0.0, 0, 0)
+        masks = self._masks
+        hits = [position for position, char in enumerate(text) if char in masks]
+        best = math.ceil(score_cutoff * width - 1e-9) - 1
+        if len(hits) <= best:
+            return 0.0, 0, 0
+        last = len(text) - width
+        best_start = -1
+        previous = -1
+        for position in hits:
+            start = min(position, last)
+            if start == previous:
+                continue
+            previous = start
+            if bisect_left(hits, start + width) - bisect_left(hits, start) <= best:
+                continue
+            lcs = self._lcs(text, start, start + width, best + 1)
+            if lcs > best:
+                best, best_start = lcs, start
+                if best == width:
+                    break
+        if best_start < 0:
+            return 0.0, 0, 0
+        return best / width, best_start, best_start + width
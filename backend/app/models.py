@@ -41,7 +41,9 @@ class ResponseCreateResponse(BaseModel):
     reaction_time_vad_ms: float | None
     rule_score: dict[str, Any] | None
     llm_judge: dict[str, Any] | None
+    reaction_time_server_vad_ms: float | None = None
     manual_confirmed: bool | None = None
+    scoring_status: Literal["pending", "done"] = "done"
 
 
 class ReportResponse(BaseModel):
@@ -58,6 +60,49 @@ class ProgressResponse(BaseModel):
     answered: int
     total_questions: int
     is_complete: bool
+    pending_scoring: int = 0
+
+
+class ScoringStatusResponse(BaseModel):
+    session_id: str
+    pending: int
+    responses: list[dict[str, Any]]
+
+
+class SessionBatchRequest(BaseModel):
+    session_ids: list[str] = Field(..., max_length=500, description="Session IDs to look up")
+
+
+class ReportBatchResponse(BaseModel):
+    reports: dict[str, ReportResponse]
+    missing: list[str]
+
+
+class ProgressBatchResponse(BaseModel):
+    progress: dict[str, ProgressResponse]
+    missing: list[str]
+
+
+class TimelineEntry(BaseModel):
+    session_id: str
+    instrument: str | None
+    created_at: str | None
+    screening_risk_band: str
+    screening_risk_level: int
+    screen_positive: bool
+    instrument_scores: dict[str, Any]
+    total_questions: int
+    answered: int
+    correct: int
+    incorrect: int
+    unscored: int
+    median_reaction_time_ms: dict[str, float | None]
+
+
+class TimelineResponse(BaseModel):
+    patient_id: str
+    sessions: list[TimelineEntry]
+    next_cursor: str | None = None
 
 
 class SubmitResponse(ReportResponse):
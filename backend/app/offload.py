@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+# stage -> (max concurrent calls, timeout seconds); override per stage with
+# COGSCREEN_<STAGE>_CONCURRENCY / COGSCREEN_<STAGE>_TIMEOUT_SECONDS.
+STAGE_DEFAULTS: dict[str, tuple[int, float]] = {
+    "preprocess": (4, 15.0),
+    "vad": (4, 10.0),
+    "transcribe": (8, 60.0),
+    "judge": (8, 30.0),
+}
+
+_executors: dict[str, ThreadPoolExecutor] = {}
+_lock = threading.Lock()
+
+
+def stage_concurrency(stage: str) -> int:
+    default = STAGE_DEFAULTS.get(stage, (4, 30.0))[0]
+    return max(1, int(os.getenv(f"COGSCREEN_{stage.upper()}_CONCURRENCY", default)))
+
+
+def stage_timeout(stage: str) -> float:
+    default = STAGE_DEFAULTS.get(stage, (4, 30.0))[1]
+    return float(os.getenv(f"COGSCREEN_{stage.upper()}_TIMEOUT_SECONDS", default))
+
+
+def _executor(stage: str) -> ThreadPoolExecutor:
+    with _lock:
+        executor = _executors.get(stage)
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=stage_concurrency(stage),
+                thread_name_prefix=f"cogscreen-{stage}",
+            )
+            _executors[stage] = executor
+        return executor
+
+
+async def run_stage(stage: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking call on the stage's bounded thread pool.
+
+    Calls beyond the stage's concurrency limit queue inside the pool, so the
+    event loop keeps serving other requests. Raises ``asyncio.TimeoutError``
+    when the stage timeout (queueing included) elapses; the worker thread is
+    left to finish on its own.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(_executor(stage), functools.partial(func, *args, **kwargs))
+    return await asyncio.wait_for(future, timeout=stage_timeout(stage))
+
+
+def shutdown() -> None:
+    with _lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any
+
+_clients: dict[tuple[str | None, str | None], Any] = {}
+_lock = threading.Lock()
+
+
+def _http_client() -> Any:
+    import httpx
+
+    return httpx.Client(
+        limits=httpx.Limits(
+            max_connections=int(os.getenv("OPENAI_MAX_CONNECTIONS", "32")),
+            max_keepalive_connections=int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "16")),
+            keepalive_expiry=float(os.getenv("OPENAI_KEEPALIVE_EXPIRY_SECONDS", "60")),
+        ),
+    )
+
+
+def get_client() -> Any:
+    """Return the shared OpenAI client, creating it on first use.
+
+    One client per (API key, base URL) keeps HTTP keep-alive connections and
+    TLS sessions warm across requests. ``OPENAI_BASE_URL`` points it at a
+    compatible server such as a local mock. Retries use the SDK's
+    exponential backoff.
+    """
+    api_key = os.getenv("OPENAI_API_KEY")
+    base_url = os.getenv("OPENAI_BASE_URL") or None
+    key = (api_key, base_url)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            import httpx
+            from openai import OpenAI
+
+            client = OpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                timeout=httpx.Timeout(
+                    float(os.getenv("OPENAI_TIMEOUT_SECONDS", "30")),
+                    connect=float(os.getenv("OPENAI_CONNECT_TIMEOUT_SECONDS", "5")),
+                ),
+                max_retries=int(os.getenv("OPENAI_MAX_RETRIES", "2")),
+                http_client=_http_client(),
+            )
+            _clients[key] = client
+        return client
+
+
+def close_clients() -> None:
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
@@ -0,0 +1,349 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from backend.app import audio_preprocess, offload, reaction_time, scoring_rules, storage
+from backend.app.llm_judge import judge_answer
+from backend.app.transcribe import cached_transcription, transcribe_audio
+
+logger = logging.getLogger(__name__)
+
+
+def scoring_context(config: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "timezone": os.getenv("COGSCREEN_TIMEZONE", "Asia/Taipei"),
+        "patient_age": config.get("age"),
+        "patient_phone": config.get("phone"),
+        "patient_address": config.get("address"),
+        "patient_birthday": config.get("birthday"),
+        "patient_mother_name": config.get("mother_name"),
+        "president_current": config.get("president_current"),
+        "president_previous": config.get("president_previous"),
+    }
+
+
+def judge_expected(prepared_rule: dict[str, Any]) -> list[str]:
+    """Expected answers worth showing the judge (unresolved tokens dropped)."""
+    llm_expected = []
+    raw_expected = prepared_rule.get("expected", [])
+    if isinstance(raw_expected, list):
+        for item in raw_expected:
+            text = str(item).strip()
+            if not text:
+                continue
+            if text.startswith("__") and text.endswith("__"):
+                continue
+            llm_expected.append(text)
+    return llm_expected
+
+
+JUDGE_POLICIES = ("always", "skip_conclusive", "defer_conclusive")
+
+
+def judge_policy() -> str:
+    """When to call the LLM judge once a rule score exists.
+
+    ``always`` judges every scorable answer (rule and judge run concurrently);
+    ``skip_conclusive`` drops the judge when the rule score is conclusive;
+    ``defer_conclusive`` saves the conclusive rule result first and lets the
+    caller run the judge after the response has been returned.
+    """
+    policy = os.getenv("COGSCREEN_JUDGE_POLICY", "always").strip().lower()
+    return policy if policy in JUDGE_POLICIES else "always"
+
+
+def is_conclusive(rule_score: dict[str, Any] | None) -> bool:
+    """A deterministic match is trusted; a miss may just be ASR wording."""
+    if not rule_score or rule_score.get("type") == "unknown":
+        return False
+    return rule_score.get("is_correct") is True
+
+
+def judge_enabled_for(compiled_rule: scoring_rules.CompiledRule) -> bool:
+    """Whether the LLM judge may run for this rule; locally scored types never need it."""
+    local_only = compiled_rule.rule_type in scoring_rules.LOCAL_RULE_TYPES and not compiled_rule.unresolved
+    return bool(os.getenv("OPENAI_API_KEY")) and not local_only
+
+
+def mark_conclusive(rule_score: dict[str, Any] | None, judge_enabled: bool, policy: str) -> dict[str, Any] | None:
+    """Flag a trusted rule score ``conclusive`` when it may stand in for the judge.
+
+    That is only the case when a judge is configured and ``policy`` is not
+    ``always``; locally scored types flag themselves.
+    """
+    if judge_enabled and policy != "always" and is_conclusive(rule_score):
+        return {**rule_score, "conclusive": True}
+    return rule_score
+
+
+def rule_score_for(compiled_rule: scoring_rules.CompiledRule, transcript: str) -> dict[str, Any] | None:
+    """The rule score stored for ``transcript``; ``None`` when the rule cannot score it."""
+    if compiled_rule.unresolved or compiled_rule.rule_type in scoring_rules.JUDGE_RULE_TYPES:
+        return None
+    return compiled_rule.score(transcript)
+
+
+class StageTimer:
+    def __init__(self) -> None:
+        self.timings: dict[str, float] = {}
+
+    def record(self, stage: str, started: float) -> None:
+        self.timings[stage] = round((time.perf_counter() - started) * 1000.0, 2)
+
+
+def server_timing_header(timings: dict[str, float]) -> str:
+    return ", ".join(f"{stage};dur={duration}" for stage, duration in timings.items())
+
+
+async def _judge(
+    session_id: str,
+    question: dict[str, Any],
+    transcript: str,
+    prepared_rule: dict[str, Any],
+    expires_at: float | None = None,
+) -> dict[str, Any] | None:
+    try:
+        return await offload.run_stage(
+            "judge",
+            judge_answer,
+            transcript,
+            judge_expected(prepared_rule),
+            prepared_rule.get("type", "exact"),
+            question_text=str(question.get("text") or ""),
+            question_id=question["question_id"],
+            expires_at=expires_at,
+        )
+    except asyncio.TimeoutError:
+        logger.warning(
+            "LLM judge timed out; skipping for session_id=%s question_id=%s",
+            session_id,
+            question["question_id"],
+        )
+        return None
+
+
+async def run_deferred_judge(response_id: str, deferred: dict[str, Any]) -> None:
+    """Judge an already-saved response and attach the verdict to its row."""
+    llm_judge = await _judge(**deferred)
+    if llm_judge:
+        storage.update_response_judge(response_id, llm_judge)
+
+
+async def _preprocess(audio_path: str, timer: StageTimer) -> audio_preprocess.PreparedAudio | None:
+    """Trim and downsample before upload to Whisper; None means send the original."""
+    if not audio_preprocess.PREPROCESS_ENABLED:
+        return None
+    started = time.perf_counter()
+    try:
+        prepared = await offload.run_stage(
+            "preprocess", audio_preprocess.preprocess_for_transcription, audio_path
+        )
+    except asyncio.TimeoutError:
+        logger.warning("Audio preprocessing timed out for %s; sending original", Path(audio_path).name)
+        prepared = None
+    timer.record("preprocess", started)
+    return prepared
+
+
+class _TrimmedUpload:
+    """The preprocessed file handed to the transcribe stage, deleted exactly once.
+
+    A timed-out stage thread keeps running, so the thread deletes the file
+    when it finishes; the caller deletes it only if the call never started.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._state = "pending"
+
+    def transcribe(self, **kwargs: Any) -> dict[str, Any] | None:
+        with self._lock:
+            if self._state == "abandoned":
+                return None
+            self._state = "started"
+        try:
+            return transcribe_audio(str(self.path), **kwargs)
+        finally:
+            self.path.unlink(missing_ok=True)
+
+    def abandon(self) -> None:
+        with self._lock:
+            if self._state == "pending":
+                self._state = "abandoned"
+                self.path.unlink(missing_ok=True)
+
+
+async def _transcribe(
+    session_id: str,
+    question_id: str,
+    audio_path: str,
+    audio_digest: str | None,
+    timer: StageTimer,
+) -> tuple[dict[str, Any] | None, float]:
+    """Whisper payload (None when timed out) and the lead-in trimmed before upload."""
+    started = time.perf_counter()
+    options = {
+        "response_format": "verbose_json",
+        "timestamp_granularities": ["word"],
+        "preprocess": audio_preprocess.settings_key(),
+    }
+    if audio_digest:
+        # Keyed by the upload itself, so a repeat skips decoding as well.
+        cached = await asyncio.to_thread(cached_transcription, audio_digest, **options)
+        if cached is not None:
+            timer.record("transcribe", started)
+            return cached
+    prepared = await _preprocess(audio_path, timer)
+    trimmed = _TrimmedUpload(prepared.path) if prepared else None
+    lead_in_ms = prepared.lead_in_ms if prepared else 0.0
+    started = time.perf_counter()
+    transcription_payload = None
+    try:
+        transcription_payload = await offload.run_stage(
+            "transcribe",
+            *((trimmed.transcribe,) if trimmed else (transcribe_audio, audio_path)),
+            audio_digest=audio_digest,
+            lead_in_ms=lead_in_ms,
+            **options,
+        )
+    except asyncio.TimeoutError:
+        logger.warning(
+            "Transcription timed out; skipping for session_id=%s question_id=%s",
+            session_id,
+            question_id,
+        )
+    finally:
+        if trimmed:
+            trimmed.abandon()
+    timer.record("transcribe", started)
+    return transcription_payload, lead_in_ms
+
+
+async def _server_vad(session_id: str, question_id: str, audio_path: str, timer: StageTimer) -> float | None:
+    started = time.perf_counter()
+    try:
+        return await offload.run_stage("vad", reaction_time.reaction_time_server_vad_ms, audio_path)
+    except asyncio.TimeoutError:
+        logger.warning("Server VAD timed out for session_id=%s question_id=%s", session_id, question_id)
+        return None
+    finally:
+        timer.record("vad", started)
+
+
+async def score_submission(
+    session_id: str,
+    question: dict[str, Any],
+    config: dict[str, Any],
+    audio_path: str | None,
+    answer_text: str | None = None,
+    allow_defer: bool = False,
+    audio_digest: str | None = None,
+) -> dict[str, Any]:
+    """Transcribe (unless text was supplied), rule-score and judge one answer.
+
+    Shared by the synchronous submit endpoint and the background scoring
+    workers. Returns ``transcript``, ``reaction_time_whisper_ms``,
+    ``reaction_time_server_vad_ms``, ``rule_score``, ``llm_judge``,
+    per-stage ``timings`` in milliseconds and ``deferred_judge`` (keyword
+    arguments for :func:`run_deferred_judge` when the judge was postponed,
+    else ``None``). ``audio_path`` is None when the upload was empty.
+    """
+    timer = StageTimer()
+    question_id = question["question_id"]
+    exclude_from_scoring = bool(question.get("exclude_from_scoring"))
+    recording_disabled = bool(question.get("recording_disabled"))
+
+    transcript = str(answer_text).strip() if answer_text is not None else None
+    if transcript == "":
+        transcript = None
+    transcription_payload: dict[str, Any] | None = None
+    lead_in_ms = 0.0
+    openai_api_key = os.getenv("OPENAI_API_KEY")
+    vad_task: asyncio.Future[float | None] | None = None
+    has_audio = audio_path is not None and not recording_disabled
+    if has_audio and audio_preprocess.is_available() and Path(audio_path).is_file():
+        # Decodes the upload on its own thread while transcription runs.
+        vad_task = asyncio.ensure_future(_server_vad(session_id, question_id, audio_path, timer))
+    try:
+        if transcript and not recording_disabled:
+            transcription_payload = None
+        elif openai_api_key and has_audio:
+            transcription_payload, lead_in_ms = await _transcribe(
+                session_id, question_id, audio_path, audio_digest, timer
+            )
+            transcript = transcription_payload.get("text") if transcription_payload else None
+        elif has_audio:
+            logger.warning(
+                "OPENAI_API_KEY missing; skipping transcription for session_id=%s question_id=%s",
+                session_id,
+                question_id,
+            )
+        reaction_time_server_vad_ms = await vad_task if vad_task else None
+    finally:
+        if vad_task:
+            vad_task.cancel()
+
+    reaction_time_whisper_ms = (
+        reaction_time.reaction_time_whisper_ms(transcription_payload, offset_ms=lead_in_ms)
+        if transcription_payload
+        else None
+    )
+
+    rule_score = None
+    llm_judge = None
+    deferred_judge = None
+    if transcript and not exclude_from_scoring:
+        started = time.perf_counter()
+        context = scoring_context(config)
+        compiled_rule = scoring_rules.prepare(question["scoring_rule"], context)
+        prepared_rule = compiled_rule.as_rule()
+        expires_at = scoring_rules.expectation_expiry(question["scoring_rule"], context)
+        policy = judge_policy()
+        judge_enabled = judge_enabled_for(compiled_rule)
+        judge_task: asyncio.Future[dict[str, Any] | None] | None = None
+        judge_started = time.perf_counter()
+        if judge_enabled and policy == "always":
+            # Nothing to wait for: start the judge and rule-score meanwhile.
+            judge_task = asyncio.ensure_future(
+                _judge(session_id, question, transcript, prepared_rule, expires_at)
+            )
+            # Let the judge reach its thread before rule scoring holds the loop.
+            await asyncio.sleep(0)
+        rule_score = mark_conclusive(rule_score_for(compiled_rule, transcript), judge_enabled, policy)
+        timer.record("rule", started)
+
+        if judge_enabled and judge_task is None:
+            conclusive = is_conclusive(rule_score)
+            if conclusive and allow_defer and policy != "skip_conclusive":
+                deferred_judge = {
+                    "session_id": session_id,
+                    "question": question,
+                    "transcript": transcript,
+                    "prepared_rule": prepared_rule,
+                    "expires_at": expires_at,
+                }
+            elif not conclusive or policy != "skip_conclusive":
+                judge_started = time.perf_counter()
+                judge_task = asyncio.ensure_future(
+                    _judge(session_id, question, transcript, prepared_rule, expires_at)
+                )
+        if judge_task is not None:
+            llm_judge = await judge_task
+            timer.record("judge", judge_started)
+
+    return {
+        "transcript": transcript,
+        "reaction_time_whisper_ms": reaction_time_whisper_ms,
+        "reaction_time_server_vad_ms": reaction_time_server_vad_ms,
+        "rule_score": rule_score,
+        "llm_judge": llm_judge,
+        "timings": timer.timings,
+        "deferred_judge": deferred_judge,
+    }
@@ -1,22 +1,41 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Iterable, Mapping
 
 BASE_DIR = Path(__file__).resolve().parents[2]
 DATA_DIR = BASE_DIR / "data"
 
 DEFAULT_SCORING_RULE: dict[str, Any] = {"type": "exact", "expected": []}
 
+# instrument -> question file under DATA_DIR
+INSTRUMENT_FILES: dict[str, str] = {
+    "spmsq": "SPMSQ_questions.json",
+    "mmse": "MMSE_questions.json",
+    "ad8": "AD8_questions.json",
+}
+# Sessions created without an instrument keep getting the SPMSQ questions.
+DEFAULT_INSTRUMENT = "spmsq"
+
+logger = logging.getLogger(__name__)
+
 
 def load_question_file(filename: str, instrument: str) -> list[dict[str, Any]]:
     path = DATA_DIR / filename
     if not path.exists():
         return []
-    with path.open("r", encoding="utf-8") as handle:
-        payload = json.load(handle)
+    return parse_questions(json.loads(path.read_bytes().decode("utf-8")), instrument)
 
+
+def parse_questions(payload: list[dict[str, Any]], instrument: str) -> list[dict[str, Any]]:
     questions = []
     for item in payload:
         question_id = item.get("id") or item.get("question_id")
@@ -65,7 +84,10 @@ def load_question_file(filename: str, instrument: str) -> list[dict[str, Any]]:
 
 
 def load_all_questions() -> list[dict[str, Any]]:
-    return load_question_file("SPMSQ_questions.json", "spmsq")
+    questions: list[dict[str, Any]] = []
+    for instrument, filename in INSTRUMENT_FILES.items():
+        questions.extend(load_question_file(filename, instrument))
+    return questions
 
 
 def filter_questions(questions: list[dict[str, Any]], instrument: str | None) -> list[dict[str, Any]]:
@@ -76,3 +98,131 @@ def filter_questions(questions: list[dict[str, Any]], instrument: str | None) ->
 
 def build_question_map(questions: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
     return {question["question_id"]: question for question in questions}
+
+
+@dataclass(frozen=True)
+class QuestionBank:
+    """Read-only snapshot of every instrument's questions.
+
+    ``by_id`` maps question ids to questions and ``by_instrument`` holds each
+    instrument's questions in file order. ``version`` is a content hash of
+    the source files, so anything derived from a snapshot can tell when the
+    questions changed.
+    """
+
+    questions: tuple[dict[str, Any], ...]
+    by_id: Mapping[str, dict[str, Any]]
+    by_instrument: Mapping[str, tuple[dict[str, Any], ...]]
+    version: str = ""
+
+    @classmethod
+    def from_questions(cls, questions: Iterable[dict[str, Any]], version: str = "") -> "QuestionBank":
+        ordered = tuple(questions)
+        grouped: dict[str, list[dict[str, Any]]] = {}
+        for question in ordered:
+            grouped.setdefault(question.get("instrument") or "", []).append(question)
+        return cls(
+            questions=ordered,
+            by_id=MappingProxyType(build_question_map(list(ordered))),
+            by_instrument=MappingProxyType({key: tuple(items) for key, items in grouped.items()}),
+            version=version,
+        )
+
+    def get(self, question_id: str) -> dict[str, Any] | None:
+        return self.by_id.get(question_id)
+
+    def for_instrument(self, instrument: str | None) -> tuple[dict[str, Any], ...]:
+        return self.by_instrument.get(instrument or DEFAULT_INSTRUMENT, ())
+
+
+class QuestionBankRegistry:
+    """Holds the current :class:`QuestionBank` and swaps in new snapshots.
+
+    :meth:`refresh` stats each question file and only re-reads the ones whose
+    mtime or size moved; a snapshot is rebuilt when a content hash actually
+    changed. Readers just take :meth:`current`, so a swap is a single
+    reference assignment and never blocks a request. A file that fails to
+    parse leaves the previous snapshot in place.
+    """
+
+    def __init__(self, data_dir: Path, files: Mapping[str, str]) -> None:
+        self.data_dir = data_dir
+        self.files = dict(files)
+        self._stats: dict[str, tuple[int, int] | None] = {}
+        self._hashes: dict[str, str | None] = {}
+        self._questions: dict[str, list[dict[str, Any]]] = {}
+        self._bank: QuestionBank | None = None
+        self._lock = threading.Lock()
+
+    def current(self) -> QuestionBank:
+        bank = self._bank
+        if bank is None:
+            self.refresh()
+            bank = self._bank
+        assert bank is not None
+        return bank
+
+    def refresh(self) -> bool:
+        """Reload changed files; return True when a new snapshot was installed."""
+        with self._lock:
+            changed = False
+            for instrument, filename in self.files.items():
+                path = self.data_dir / filename
+                try:
+                    info = path.stat()
+                    stat_key: tuple[int, int] | None = (info.st_mtime_ns, info.st_size)
+                except FileNotFoundError:
+                    stat_key = None
+                if instrument in self._stats and self._stats[instrument] == stat_key:
+                    continue
+                if stat_key is None:
+                    raw, digest, questions = None, None, []
+                else:
+                    raw = path.read_bytes()
+                    digest = hashlib.sha256(raw).hexdigest()
+                    if digest == self._hashes.get(instrument, ""):
+                        self._stats[instrument] = stat_key
+                        continue
+                    try:
+                        questions = parse_questions(json.loads(raw.decode("utf-8")), instrument)
+                    except (ValueError, TypeError, AttributeError):
+                        logger.exception("Keeping previous questions; failed to parse %s", path)
+                        # Remember the stat so the broken file is retried only after it changes.
+                        self._stats[instrument] = stat_key
+                        continue
+                self._stats[instrument] = stat_key
+                self._hashes[instrument] = digest
+                self._questions[instrument] = questions
+                changed = True
+
+            if changed or self._bank is None:
+                version = hashlib.sha256(
+                    "|".join(f"{name}:{self._hashes.get(name) or '-'}" for name in self.files).encode("utf-8")
+                ).hexdigest()[:16]
+                questions = [q for name in self.files for q in self._questions.get(name, [])]
+                if self._bank is not None:
+                    logger.info("Question bank reloaded: %s -> %s", self._bank.version, version)
+                self._bank = QuestionBank.from_questions(questions, version=version)
+                return True
+            return False
+
+
+REGISTRY = QuestionBankRegistry(DATA_DIR, INSTRUMENT_FILES)
+
+
+def get_question_bank() -> QuestionBank:
+    return REGISTRY.current()
+
+
+def reload_interval_seconds() -> float:
+    return float(os.getenv("COGSCREEN_QUESTION_RELOAD_SECONDS", "5"))
+
+
+async def watch_for_changes(interval: float) -> None:
+    """Poll the question files every ``interval`` seconds (one task per worker)."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(REGISTRY.refresh)
+        except OSError:
+            logger.exception("Question bank refresh failed")
@@ -1,6 +1,30 @@
 from __future__ import annotations
 
-from typing import Any
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Iterable
+
+from backend.app import audio_preprocess
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional runtime helper
+    np = None
+
+logger = logging.getLogger(__name__)
+
+VAD_FRAME_MS = 10
+# Voiced frames needed in a row before an onset counts (rejects clicks).
+VAD_MIN_SPEECH_MS = 80
+# Frames in the first stretch of audio used to estimate background noise.
+VAD_NOISE_MS = 200
+VAD_ENERGY_FACTOR = 3.0
+VAD_ENERGY_FLOOR = 0.003
+# Zero crossings per sample above which a quiet frame is treated as hiss.
+VAD_MAX_ZCR = 0.35
+VAD_FRICATIVE_RATIO = 0.15
 
 
 def _first_word_start(transcription: dict[str, Any]) -> float | None:
@@ -19,8 +43,67 @@ def _first_word_start(transcription: dict[str, Any]) -> float | None:
     return None
 
 
-def reaction_time_whisper_ms(transcription: dict[str, Any]) -> float | None:
+def reaction_time_whisper_ms(transcription: dict[str, Any], offset_ms: float = 0.0) -> float | None:
+    """First-word onset in ms; ``offset_ms`` adds back audio trimmed before transcription."""
     start = _first_word_start(transcription)
     if start is None:
         return None
-    return start * 1000.0
+    return start * 1000.0 + offset_ms
+
+
+def speech_onset_ms(samples: "np.ndarray", rate: int) -> float | None:
+    """Speech onset in ms from frame energy and zero-crossing rate.
+
+    The energy threshold adapts to the noise level of the opening
+    ``VAD_NOISE_MS``; quiet frames with a high zero-crossing rate (hiss,
+    breath) are not voiced. Onset is the first run of
+    ``VAD_MIN_SPEECH_MS`` voiced frames.
+    """
+    framed = audio_preprocess.frames(samples, rate, VAD_FRAME_MS)
+    if framed.shape[0] == 0:
+        return None
+    energy = np.sqrt(np.mean(framed * framed, axis=1))
+    signs = np.signbit(framed)
+    zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / framed.shape[1]
+
+    noise_frames = max(1, VAD_NOISE_MS // VAD_FRAME_MS)
+    noise = float(np.median(energy[:noise_frames]))
+    peak = float(energy.max())
+    # Capped by the peak in case the answer starts right at the first frame.
+    threshold = max(VAD_ENERGY_FLOOR, min(noise * VAD_ENERGY_FACTOR, peak * 0.1))
+    # High-ZCR frames still count when loud relative to the answer (fricatives).
+    voiced = (energy > threshold) & ((zcr < VAD_MAX_ZCR) | (energy > peak * VAD_FRICATIVE_RATIO))
+
+    run = max(1, VAD_MIN_SPEECH_MS // VAD_FRAME_MS)
+    if voiced.size < run:
+        return None
+    runs = np.convolve(voiced.astype(np.int8), np.ones(run, dtype=np.int8), mode="valid")
+    hits = np.flatnonzero(runs == run)
+    if hits.size == 0:
+        return None
+    return float(hits[0] * VAD_FRAME_MS)
+
+
+def reaction_time_server_vad_ms(audio_path: str | Path) -> float | None:
+    """Speech onset of a stored upload, or None if it cannot be decoded."""
+    if np is None:
+        return None
+    try:
+        samples, rate = audio_preprocess.decode_audio(audio_path)
+    except (audio_preprocess.AudioDecodeError, OSError, ValueError) as exc:
+        logger.debug("Server VAD skipped for %s: %s", Path(audio_path).name, exc)
+        return None
+    return speech_onset_ms(samples, rate)
+
+
+def reaction_time_server_vad_batch(
+    audio_paths: Iterable[str | Path],
+    workers: int | None = None,
+) -> dict[str, float | None]:
+    """Run the server VAD over many files, in a process pool when ``workers`` > 1."""
+    paths = [str(path) for path in audio_paths]
+    workers = workers if workers is not None else min(8, os.cpu_count() or 1)
+    if workers <= 1 or len(paths) < 2:
+        return {path: reaction_time_server_vad_ms(path) for path in paths}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(paths, pool.map(reaction_time_server_vad_ms, paths, chunksize=16)))
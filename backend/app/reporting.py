@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import datetime as dt
+import hashlib
 import json
 import os
+import statistics
 from pathlib import Path
 from typing import Any
 from contextlib import asynccontextmanager
@@ -59,11 +61,16 @@ def _format_rule_score(rule_score: dict[str, Any]) -> dict[str, Any]:
         detail = f"{rule_score.get('type')} matched: {', '.join(matched)}"
     elif rule_score.get("type") == "numeric_range":
         detail = f"value: {rule_score.get('value')} in range {rule_score.get('range')}"
-    return {
+    formatted = {
         "is_correct": rule_score.get("is_correct", False),
         "score": rule_score.get("score", 1 if rule_score.get("is_correct") else 0),
         "details": detail,
     }
+    if rule_score.get("spans"):
+        # [start, end) offsets into the transcript, aligned with "matched".
+        formatted["matched"] = matched
+        formatted["spans"] = rule_score["spans"]
+    return formatted
 
 
 def _build_instrument_scores(rows: list[dict[str, Any]]) -> dict[str, Any]:
@@ -209,11 +216,39 @@ def build_report(session_id: str) -> dict[str, Any]:
     if not session:
         raise ValueError("Session not found")
 
-    responses = storage.list_responses(session_id)
-    instrument_scores_rows = storage.list_instrument_scores(session_id)
-    questions = question_bank.load_all_questions()
-    question_map = question_bank.build_question_map(questions)
+    return _assemble_report(
+        session,
+        storage.list_responses(session_id),
+        storage.list_instrument_scores(session_id),
+        question_bank.get_question_bank().by_id,
+    )
+
+
+def build_reports(session_ids: list[str]) -> dict[str, dict[str, Any]]:
+    """Build reports for many sessions with one set-based query per table.
+
+    Unknown ids are left out of the result.
+    """
+    sessions = storage.get_sessions(session_ids)
+    found = [session_id for session_id in session_ids if session_id in sessions]
+    responses = storage.list_responses_for_sessions(found)
+    score_rows = storage.list_instrument_scores_for_sessions(found)
+    question_map = question_bank.get_question_bank().by_id
+    return {
+        session_id: _assemble_report(
+            sessions[session_id], responses[session_id], score_rows[session_id], question_map
+        )
+        for session_id in found
+    }
+
 
+def _assemble_report(
+    session: dict[str, Any],
+    responses: list[dict[str, Any]],
+    instrument_scores_rows: list[dict[str, Any]],
+    question_map: dict[str, dict[str, Any]],
+) -> dict[str, Any]:
+    session_id = session["id"]
     response_items = []
     for row in responses:
         question_id = row.get("question_id")
@@ -232,6 +267,8 @@ def build_report(session_id: str) -> dict[str, Any]:
             and isinstance(llm_judge.get("is_correct"), bool)
         ):
             is_correct = bool(llm_judge.get("is_correct"))
+        elif rule_score and rule_score.get("conclusive") and isinstance(rule_score.get("is_correct"), bool):
+            is_correct = rule_score["is_correct"]
         else:
             is_correct = None
 
@@ -262,11 +299,13 @@ def build_report(session_id: str) -> dict[str, Any]:
                 "reaction_time_ms": {
                     "vad": rt_vad,
                     "whisper": rt_whisper,
+                    "server_vad": row.get("reaction_time_server_vad_ms"),
                 },
                 "manual_confirmed": bool(manual_value) if manual_value is not None else None,
                 "rule_score": _format_rule_score(rule_score) if rule_score else None,
                 "llm_judge": llm_summary,
                 "is_correct": is_correct,
+                "scoring_status": row.get("scoring_status") or "done",
             }
         )
 
@@ -290,6 +329,107 @@ def build_report(session_id: str) -> dict[str, Any]:
     }
 
 
+def _median_ms(joined: str | None) -> float | None:
+    if not joined:
+        return None
+    return round(statistics.median(float(value) for value in joined.split(",")), 1)
+
+
+def build_timeline(
+    patient_id: str,
+    after: tuple[str, str] | None = None,
+    limit: int = 50,
+) -> dict[str, Any]:
+    """Summarize a patient's sessions, newest first, one keyset page at a time."""
+    rows = storage.list_patient_timeline(patient_id, after=after, limit=limit + 1)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    score_rows = storage.list_instrument_scores_for_sessions([row["id"] for row in rows])
+    bank = question_bank.get_question_bank()
+
+    entries = []
+    for row in rows:
+        instrument_scores = _build_instrument_scores(score_rows[row["id"]])
+        summary = _build_summary(instrument_scores)
+        entries.append(
+            {
+                "session_id": row["id"],
+                "instrument": row.get("instrument"),
+                "created_at": row.get("created_at"),
+                "screening_risk_band": summary["screening_risk_band"],
+                "screening_risk_level": summary["screening_risk_level"],
+                "screen_positive": summary["screen_positive"],
+                "instrument_scores": _format_instrument_scores(instrument_scores),
+                "total_questions": len(bank.for_instrument(row.get("instrument"))),
+                "answered": row["answered"],
+                "correct": row["correct"],
+                "incorrect": row["incorrect"],
+                "unscored": row["answered"] - row["correct"] - row["incorrect"],
+                "median_reaction_time_ms": {
+                    "vad": _median_ms(row.get("reaction_times_vad")),
+                    "whisper": _median_ms(row.get("reaction_times_whisper")),
+                },
+            }
+        )
+
+    next_cursor = None
+    if has_more and rows:
+        next_cursor = storage.encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+    return {"patient_id": patient_id, "sessions": entries, "next_cursor": next_cursor}
+
+
+def get_report(session_id: str) -> tuple[str, str]:
+    """Return ``(payload_json, etag)`` for a session, from the cache when valid.
+
+    The cache row is keyed by the session revision (bumped by every response
+    or score write) and the question-bank version. The revision is read
+    before building, so a write that lands mid-build leaves the stored entry
+    already stale rather than serving outdated data.
+    """
+    bank_version = question_bank.get_question_bank().version
+    cached = storage.get_cached_report(session_id)
+    if cached and cached["bank_version"] == bank_version:
+        return cached["payload_json"], cached["etag"]
+
+    revision = storage.get_session_revision(session_id)
+    if revision is None:
+        raise ValueError("Session not found")
+    report = build_report(session_id)
+    payload_json = json.dumps(report, ensure_ascii=False)
+    etag = hashlib.sha256(payload_json.encode("utf-8")).hexdigest()[:32]
+    storage.save_cached_report(session_id, revision, bank_version, etag, payload_json)
+    return payload_json, etag
+
+
+def get_reports(session_ids: list[str]) -> dict[str, tuple[str, str]]:
+    """Batch form of :func:`get_report`; unknown session ids are omitted."""
+    unique_ids = list(dict.fromkeys(session_ids))
+    bank_version = question_bank.get_question_bank().version
+    results: dict[str, tuple[str, str]] = {}
+    for session_id, cached in storage.get_cached_reports(unique_ids).items():
+        if cached["bank_version"] == bank_version:
+            results[session_id] = (cached["payload_json"], cached["etag"])
+
+    missing = [session_id for session_id in unique_ids if session_id not in results]
+    if missing:
+        revisions = storage.get_session_revisions(missing)
+        rows = []
+        for session_id, report in build_reports(missing).items():
+            payload_json = json.dumps(report, ensure_ascii=False)
+            etag = hashlib.sha256(payload_json.encode("utf-8")).hexdigest()[:32]
+            results[session_id] = (payload_json, etag)
+            rows.append((session_id, revisions[session_id], bank_version, etag, payload_json))
+        storage.save_cached_reports(rows)
+    return results
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [value.strip().removeprefix("W/").strip('"') for value in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
 def save_report(report: dict[str, Any], session_id: str) -> Path:
     report_dir = Path(os.getenv("COGSCREEN_REPORT_DIR", BASE_DIR / "data" / "reports"))
     report_dir.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import datetime as dt
+import json
+import os
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Iterator
+from zoneinfo import ZoneInfo
+
+from backend.app import question_bank, scoring_rules, storage
+from backend.app.pipeline import is_conclusive, rule_score_for, scoring_context
+
+DEFAULT_RUN = "default"
+DEFAULT_CHUNK_SIZE = 2000
+MAX_EXAMPLES = 20
+
+
+@dataclass(frozen=True)
+class Change:
+    """One response whose stored rule score was rewritten."""
+
+    rowid: int
+    response_id: str
+    question_id: str
+    transcript: str
+    rule_score_json: str | None
+    old_verdict: bool | None
+    new_verdict: bool | None
+    # True when a manual or LLM verdict outranks the rule score in reports.
+    overridden: bool
+
+
+@dataclass
+class RescoreSummary:
+    run: str
+    bank_version: str
+    started_after: int
+    last_rowid: int
+    dry_run: bool = False
+    scanned: int = 0
+    scored: int = 0
+    changed: int = 0
+    # (question_id, old verdict, new verdict) -> responses whose verdict flipped.
+    flips: Counter[tuple[str, bool | None, bool | None]] = field(default_factory=Counter)
+    report_flips: int = 0
+    examples: list[Change] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "run": self.run,
+            "bank_version": self.bank_version,
+            "started_after": self.started_after,
+            "last_rowid": self.last_rowid,
+            "dry_run": self.dry_run,
+            "scanned": self.scanned,
+            "scored": self.scored,
+            "changed": self.changed,
+            "report_flips": self.report_flips,
+            "flips": [
+                {"question_id": question_id, "old": old, "new": new, "count": count}
+                for (question_id, old, new), count in sorted(self.flips.items(), key=str)
+            ],
+            "examples": [
+                {
+                    "response_id": change.response_id,
+                    "question_id": change.question_id,
+                    "transcript": change.transcript,
+                    "old": change.old_verdict,
+                    "new": change.new_verdict,
+                }
+                for change in self.examples
+            ],
+        }
+
+
+def verdict(rule_score: dict[str, Any] | None) -> bool | None:
+    value = (rule_score or {}).get("is_correct")
+    return value if isinstance(value, bool) else None
+
+
+def _carry_conclusive(old: dict[str, Any] | None, new: dict[str, Any] | None) -> dict[str, Any] | None:
+    """``new`` with the stored ``conclusive`` flag kept where it still applies.
+
+    The pipeline sets the flag from the judge configuration the response was
+    scored under, which this process need not share, so it is never
+    recomputed here: it carries over while the rule type is unchanged and
+    the new score is still a trusted match, and is dropped otherwise.
+    Locally scored types flag themselves.
+    """
+    if not new or "conclusive" in new or not (old or {}).get("conclusive"):
+        return new
+    if old.get("type") == new.get("type") and is_conclusive(new):
+        return {**new, "conclusive": True}
+    return new
+
+
+def response_time(created_at: str | None, timezone: str) -> dt.datetime | None:
+    """``responses.created_at`` (UTC ``CURRENT_TIMESTAMP`` text) as a local datetime."""
+    if not created_at:
+        return None
+    try:
+        moment = dt.datetime.fromisoformat(created_at)
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=dt.timezone.utc)
+    return moment.astimezone(ZoneInfo(timezone))
+
+
+def rescore_rows(rows: list[tuple[Any, ...]], bank_version: str | None = None) -> tuple[int, list[Change]]:
+    """Score one chunk from :func:`storage.iter_rescore_rows`; returns ``(scored, changes)``.
+
+    Rows are grouped by question so each compiled rule scores its
+    transcripts back to back; date and time-of-day rules resolve against
+    the response's own ``created_at``. Runs in pool workers, so it only
+    reads the question files, never the database.
+    """
+    bank = question_bank.get_question_bank()
+    if bank_version is not None and bank.version != bank_version:
+        raise RuntimeError("Question files changed during re-scoring; run again to start over")
+    by_question: dict[str, list[tuple[Any, ...]]] = {}
+    for row in rows:
+        by_question.setdefault(row[2], []).append(row)
+
+    contexts: dict[str | None, dict[str, Any]] = {}
+    scored = 0
+    changes: list[Change] = []
+    for question_id, group in by_question.items():
+        question = bank.get(question_id)
+        if not question or question.get("exclude_from_scoring") or not question.get("scoring_rule"):
+            continue
+        compiled = scoring_rules.compile_rule(question["scoring_rule"])
+        for rowid, response_id, _, transcript, old_json, created_at, config_json, overridden in group:
+            transcript = transcript.strip()
+            if not transcript:
+                continue
+            context = contexts.get(config_json)
+            if context is None:
+                config = json.loads(config_json) if config_json else {}
+                context = contexts[config_json] = scoring_context(config if isinstance(config, dict) else {})
+            now = response_time(created_at, context["timezone"])
+            resolved = compiled.resolve({**context, "now": now} if now else context)
+            old_score = json.loads(old_json) if old_json else None
+            rule_score = _carry_conclusive(old_score, rule_score_for(resolved, transcript))
+            scored += 1
+            new_json = json.dumps(rule_score) if rule_score else None
+            if old_score == (json.loads(new_json) if new_json else None):
+                continue
+            changes.append(
+                Change(
+                    rowid=rowid,
+                    response_id=response_id,
+                    question_id=question_id,
+                    transcript=transcript,
+                    rule_score_json=new_json,
+                    old_verdict=verdict(old_score),
+                    new_verdict=verdict(rule_score),
+                    overridden=bool(overridden),
+                )
+            )
+    return scored, changes
+
+
+def _scored_chunks(
+    chunks: Iterable[list[tuple[Any, ...]]],
+    workers: int,
+    bank_version: str,
+) -> Iterator[tuple[list[tuple[Any, ...]], tuple[int, list[Change]]]]:
+    """Score chunks, in a process pool when ``workers`` > 1, yielding them in rowid order."""
+    if workers <= 1:
+        for chunk in chunks:
+            yield chunk, rescore_rows(chunk, bank_version)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # A bounded window keeps memory flat and the checkpoint monotonic.
+        pending: deque[tuple[list[tuple[Any, ...]], Future]] = deque()
+        for chunk in chunks:
+            pending.append((chunk, pool.submit(rescore_rows, chunk, bank_version)))
+            if len(pending) >= workers * 2:
+                done, future = pending.popleft()
+                yield done, future.result()
+        while pending:
+            done, future = pending.popleft()
+            yield done, future.result()
+
+
+def rescore(
+    run: str = DEFAULT_RUN,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int | None = None,
+    restart: bool = False,
+    dry_run: bool = False,
+    question_ids: list[str] | None = None,
+    on_chunk: Callable[[RescoreSummary], None] | None = None,
+) -> RescoreSummary:
+    """Re-apply the current question bank's rules to stored transcripts.
+
+    Responses stream in rowid order and each chunk's changed scores are
+    written in one transaction together with the run's checkpoint, so an
+    interrupted run resumes after the last written chunk. A checkpoint taken
+    against other question files is discarded and the run starts over.
+    ``dry_run`` computes the diff without writing anything. Rowids can be
+    renumbered by ``VACUUM``; restart runs that span one.
+    """
+    bank = question_bank.get_question_bank()
+    checkpoint = storage.get_rescore_run(run)
+    after = 0
+    if checkpoint and not restart and checkpoint["bank_version"] == bank.version:
+        after = int(checkpoint["last_rowid"])
+    elif checkpoint and not dry_run:
+        storage.reset_rescore_run(run)
+    summary = RescoreSummary(run=run, bank_version=bank.version, started_after=after, last_rowid=after, dry_run=dry_run)
+    workers = workers if workers is not None else min(8, os.cpu_count() or 1)
+
+    chunks = storage.iter_rescore_rows(after, chunk_size, question_ids)
+    for chunk, (scored, changes) in _scored_chunks(chunks, workers, bank.version):
+        summary.scanned += len(chunk)
+        summary.scored += scored
+        summary.changed += len(changes)
+        summary.last_rowid = chunk[-1][0]
+        for change in changes:
+            if change.old_verdict == change.new_verdict:
+                continue
+            summary.flips[(change.question_id, change.old_verdict, change.new_verdict)] += 1
+            if not change.overridden:
+                summary.report_flips += 1
+            if len(summary.examples) < MAX_EXAMPLES:
+                summary.examples.append(change)
+        if not dry_run:
+            storage.save_rescore_chunk(
+                run,
+                bank.version,
+                summary.last_rowid,
+                len(chunk),
+                [(change.rule_score_json, change.rowid) for change in changes],
+            )
+        if on_chunk:
+            on_chunk(summary)
+    return summary
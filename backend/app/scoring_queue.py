@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+from typing import Any
+
+from backend.app import pipeline, question_bank, storage
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = int(os.getenv("COGSCREEN_SCORING_MAX_ATTEMPTS", "3"))
+POLL_INTERVAL_SECONDS = float(os.getenv("COGSCREEN_SCORING_POLL_SECONDS", "2"))
+STALE_JOB_SECONDS = float(os.getenv("COGSCREEN_SCORING_STALE_SECONDS", "300"))
+SWEEP_INTERVAL_SECONDS = float(os.getenv("COGSCREEN_SCORING_SWEEP_SECONDS", "60"))
+ERROR_BACKOFF_SECONDS = 1.0
+
+_wakeup: asyncio.Event | None = None
+_workers: list[asyncio.Task[None]] = []
+# Jobs this process has claimed and not finished; requeued on shutdown.
+_active_jobs: set[int] = set()
+
+
+def scoring_mode() -> str:
+    """``sync`` scores inside the request; ``queue`` defers to the workers."""
+    return os.getenv("COGSCREEN_SCORING_MODE", "sync").strip().lower()
+
+
+def worker_count() -> int:
+    return max(1, int(os.getenv("COGSCREEN_SCORING_WORKERS", "4")))
+
+
+def notify() -> None:
+    if _wakeup is not None:
+        _wakeup.set()
+
+
+async def process_job(job: dict[str, Any]) -> None:
+    session = storage.get_session(job["session_id"])
+    question = question_bank.get_question_bank().get(job["question_id"])
+    if not session or not question:
+        await asyncio.to_thread(
+            storage.fail_scoring_job, job["id"], job["response_id"], "Session or question not found", retry=False
+        )
+        return
+    try:
+        config = json.loads(session.get("config_json") or "{}")
+    except json.JSONDecodeError:
+        config = {}
+
+    try:
+        result = await pipeline.score_submission(
+            job["session_id"],
+            question,
+            config,
+            job["audio_path"],
+            job.get("answer_text"),
+        )
+    except Exception as exc:
+        retry = job["attempts"] < MAX_ATTEMPTS
+        logger.exception("Scoring job %s failed (attempt %s)", job["id"], job["attempts"])
+        await asyncio.to_thread(storage.fail_scoring_job, job["id"], job["response_id"], str(exc), retry=retry)
+        return
+
+    await asyncio.to_thread(
+        storage.complete_scoring_job,
+        job["id"],
+        job["response_id"],
+        transcript=result["transcript"],
+        reaction_time_whisper_ms=result["reaction_time_whisper_ms"],
+        rule_score=result["rule_score"],
+        llm_judge=result["llm_judge"],
+        reaction_time_server_vad_ms=result["reaction_time_server_vad_ms"],
+    )
+
+
+async def _claim() -> dict[str, Any] | None:
+    """Claim the next job on a worker thread; BEGIN IMMEDIATE waits out other writers.
+
+    A claim still in flight when the worker is cancelled is awaited and
+    recorded, so that shutdown puts the job back in the queue.
+    """
+    claim = asyncio.ensure_future(asyncio.to_thread(storage.claim_scoring_job))
+    try:
+        return await asyncio.shield(claim)
+    except asyncio.CancelledError:
+        try:
+            job = await claim
+        except Exception:
+            job = None
+        if job is not None:
+            _active_jobs.add(job["id"])
+        raise
+
+
+async def _worker_loop() -> None:
+    assert _wakeup is not None
+    while True:
+        job = None
+        try:
+            job = await _claim()
+            if job is None:
+                _wakeup.clear()
+                try:
+                    await asyncio.wait_for(_wakeup.wait(), timeout=POLL_INTERVAL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            _active_jobs.add(job["id"])
+            await process_job(job)
+            _active_jobs.discard(job["id"])
+        except Exception as exc:
+            # Storage errors (e.g. "database is locked") must not kill the worker.
+            logger.exception("Scoring worker error%s", f" on job {job['id']}" if job else "")
+            if job is not None:
+                _active_jobs.discard(job["id"])
+                try:
+                    await asyncio.to_thread(
+                        storage.fail_scoring_job,
+                        job["id"],
+                        job["response_id"],
+                        str(exc),
+                        retry=job["attempts"] < MAX_ATTEMPTS,
+                    )
+                except Exception:
+                    logger.exception("Could not record failure of scoring job %s", job["id"])
+            await asyncio.sleep(ERROR_BACKOFF_SECONDS)
+
+
+async def _requeue_stale() -> None:
+    requeued = await asyncio.to_thread(storage.requeue_running_jobs, STALE_JOB_SECONDS)
+    if requeued:
+        logger.info("Requeued %s interrupted scoring jobs", requeued)
+        notify()
+
+
+async def _sweep_loop() -> None:
+    """Requeue jobs left running by a worker process that died, at startup and periodically."""
+    while True:
+        try:
+            await _requeue_stale()
+        except Exception:
+            logger.exception("Stale scoring job sweep failed")
+        await asyncio.sleep(SWEEP_INTERVAL_SECONDS)
+
+
+def start_workers() -> None:
+    """Start the in-process workers; jobs orphaned by a crash are requeued."""
+    global _wakeup
+    if _workers:
+        return
+    _wakeup = asyncio.Event()
+    for _ in range(worker_count()):
+        _workers.append(asyncio.create_task(_worker_loop()))
+    _workers.append(asyncio.create_task(_sweep_loop()))
+
+
+async def stop_workers() -> None:
+    """Cancel the workers and put the jobs they were scoring back in the queue."""
+    global _wakeup
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+    _wakeup = None
+    if _active_jobs:
+        requeued = await asyncio.to_thread(storage.requeue_scoring_jobs, sorted(_active_jobs))
+        _active_jobs.clear()
+        logger.info("Requeued %s scoring jobs interrupted by shutdown", requeued)
+
+
+async def wait_for_session(session_id: str, timeout: float) -> bool:
+    """Wait until no job for the session is queued or running."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while storage.count_pending_scoring(session_id):
+        if loop.time() >= deadline:
+            return False
+        await asyncio.sleep(0.2)
+    return True
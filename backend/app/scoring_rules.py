@@ -1,17 +1,53 @@
 from __future__ import annotations
 
-from difflib import SequenceMatcher
-from typing import Any
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
+from types import MappingProxyType
+from typing import Any, Mapping
 import datetime as dt
+import threading
 from zoneinfo import ZoneInfo
 import os
 import re
 
+from backend.app.matching import FuzzyPattern, PatternMatcher
+
 
 def normalize(text: str) -> str:
     return " ".join(text.strip().lower().split())
 
 
+def _normalized_offsets(text: str) -> list[int]:
+    """Index in ``text`` of each character of ``normalize(text)``."""
+    offsets: list[int] = []
+    space_at = None
+    for index, char in enumerate(text):
+        if char.isspace():
+            if offsets and space_at is None:
+                space_at = index
+            continue
+        if space_at is not None:
+            offsets.append(space_at)
+            space_at = None
+        offsets.extend([index] * len(char.lower()))
+    return offsets
+
+
+def answer_spans(answer: str, norm_answer: str, spans: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Map ``(start, end)`` spans in ``normalize(answer)`` back onto ``answer``."""
+    if not spans or answer == norm_answer:
+        return spans
+    offsets = _normalized_offsets(answer)
+    mapped = []
+    for start, end in spans:
+        if end > start:
+            mapped.append((offsets[start], offsets[end - 1] + 1))
+        else:
+            position = offsets[start] if start < len(offsets) else len(answer)
+            mapped.append((position, position))
+    return mapped
+
+
 def score_exact(answer: str, expected: list[str]) -> dict[str, Any]:
     norm_answer = normalize(answer)
     matches = [exp for exp in expected if normalize(exp) == norm_answer]
@@ -34,8 +70,10 @@ def score_contains_any(answer: str, expected: list[str]) -> dict[str, Any]:
 
 def score_contains_all(answer: str, expected: list[str]) -> dict[str, Any]:
     norm_answer = normalize(answer)
-    missing = [exp for exp in expected if normalize(exp) not in norm_answer]
-    matched = [exp for exp in expected if normalize(exp) in norm_answer]
+    matched: list[str] = []
+    missing: list[str] = []
+    for exp in expected:
+        (matched if normalize(exp) in norm_answer else missing).append(exp)
     return {
         "type": "contains_all",
         "is_correct": len(missing) == 0 and len(expected) > 0,
@@ -44,22 +82,57 @@ def score_contains_all(answer: str, expected: list[str]) -> dict[str, Any]:
     }
 
 
-def score_fuzzy(answer: str, expected: list[str], threshold: float = 0.85) -> dict[str, Any]:
+def _fuzzy_result(
+    answer: str,
+    expected: tuple[str, ...] | list[str],
+    patterns: tuple[FuzzyPattern, ...] | list[FuzzyPattern],
+    threshold: float,
+    partial: bool = False,
+) -> dict[str, Any]:
+    """Best Indel similarity of ``answer`` against each expected string.
+
+    Candidates are only compared for as long as they can reach the
+    threshold (and, after a hit, beat the best so far); a perfect match
+    stops the search. When nothing reaches the threshold the candidates
+    are compared again without a cutoff, so ``score`` and ``matched``
+    still report the closest one. ``partial`` scores the best-matching
+    window of a long answer instead of the whole answer.
+    """
     norm_answer = normalize(answer)
     best_match = None
     best_score = 0.0
-    for exp in expected:
-        score = SequenceMatcher(None, norm_answer, normalize(exp)).ratio()
-        if score > best_score:
-            best_match = exp
-            best_score = score
-    return {
+    best_span = (0, 0)
+    for exp, pattern in zip(expected, patterns):
+        cutoff = max(threshold, best_score)
+        if partial:
+            score, start, end = pattern.partial_ratio(norm_answer, cutoff)
+        else:
+            score, start, end = pattern.ratio(norm_answer, cutoff), 0, len(norm_answer)
+        if score >= cutoff and (best_match is None or score > best_score):
+            best_match, best_score, best_span = exp, score, (start, end)
+            if best_score >= 1.0:
+                break
+    is_correct = best_match is not None
+    if not is_correct:
+        for exp, pattern in zip(expected, patterns):
+            score = pattern.partial_ratio(norm_answer)[0] if partial else pattern.ratio(norm_answer)
+            if score > best_score:
+                best_match, best_score = exp, score
+    result = {
         "type": "fuzzy",
-        "is_correct": best_score >= threshold,
-        "matched": [best_match] if best_match else [],
+        "is_correct": is_correct,
+        "matched": [best_match] if best_match is not None else [],
         "score": best_score,
         "threshold": threshold,
     }
+    if partial and is_correct:
+        result["spans"] = answer_spans(answer, norm_answer, [best_span])
+    return result
+
+
+def score_fuzzy(answer: str, expected: list[str], threshold: float = 0.85, partial: bool = False) -> dict[str, Any]:
+    patterns = [FuzzyPattern(normalize(exp)) for exp in expected]
+    return _fuzzy_result(answer, expected, patterns, threshold, partial)
 
 
 def score_numeric_range(answer: str, min_value: float | None, max_value: float | None) -> dict[str, Any]:
@@ -85,6 +158,66 @@ def score_numeric_range(answer: str, min_value: float | None, max_value: float |
     }
 
 
+CHINESE_DIGITS = {"零": 0, "〇": 0, "一": 1, "二": 2, "兩": 2, "三": 3, "四": 4, "五": 5, "六": 6, "七": 7, "八": 8, "九": 9}
+CHINESE_UNITS = {"十": 10, "百": 100, "千": 1000}
+# A minus sign directly after a digit is a separator ("8-6-4"), not a sign.
+NUMBER_PATTERN = re.compile(r"(?<![\d.])-?\d+(?:\.\d+)?|負?[零〇一二兩三四五六七八九十百千萬]+")
+
+
+def _chinese_number(text: str) -> int:
+    total = section = digit = 0
+    for char in text:
+        if char in CHINESE_DIGITS:
+            digit = CHINESE_DIGITS[char]
+        elif char == "萬":
+            total += (section + digit) * 10000
+            section = digit = 0
+        else:
+            section += (digit or 1) * CHINESE_UNITS[char]
+            digit = 0
+    return total + section + digit
+
+
+def extract_numbers(text: str) -> list[float]:
+    """Numbers in an answer, in order, from digits or Chinese numerals.
+
+    A run of Chinese numerals with a unit (十/百/千/萬) is one number
+    ("二十三" -> 23); a run of bare digits is read digit by digit
+    ("八六四" -> 8, 6, 4), which is how counting answers are transcribed.
+    """
+    numbers: list[float] = []
+    for match in NUMBER_PATTERN.finditer(text):
+        token = match.group()
+        if token[0] not in "負零〇一二兩三四五六七八九十百千萬":
+            numbers.append(float(token))
+            continue
+        sign = -1 if token[0] == "負" else 1
+        token = token.lstrip("負")
+        if not token:
+            continue
+        if any(char in CHINESE_UNITS or char == "萬" for char in token):
+            numbers.append(float(sign * _chinese_number(token)))
+        else:
+            numbers.extend(float(CHINESE_DIGITS[char]) for char in token)
+            numbers[len(numbers) - len(token)] *= sign
+    return numbers
+
+
+def _best_alignment(observed: list[float], expected: list[float]) -> tuple[int, int]:
+    """``(matches, offset)`` of the window of ``observed`` that best lines up with ``expected``.
+
+    Stray numbers before the sequence (e.g. the starting value, or "一" in
+    "想一下") then do not shift every position.
+    """
+    best = (0, 0)
+    for offset in range(max(1, len(observed) - len(expected) + 1)):
+        window = observed[offset : offset + len(expected)]
+        matches = sum(1 for value, target in zip(window, expected) if value == target)
+        if matches > best[0]:
+            best = (matches, offset)
+    return best
+
+
 def score_sequence_subtract(
     answer: str,
     start: float,
@@ -92,14 +225,9 @@ def score_sequence_subtract(
     count: int = 5,
     min_correct: int | None = None,
 ) -> dict[str, Any]:
-    numbers = [float(match.group()) for match in re.finditer(r"-?\\d+(?:\\.\\d+)?", answer)]
+    numbers = extract_numbers(answer)
     expected = [start + (step * i) for i in range(count)]
-    correct = 0
-    for idx, value in enumerate(numbers[:count]):
-        if idx >= len(expected):
-            break
-        if value == expected[idx]:
-            correct += 1
+    correct, offset = _best_alignment(numbers, expected)
     required = min_correct if min_correct is not None else count
     return {
         "type": "sequence_subtract",
@@ -107,14 +235,21 @@ def score_sequence_subtract(
         "correct_count": correct,
         "required": required,
         "expected": expected,
-        "observed": numbers[:count],
+        "observed": numbers[offset : offset + count],
     }
 
 
-def _weekday_labels(weekday_index: int) -> list[str]:
+def _weekday_labels(weekday_index: int, spoken: bool = False) -> list[str]:
     labels = ["一", "二", "三", "四", "五", "六", "日"]
     day = labels[weekday_index]
-    return [f"星期{day}", f"週{day}", f"禮拜{day}"]
+    names = [f"星期{day}", f"週{day}", f"禮拜{day}"]
+    if not spoken:
+        return names
+    # 拜三 is the Taiwanese reading the spoken prompts use.
+    names += [f"周{day}", f"拜{day}"]
+    if day == "日":
+        names += ["星期天", "禮拜天"]
+    return names
 
 
 def _season_label(month: int) -> str:
@@ -127,115 +262,543 @@ def _season_label(month: int) -> str:
     return "冬天"
 
 
-def _expand_token(token: str, context: dict[str, Any]) -> list[str]:
+DATE_TOKENS = frozenset(
+    {
+        "__TODAY_YEAR__",
+        "__TODAY_MONTH__",
+        "__TODAY_DAY__",
+        "__TODAY_WEEKDAY__",
+        "__SEASON__",
+        "__TODAY_DATE__",
+    }
+)
+
+
+def _now(context: dict[str, Any]) -> dt.datetime:
     tz_name = context.get("timezone") or os.getenv("COGSCREEN_TIMEZONE", "Asia/Taipei")
-    now = context.get("now") or dt.datetime.now(ZoneInfo(tz_name))
+    return context.get("now") or dt.datetime.now(ZoneInfo(tz_name))
+
+
+def expectation_expiry(rule: dict[str, Any], context: dict[str, Any] | None = None) -> float | None:
+    """Epoch seconds at which the rule's resolved expectations change.
+
+    Date tokens roll over at local midnight and time-of-day rules at the
+    next hour; ``None`` means the expectations do not depend on the clock.
+    """
+    context = context or {}
+    expected = rule.get("expected")
+    tokens = expected if isinstance(expected, list) else [expected]
+    now = _now(context)
+    if rule.get("type") == "time_period":
+        boundary = now.replace(minute=0, second=0, microsecond=0) + dt.timedelta(hours=1)
+        return boundary.timestamp()
+    if rule.get("type") == "dynamic_date" or any(str(token) in DATE_TOKENS for token in tokens):
+        midnight = dt.datetime.combine(now.date() + dt.timedelta(days=1), dt.time(), tzinfo=now.tzinfo)
+        return midnight.timestamp()
+    return None
+
+
+@lru_cache(maxsize=64)
+def _date_token_values(token: str, today: dt.date) -> tuple[str, ...]:
+    """Spellings of a date token; depends only on the local date, so memoized."""
     if token == "__TODAY_YEAR__":
-        year = str(now.year)
-        return [year, f"{year}年"]
+        year = str(today.year)
+        return (year, f"{year}年")
     if token == "__TODAY_MONTH__":
-        month = str(now.month)
-        return [month, f"{now.month:02d}", f"{month}月", f"{now.month:02d}月"]
+        month = str(today.month)
+        return (month, f"{today.month:02d}", f"{month}月", f"{today.month:02d}月")
     if token == "__TODAY_DAY__":
-        day = str(now.day)
-        return [
+        day = str(today.day)
+        return (
             day,
-            f"{now.day:02d}",
+            f"{today.day:02d}",
             f"{day}日",
-            f"{now.day:02d}日",
+            f"{today.day:02d}日",
             f"{day}號",
-            f"{now.day:02d}號",
-        ]
+            f"{today.day:02d}號",
+        )
     if token == "__TODAY_WEEKDAY__":
-        return _weekday_labels(now.weekday())
+        return tuple(_weekday_labels(today.weekday()))
     if token == "__SEASON__":
-        return [_season_label(now.month)]
-    if token == "__TODAY_DATE__":
-        y = now.year
-        m = now.month
-        d = now.day
-        return [
-            f"{y}年{m}月{d}日",
-            f"{y}/{m}/{d}",
-            f"{y}-{m:02d}-{d:02d}",
-            f"{y}.{m}.{d}",
-        ]
-    if token == "__PATIENT_PHONE__":
-        value = context.get("patient_phone")
-        return [str(value)] if value else []
-    if token == "__PATIENT_ADDRESS__":
-        value = context.get("patient_address")
-        return [str(value)] if value else []
-    if token == "__PATIENT_BIRTHDAY__":
-        value = context.get("patient_birthday")
-        return [str(value)] if value else []
-    if token == "__PATIENT_MOTHER_NAME__":
-        value = context.get("patient_mother_name")
-        return [str(value)] if value else []
-    if token == "__PATIENT_AGE__":
-        value = context.get("patient_age")
-        if value is None:
-            return []
-        value_str = str(value)
-        return [value_str, f"{value_str}歲"]
-    if token == "__PRESIDENT_CURRENT__":
-        value = context.get("president_current") or os.getenv("COGSCREEN_PRESIDENT_CURRENT")
-        return [str(value)] if value else []
-    if token == "__PRESIDENT_PREVIOUS__":
-        value = context.get("president_previous") or os.getenv("COGSCREEN_PRESIDENT_PREVIOUS")
+        return (_season_label(today.month),)
+    y = today.year
+    m = today.month
+    d = today.day
+    return (
+        f"{y}年{m}月{d}日",
+        f"{y}/{m}/{d}",
+        f"{y}-{m:02d}-{d:02d}",
+        f"{y}.{m}.{d}",
+    )
+
+
+# ``dynamic_date`` rules name what to ask for ("weekday"); each kind is the
+# date token that spells it.
+DATE_KINDS = {
+    "year": "__TODAY_YEAR__",
+    "month": "__TODAY_MONTH__",
+    "day": "__TODAY_DAY__",
+    "weekday": "__TODAY_WEEKDAY__",
+    "season": "__SEASON__",
+    "date": "__TODAY_DATE__",
+}
+
+# Local hours [start, end) in which each period word is a right answer.
+# Windows overlap so answers near a boundary are accepted either way;
+# 早起/中晝/下晡/暗時 are the Taiwanese words.
+TIME_PERIODS: dict[str, tuple[tuple[int, int], ...]] = {
+    "凌晨": ((0, 6),),
+    "清晨": ((4, 8),),
+    "早上": ((5, 12),),
+    "上午": ((5, 12),),
+    "早起": ((5, 12),),
+    "中午": ((11, 14),),
+    "中晝": ((11, 14),),
+    "下午": ((12, 19),),
+    "下晡": ((12, 19),),
+    "傍晚": ((16, 20),),
+    "晚上": ((17, 24), (0, 5)),
+    "暗時": ((17, 24), (0, 5)),
+    "半夜": ((22, 24), (0, 5)),
+}
+
+
+def _in_period(period: str, hour: int) -> bool:
+    return any(start <= hour < end for start, end in TIME_PERIODS.get(period, ()))
+
+
+# Context-dependent tokens -> (context key, environment fallback).
+CONTEXT_TOKENS: dict[str, tuple[str, str | None]] = {
+    "__PATIENT_PHONE__": ("patient_phone", None),
+    "__PATIENT_ADDRESS__": ("patient_address", None),
+    "__PATIENT_BIRTHDAY__": ("patient_birthday", None),
+    "__PATIENT_MOTHER_NAME__": ("patient_mother_name", None),
+    "__PATIENT_AGE__": ("patient_age", None),
+    "__PRESIDENT_CURRENT__": ("president_current", "COGSCREEN_PRESIDENT_CURRENT"),
+    "__PRESIDENT_PREVIOUS__": ("president_previous", "COGSCREEN_PRESIDENT_PREVIOUS"),
+}
+
+
+def _context_value(token: str, context: dict[str, Any]) -> Any:
+    key, env = CONTEXT_TOKENS[token]
+    value = context.get(key)
+    if not value and env:
+        value = os.getenv(env)
+    return value
+
+
+def _expand_token(token: str, context: dict[str, Any], now: dt.datetime | None = None) -> list[str]:
+    if token in DATE_TOKENS:
+        return list(_date_token_values(token, (now or _now(context)).date()))
+    if token in CONTEXT_TOKENS:
+        value = _context_value(token, context)
+        if token == "__PATIENT_AGE__":
+            return [] if value is None else [str(value), f"{value}歲"]
         return [str(value)] if value else []
     return [token]
 
 
-def prepare_rule(rule: dict[str, Any], context: dict[str, Any] | None = None) -> tuple[dict[str, Any], bool]:
-    if not rule:
-        return {}, False
-    context = context or {}
-    expected = rule.get("expected")
-    if not expected:
-        return dict(rule), False
-    resolved: list[str] = []
-    for token in expected:
-        resolved.extend(_expand_token(str(token), context))
-    deduped = []
-    seen = set()
-    for item in resolved:
-        norm = normalize(item)
-        if not norm or norm in seen:
-            continue
-        seen.add(norm)
-        deduped.append(item)
-    if not deduped:
-        return dict(rule), True
-    updated = dict(rule)
-    updated["expected"] = deduped
-    return updated, False
-
-
-def score_answer(answer: str, rule: dict[str, Any]) -> dict[str, Any]:
-    rule_type = rule.get("type")
-    expected = rule.get("expected") or []
-    if rule_type == "exact":
-        return score_exact(answer, expected)
-    if rule_type == "contains_any":
-        return score_contains_any(answer, expected)
-    if rule_type == "contains_all":
-        return score_contains_all(answer, expected)
-    if rule_type == "fuzzy":
-        threshold = float(rule.get("threshold", 0.85))
-        return score_fuzzy(answer, expected, threshold)
-    if rule_type == "numeric_range":
-        return score_numeric_range(answer, rule.get("min_value"), rule.get("max_value"))
-    if rule_type == "sequence_subtract":
-        return score_sequence_subtract(
-            answer,
-            float(rule.get("start", 0)),
-            float(rule.get("step", -1)),
-            int(rule.get("count", 5)),
-            rule.get("min_correct"),
+RESOLVED_CACHE_SIZE = 256
+
+# Rule types scored entirely here: the result is conclusive and the LLM
+# judge is never called for them.
+LOCAL_RULE_TYPES = frozenset({"dynamic_date", "time_period", "contains_any_count", "sequence", "instruction_only"})
+# Free-form answers only the judge can score; no rule score is computed.
+JUDGE_RULE_TYPES = frozenset({"open_response", "semantic"})
+
+Group = tuple[tuple[str, str], ...]
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """A scoring rule parsed once into immutable, pre-normalized lookups.
+
+    ``expected`` and ``normalized`` are index-aligned; ``by_normalized`` maps
+    each normalized form to the expected strings that produce it. A rule
+    with date or patient tokens is ``dynamic``: :meth:`resolve` expands it
+    for a context, memoized per local date and context values. ``unresolved``
+    marks a resolved rule whose tokens all expanded to nothing.
+
+    ``groups`` are synonym sets of ``(expected, normalized)`` pairs that
+    count as one item: the rule's ``groups`` when given, otherwise one per
+    token (all spellings of a date token form one group). ``excluded`` holds
+    normalized answers that contradict the rule, such as another weekday.
+    """
+
+    rule_type: str
+    rule: Mapping[str, Any]
+    tokens: tuple[str, ...]
+    expected: tuple[str, ...]
+    normalized: tuple[str, ...]
+    by_normalized: Mapping[str, tuple[str, ...]]
+    date_dependent: bool = False
+    context_tokens: tuple[str, ...] = ()
+    unresolved: bool = False
+    groups: tuple[Group, ...] = ()
+    excluded: tuple[str, ...] = ()
+    _resolved: dict[tuple[Any, ...], "CompiledRule"] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    @classmethod
+    def build(
+        cls,
+        rule: Mapping[str, Any],
+        expected: list[str],
+        tokens: tuple[str, ...] = (),
+        unresolved: bool = False,
+        groups: list[list[str]] | None = None,
+        excluded: tuple[str, ...] = (),
+    ) -> "CompiledRule":
+        normalized = tuple(normalize(item) for item in expected)
+        grouped: dict[str, list[str]] = {}
+        for item, norm in zip(expected, normalized):
+            grouped.setdefault(norm, []).append(item)
+        if isinstance(rule.get("groups"), list):
+            groups = [[str(item) for item in group] for group in rule["groups"] if isinstance(group, list)]
+        elif groups is None:
+            groups = [[item] for item in expected]
+        return cls(
+            rule_type=str(rule.get("type") or ""),
+            rule=MappingProxyType(dict(rule)),
+            tokens=tokens,
+            expected=tuple(expected),
+            normalized=normalized,
+            by_normalized=MappingProxyType({key: tuple(items) for key, items in grouped.items()}),
+            date_dependent=any(token in DATE_TOKENS for token in tokens),
+            context_tokens=tuple(dict.fromkeys(token for token in tokens if token in CONTEXT_TOKENS)),
+            unresolved=unresolved,
+            groups=tuple(
+                tuple((item, normalize(item)) for item in group) for group in groups if group
+            ),
+            excluded=excluded,
+        )
+
+    @property
+    def dynamic(self) -> bool:
+        return self.date_dependent or self.hourly or bool(self.context_tokens)
+
+    @property
+    def hourly(self) -> bool:
+        return self.rule_type == "time_period"
+
+    def resolve(self, context: dict[str, Any] | None = None) -> "CompiledRule":
+        """Expand tokens and dedupe expectations (by normalized form) for ``context``."""
+        if not self.tokens:
+            return self
+        context = context or {}
+        now = _now(context) if self.date_dependent or self.hourly else None
+        key = (
+            now.date() if now else None,
+            now.hour if self.hourly else None,
+            *(_context_value(token, context) for token in self.context_tokens),
         )
+        cached = self._resolved.get(key)
+        if cached is not None:
+            return cached
+        groups: list[list[str]] = []
+        excluded: list[str] = []
+        if self.hourly:
+            for token in self.tokens:
+                if _in_period(token, now.hour):
+                    groups.append([token])
+                elif token in TIME_PERIODS:
+                    excluded.append(normalize(token))
+        else:
+            for token in self.tokens:
+                if token == "__TODAY_WEEKDAY__" and self.rule_type == "dynamic_date":
+                    # Only the dynamic_date weekday item takes the spoken
+                    # forms and treats naming another weekday as a hedge;
+                    # other rules keep the plain token spellings.
+                    today = now.weekday()
+                    groups.append(_weekday_labels(today, spoken=True))
+                    excluded.extend(
+                        normalize(label)
+                        for other in range(7)
+                        if other != today
+                        for label in _weekday_labels(other, spoken=True)
+                    )
+                    continue
+                expanded = _expand_token(token, context, now)
+                if expanded:
+                    groups.append(expanded)
+        resolved = [item for group in groups for item in group]
+        deduped = []
+        seen = set()
+        for item in resolved:
+            norm = normalize(item)
+            if not norm or norm in seen:
+                continue
+            seen.add(norm)
+            deduped.append(item)
+        if deduped:
+            compiled = CompiledRule.build(
+                {**self.rule, "expected": deduped}, deduped, groups=groups, excluded=tuple(excluded)
+            )
+        else:
+            compiled = CompiledRule.build(self.rule, list(self.expected), unresolved=True)
+        if len(self._resolved) >= RESOLVED_CACHE_SIZE:
+            self._resolved.clear()
+        self._resolved[key] = compiled
+        return compiled
+
+    @cached_property
+    def matcher(self) -> PatternMatcher:
+        return PatternMatcher(self.normalized)
+
+    @cached_property
+    def group_matcher(self) -> PatternMatcher:
+        return PatternMatcher([norm for group in self.groups for _, norm in group] + list(self.excluded))
+
+    @cached_property
+    def expected_numbers(self) -> list[float]:
+        return extract_numbers(" ".join(self.expected))
+
+    @cached_property
+    def fuzzy_patterns(self) -> tuple[FuzzyPattern, ...]:
+        return tuple(FuzzyPattern(norm) for norm in self.normalized)
+
+    def as_rule(self) -> dict[str, Any]:
+        """The rule as a plain dict, with ``expected`` resolved."""
+        return {**self.rule, "expected": list(self.expected)} if "expected" in self.rule else dict(self.rule)
+
+    def score(self, answer: str) -> dict[str, Any]:
+        scorer = _COMPILED_SCORERS.get(self.rule_type)
+        if scorer is None:
+            return {
+                "type": "unknown",
+                "is_correct": False,
+                "reason": "Unsupported scoring rule",
+            }
+        return scorer(self, answer)
+
+
+def _compiled_exact(compiled: CompiledRule, answer: str) -> dict[str, Any]:
+    matches = list(compiled.by_normalized.get(normalize(answer), ()))
+    return {"type": "exact", "is_correct": bool(matches), "matched": matches}
+
+
+def _compiled_contains_any(compiled: CompiledRule, answer: str) -> dict[str, Any]:
+    norm_answer = normalize(answer)
+    found = compiled.matcher.find(norm_answer)
+    matches = []
+    spans = []
+    for exp, norm in zip(compiled.expected, compiled.normalized):
+        if norm in found:
+            matches.append(exp)
+            spans.append(found[norm])
+    return {
+        "type": "contains_any",
+        "is_correct": bool(matches),
+        "matched": matches,
+        "spans": answer_spans(answer, norm_answer, spans),
+    }
+
+
+def _compiled_contains_all(compiled: CompiledRule, answer: str) -> dict[str, Any]:
+    norm_answer = normalize(answer)
+    found = compiled.matcher.find(norm_answer)
+    matched: list[str] = []
+    missing: list[str] = []
+    spans = []
+    for exp, norm in zip(compiled.expected, compiled.normalized):
+        if norm in found:
+            matched.append(exp)
+            spans.append(found[norm])
+        else:
+            missing.append(exp)
+    return {
+        "type": "contains_all",
+        "is_correct": not missing and bool(compiled.expected),
+        "matched": matched,
+        "missing": missing,
+        "spans": answer_spans(answer, norm_answer, spans),
+    }
+
+
+def _compiled_fuzzy(compiled: CompiledRule, answer: str) -> dict[str, Any]:
+    return _fuzzy_result(
+        answer,
+        compiled.expected,
+        compiled.fuzzy_patterns,
+        float(compiled.rule.get("threshold", 0.85)),
+        compiled.rule.get("mode") == "partial",
+    )
+
+
+def _compiled_numeric_range(compiled: CompiledRule, answer: str) -> dict[str, Any]:
+    return score_numeric_range(answer, compiled.rule.get("min_value"), compiled.rule.get("max_value"))
+
+
+def _compiled_sequence_subtract(compiled: CompiledRule, answer: str) -> dict[str, Any]:
+    rule = compiled.rule
+    return score_sequence_subtract(
+        answer,
+        float(rule.get("start", 0)),
+        float(rule.get("step", -1)),
+        int(rule.get("count", 5)),
+        rule.get("min_correct"),
+    )
+
+
+def _group_matches(compiled: CompiledRule, answer: str) -> dict[str, Any]:
+    """Which groups the answer hits (first spelling found wins) and any contradictions."""
+    norm_answer = normalize(answer)
+    found = compiled.group_matcher.find(norm_answer)
+    matched: list[str] = []
+    missing: list[str] = []
+    spans = []
+    for group in compiled.groups:
+        hit = next((item for item in group if item[1] in found), None)
+        if hit is None:
+            missing.append(group[0][0])
+        else:
+            matched.append(hit[0])
+            spans.append(found[hit[1]])
+    return {
+        "matched": matched,
+        "missing": missing,
+        "contradicted": [norm for norm in compiled.excluded if norm in found],
+        "spans": answer_spans(answer, norm_answer, spans),
+    }
+
+
+def _compiled_dynamic_date(compiled: CompiledRule, answer: str) -> dict[str, Any]:
+    # Every asked-for part must be there; naming a second weekday is a hedge.
+    result = _group_matches(compiled, answer)
+    return {
+        "type": "dynamic_date",
+        "is_correct": not result["missing"] and not result["contradicted"] and bool(compiled.groups),
+        **result,
+        "conclusive": True,
+    }
+
+
+def _compiled_time_period(compiled: CompiledRule, answer: str) -> dict[str, Any]:
+    result = _group_matches(compiled, answer)
+    del result["missing"]
+    return {
+        "type": "time_period",
+        "is_correct": bool(result["matched"]) and not result["contradicted"],
+        **result,
+        "conclusive": True,
+    }
+
+
+def _compiled_contains_any_count(compiled: CompiledRule, answer: str) -> dict[str, Any]:
+    result = _group_matches(compiled, answer)
+    del result["contradicted"]
+    count = len(result["matched"])
+    required = int(compiled.rule.get("min_count", len(compiled.groups)))
+    is_correct = bool(compiled.groups) and count >= required
     return {
-        "type": "unknown",
-        "is_correct": False,
-        "reason": "Unsupported scoring rule",
+        "type": "contains_any_count",
+        "is_correct": is_correct,
+        "score": count if compiled.rule.get("score_by_count") else int(is_correct),
+        "count": count,
+        "required": required,
+        **result,
+        "conclusive": True,
     }
+
+
+def _compiled_sequence(compiled: CompiledRule, answer: str) -> dict[str, Any]:
+    expected = compiled.expected_numbers
+    numbers = extract_numbers(answer)
+    correct, offset = _best_alignment(numbers, expected)
+    required = int(compiled.rule.get("min_correct", len(expected)))
+    return {
+        "type": "sequence",
+        "is_correct": bool(expected) and correct >= required,
+        "correct_count": correct,
+        "required": required,
+        "expected": expected,
+        "observed": numbers[offset : offset + len(expected)],
+        "conclusive": True,
+    }
+
+
+def _compiled_instruction_only(compiled: CompiledRule, answer: str) -> dict[str, Any]:
+    # The item only gives an instruction (e.g. words to remember); what was
+    # repeated back is recorded but never scored.
+    result = _group_matches(compiled, answer)
+    return {
+        "type": "instruction_only",
+        "is_correct": None,
+        "scored": False,
+        "matched": result["matched"],
+        "spans": result["spans"],
+    }
+
+
+_COMPILED_SCORERS = {
+    "exact": _compiled_exact,
+    "contains_any": _compiled_contains_any,
+    "contains_all": _compiled_contains_all,
+    "fuzzy": _compiled_fuzzy,
+    "numeric_range": _compiled_numeric_range,
+    "sequence_subtract": _compiled_sequence_subtract,
+    "dynamic_date": _compiled_dynamic_date,
+    "time_period": _compiled_time_period,
+    "contains_any_count": _compiled_contains_any_count,
+    "sequence": _compiled_sequence,
+    "instruction_only": _compiled_instruction_only,
+}
+
+COMPILE_CACHE_SIZE = 1024
+_compile_lock = threading.Lock()
+# id(rule) -> (rule, snapshot of its contents, compiled). Holding the rule
+# keeps its id from being reused; the snapshot catches in-place edits.
+_compiled_rules: dict[int, tuple[Any, dict[str, Any], CompiledRule]] = {}
+
+
+def _snapshot(rule: Mapping[str, Any]) -> dict[str, Any]:
+    return {key: list(value) if isinstance(value, list) else value for key, value in rule.items()}
+
+
+def _rule_tokens(rule: Mapping[str, Any]) -> tuple[str, ...]:
+    expected = rule.get("expected")
+    if not expected:
+        return ()
+    # A bare string is one expectation, not a list of characters.
+    tokens = tuple(str(token) for token in expected) if isinstance(expected, list) else (str(expected),)
+    if rule.get("type") == "dynamic_date":
+        tokens = tuple(DATE_KINDS.get(token, token) for token in tokens)
+    return tokens
+
+
+def compile_rule(rule: Mapping[str, Any] | CompiledRule | None) -> CompiledRule:
+    """Compile ``rule`` once; later calls with the same dict are a lookup.
+
+    Question-bank rules are long-lived dicts, so each is compiled once per
+    question file load.
+    """
+    if isinstance(rule, CompiledRule):
+        return rule
+    rule = rule or {}
+    entry = _compiled_rules.get(id(rule))
+    if entry is not None and entry[0] is rule and entry[1] == rule:
+        return entry[2]
+    tokens = _rule_tokens(rule)
+    compiled = CompiledRule.build(rule, list(tokens), tokens=tokens)
+    with _compile_lock:
+        if len(_compiled_rules) >= COMPILE_CACHE_SIZE:
+            _compiled_rules.clear()
+        _compiled_rules[id(rule)] = (rule, _snapshot(rule), compiled)
+    return compiled
+
+
+def prepare(rule: Mapping[str, Any] | CompiledRule | None, context: dict[str, Any] | None = None) -> CompiledRule:
+    """Compile ``rule`` and resolve its tokens for ``context``."""
+    return compile_rule(rule).resolve(context)
+
+
+def prepare_rule(rule: dict[str, Any], context: dict[str, Any] | None = None) -> tuple[dict[str, Any], bool]:
+    if not rule:
+        return {}, False
+    compiled = prepare(rule, context)
+    return compiled.as_rule(), compiled.unresolved
+
+
+def score_answer(answer: str, rule: dict[str, Any] | CompiledRule) -> dict[str, Any]:
+    return compile_rule(rule).score(answer)
@@ -4,73 +4,389 @@ import csv
 import json
 import os
 import sqlite3
+import threading
+import time
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterator
 
 DB_PATH = Path(os.getenv("DATABASE_PATH", "./data/app.db"))
 
+# Connection tuning. WAL lets readers proceed while a writer commits, and
+# synchronous=NORMAL is durable across application crashes in WAL mode.
+BUSY_TIMEOUT_MS = int(os.getenv("DATABASE_BUSY_TIMEOUT_MS", "5000"))
+CACHE_SIZE_KB = int(os.getenv("DATABASE_CACHE_SIZE_KB", "16384"))
+SYNCHRONOUS = os.getenv("DATABASE_SYNCHRONOUS", "NORMAL").upper()
 
-def _connect() -> sqlite3.Connection:
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
+_local = threading.local()
+_pool_lock = threading.Lock()
+_pool: list[sqlite3.Connection] = []
+_generation = 0
+
+
+def _open_connection(path: Path) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Each connection is only ever used by the thread that opened it; the
+    # flag is relaxed so close_connections() can run from the shutdown thread.
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
     conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(f"PRAGMA synchronous={SYNCHRONOUS}")
+    conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+    conn.execute(f"PRAGMA cache_size={-CACHE_SIZE_KB}")
+    conn.execute("PRAGMA temp_store=MEMORY")
     return conn
 
 
-def init_db() -> None:
-    with _connect() as conn:
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS sessions (
-                id TEXT PRIMARY KEY,
-                patient_id TEXT NOT NULL,
-                instrument TEXT,
-                config_json TEXT,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-            """
+def _connect() -> sqlite3.Connection:
+    """Return this thread's pooled connection, opening it on first use.
+
+    Callers keep using ``with _connect() as conn:``; the context manager
+    commits or rolls back the transaction but leaves the connection open.
+    """
+    path = Path(DB_PATH)
+    cached = getattr(_local, "connection", None)
+    if cached is not None and _local.path == path and _local.generation == _generation:
+        return cached
+    conn = _open_connection(path)
+    with _pool_lock:
+        if cached is not None and cached in _pool:
+            _pool.remove(cached)
+            cached.close()
+        _pool.append(conn)
+        _local.generation = _generation
+    _local.connection = conn
+    _local.path = path
+    return conn
+
+
+def open_pool() -> None:
+    """Warm the pool for the calling thread and apply the schema."""
+    _connect()
+    init_db()
+
+
+def close_connections() -> None:
+    """Close every pooled connection; threads reopen lazily on next use."""
+    global _generation
+    with _pool_lock:
+        connections = list(_pool)
+        _pool.clear()
+        _generation += 1
+    for conn in connections:
+        conn.close()
+
+
+def _has_column(conn: sqlite3.Connection, table: str, column: str) -> bool:
+    return any(row["name"] == column for row in conn.execute(f"PRAGMA table_info({table})"))
+
+
+def _migrate_base_tables(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS sessions (
+            id TEXT PRIMARY KEY,
+            patient_id TEXT NOT NULL,
+            instrument TEXT,
+            config_json TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
         )
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS responses (
-                id TEXT PRIMARY KEY,
-                session_id TEXT NOT NULL,
-                question_id TEXT NOT NULL,
-                transcript TEXT,
-                reaction_time_whisper_ms REAL,
-                reaction_time_vad_ms REAL,
-                manual_confirmed INTEGER,
-                rule_score_json TEXT,
-                llm_judge_json TEXT,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY(session_id) REFERENCES sessions(id)
-            )
-            """
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS responses (
+            id TEXT PRIMARY KEY,
+            session_id TEXT NOT NULL,
+            question_id TEXT NOT NULL,
+            transcript TEXT,
+            reaction_time_whisper_ms REAL,
+            reaction_time_vad_ms REAL,
+            manual_confirmed INTEGER,
+            rule_score_json TEXT,
+            llm_judge_json TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY(session_id) REFERENCES sessions(id)
+        )
+        """
+    )
+    # Databases created before migrations existed may predate this column.
+    if not _has_column(conn, "responses", "manual_confirmed"):
+        conn.execute("ALTER TABLE responses ADD COLUMN manual_confirmed INTEGER")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS instrument_scores (
+            id TEXT PRIMARY KEY,
+            session_id TEXT NOT NULL,
+            instrument TEXT NOT NULL,
+            score REAL NOT NULL,
+            interpretation_json TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY(session_id) REFERENCES sessions(id)
         )
-        columns = [row["name"] for row in conn.execute("PRAGMA table_info(responses)").fetchall()]
-        if "manual_confirmed" not in columns:
-            conn.execute("ALTER TABLE responses ADD COLUMN manual_confirmed INTEGER")
+        """
+    )
+
+
+def _migrate_session_indexes(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_responses_session_created ON responses(session_id, created_at)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_instrument_scores_session_created "
+        "ON instrument_scores(session_id, created_at)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_sessions_patient_created ON sessions(patient_id, created_at)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_created ON sessions(created_at)")
+
+
+def _patient_fields(config: dict[str, Any]) -> tuple[str | None, str | None, int | None]:
+    name = str(config.get("name") or "").strip() or None
+    gender = str(config.get("gender") or "").strip() or None
+    try:
+        age = int(float(config["age"])) if config.get("age") not in (None, "") else None
+    except (TypeError, ValueError):
+        age = None
+    return name, gender, age
+
+
+NAME_GRAM_MAX = 3
+
+
+def _name_grams(name: str) -> set[str]:
+    """Every 1- to 3-character slice of a name.
+
+    A partial search looks up the needle's leading gram in the index and
+    confirms with ``instr``, so one- and two-character CJK needles work
+    too (FTS5 trigram tokens would miss those).
+    """
+    return {
+        name[i : i + size]
+        for size in range(1, NAME_GRAM_MAX + 1)
+        for i in range(len(name) - size + 1)
+    }
+
+
+def _index_session_name(conn: sqlite3.Connection, session_id: str, name: str | None) -> None:
+    if not name:
+        return
+    conn.executemany(
+        """
+        INSERT OR IGNORE INTO session_name_grams (gram, created_at, session_id)
+        SELECT ?, created_at, id FROM sessions WHERE id = ?
+        """,
+        [(gram, session_id) for gram in _name_grams(name)],
+    )
+
+
+def _migrate_patient_columns(conn: sqlite3.Connection) -> None:
+    conn.execute("ALTER TABLE sessions ADD COLUMN patient_name TEXT")
+    conn.execute("ALTER TABLE sessions ADD COLUMN patient_gender TEXT")
+    conn.execute("ALTER TABLE sessions ADD COLUMN patient_age INTEGER")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS session_name_grams (
+            gram TEXT NOT NULL,
+            created_at TEXT,
+            session_id TEXT NOT NULL,
+            PRIMARY KEY (gram, created_at, session_id)
+        ) WITHOUT ROWID
+        """
+    )
+    rows = conn.execute("SELECT id, config_json FROM sessions").fetchall()
+    for row in rows:
+        try:
+            config = json.loads(row["config_json"]) if row["config_json"] else {}
+        except json.JSONDecodeError:
+            config = {}
+        name, gender, age = _patient_fields(config if isinstance(config, dict) else {})
         conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS instrument_scores (
-                id TEXT PRIMARY KEY,
-                session_id TEXT NOT NULL,
-                instrument TEXT NOT NULL,
-                score REAL NOT NULL,
-                interpretation_json TEXT,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY(session_id) REFERENCES sessions(id)
+            "UPDATE sessions SET patient_name = ?, patient_gender = ?, patient_age = ? WHERE id = ?",
+            (name, gender, age, row["id"]),
+        )
+        _index_session_name(conn, row["id"], name)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_sessions_name_created ON sessions(patient_name, created_at)"
+    )
+
+
+def _migrate_scoring_jobs(conn: sqlite3.Connection) -> None:
+    # NULL scoring_status marks rows written before background scoring existed.
+    conn.execute("ALTER TABLE responses ADD COLUMN scoring_status TEXT")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS scoring_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            response_id TEXT NOT NULL UNIQUE,
+            session_id TEXT NOT NULL,
+            question_id TEXT NOT NULL,
+            audio_path TEXT,
+            answer_text TEXT,
+            status TEXT NOT NULL DEFAULT 'queued',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            error TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY(response_id) REFERENCES responses(id)
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_scoring_jobs_status ON scoring_jobs(status, id)")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_scoring_jobs_session ON scoring_jobs(session_id, status)"
+    )
+
+
+def _migrate_transcription_cache(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS transcription_cache (
+            audio_sha256 TEXT NOT NULL,
+            model TEXT NOT NULL,
+            language TEXT NOT NULL,
+            options TEXT NOT NULL,
+            payload_json TEXT NOT NULL,
+            size_bytes INTEGER NOT NULL,
+            created_at REAL NOT NULL,
+            last_used_at REAL NOT NULL,
+            PRIMARY KEY (audio_sha256, model, language, options)
+        )
+        """
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_transcription_cache_used ON transcription_cache(last_used_at)"
+    )
+
+
+def _migrate_report_cache(conn: sqlite3.Connection) -> None:
+    # sessions.revision is bumped by triggers on every write to a session's
+    # responses or instrument scores; a cached report is valid only while
+    # its stored revision still matches.
+    conn.execute("ALTER TABLE sessions ADD COLUMN revision INTEGER NOT NULL DEFAULT 0")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS reports (
+            session_id TEXT PRIMARY KEY,
+            revision INTEGER NOT NULL,
+            bank_version TEXT NOT NULL,
+            etag TEXT NOT NULL,
+            payload_json TEXT NOT NULL,
+            built_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY(session_id) REFERENCES sessions(id)
+        )
+        """
+    )
+    for table in ("responses", "instrument_scores"):
+        for event, ref in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+            conn.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_{event.lower()}_revision
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE sessions SET revision = revision + 1 WHERE id = {ref}.session_id;
+                END
+                """
             )
-            """
+
+
+def _migrate_patient_keyset_index(conn: sqlite3.Connection) -> None:
+    # Keyset pages order by (created_at, id); carrying id in the index lets
+    # ties on created_at resolve without a sort step.
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_sessions_patient_created_id ON sessions(patient_id, created_at, id)"
+    )
+    conn.execute("DROP INDEX IF EXISTS idx_sessions_patient_created")
+
+
+def _migrate_session_keyset_index(conn: sqlite3.Connection) -> None:
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_created_id ON sessions(created_at, id)")
+    conn.execute("DROP INDEX IF EXISTS idx_sessions_created")
+
+
+def _migrate_server_vad(conn: sqlite3.Connection) -> None:
+    if not _has_column(conn, "responses", "reaction_time_server_vad_ms"):
+        conn.execute("ALTER TABLE responses ADD COLUMN reaction_time_server_vad_ms REAL")
+
+
+def _migrate_rescore_runs(conn: sqlite3.Connection) -> None:
+    # One row per named re-scoring run: the question-bank version it scores
+    # against and the last responses.rowid whose result has been written.
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS rescore_runs (
+            name TEXT PRIMARY KEY,
+            bank_version TEXT NOT NULL,
+            last_rowid INTEGER NOT NULL,
+            scanned INTEGER NOT NULL DEFAULT 0,
+            changed INTEGER NOT NULL DEFAULT 0,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP
         )
+        """
+    )
+
+
+def _migrate_transcription_lead_in(conn: sqlite3.Connection) -> None:
+    # Entries keyed by the upload digest record the silence trimmed before
+    # the preprocessed file was sent, so a hit can skip preprocessing.
+    if not _has_column(conn, "transcription_cache", "lead_in_ms"):
+        conn.execute("ALTER TABLE transcription_cache ADD COLUMN lead_in_ms REAL NOT NULL DEFAULT 0")
+
+
+# Ordered (version, migration) pairs. Append new steps; never edit or
+# reorder released ones. The applied version lives in PRAGMA user_version.
+MIGRATIONS: list[tuple[int, Callable[[sqlite3.Connection], None]]] = [
+    (1, _migrate_base_tables),
+    (2, _migrate_session_indexes),
+    (3, _migrate_patient_columns),
+    (4, _migrate_scoring_jobs),
+    (5, _migrate_transcription_cache),
+    (6, _migrate_report_cache),
+    (7, _migrate_patient_keyset_index),
+    (8, _migrate_session_keyset_index),
+    (9, _migrate_server_vad),
+    (10, _migrate_rescore_runs),
+    (11, _migrate_transcription_lead_in),
+]
+
+
+def schema_version() -> int:
+    with _connect() as conn:
+        return int(conn.execute("PRAGMA user_version").fetchone()[0])
+
+
+def init_db() -> None:
+    """Apply pending migrations, each in its own write transaction."""
+    conn = _connect()
+    for version, migrate in MIGRATIONS:
+        # BEGIN IMMEDIATE takes the write lock up front, so concurrent
+        # workers starting together apply each step exactly once.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            current = int(conn.execute("PRAGMA user_version").fetchone()[0])
+            if current >= version:
+                conn.rollback()
+                continue
+            migrate(conn)
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
 
 
 def create_session(session_id: str, patient_id: str, instrument: str | None, config: dict[str, Any]) -> None:
+    name, gender, age = _patient_fields(config)
     with _connect() as conn:
         conn.execute(
-            "INSERT INTO sessions (id, patient_id, instrument, config_json) VALUES (?, ?, ?, ?)",
-            (session_id, patient_id, instrument, json.dumps(config)),
+            """
+            INSERT INTO sessions (
+                id, patient_id, instrument, config_json, patient_name, patient_gender, patient_age
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (session_id, patient_id, instrument, json.dumps(config), name, gender, age),
         )
+        _index_session_name(conn, session_id, name)
 
 
 def get_session(session_id: str) -> dict[str, Any] | None:
@@ -92,14 +408,16 @@ def save_response(
     manual_confirmed: bool | None,
     rule_score: dict[str, Any] | None,
     llm_judge: dict[str, Any] | None,
+    reaction_time_server_vad_ms: float | None = None,
 ) -> None:
     with _connect() as conn:
         conn.execute(
             """
             INSERT INTO responses (
                 id, session_id, question_id, transcript, reaction_time_whisper_ms,
-                reaction_time_vad_ms, manual_confirmed, rule_score_json, llm_judge_json
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                reaction_time_vad_ms, manual_confirmed, rule_score_json, llm_judge_json,
+                reaction_time_server_vad_ms, scoring_status
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'done')
             """,
             (
                 response_id,
@@ -111,10 +429,182 @@ def save_response(
                 1 if manual_confirmed else 0 if manual_confirmed is not None else None,
                 json.dumps(rule_score) if rule_score else None,
                 json.dumps(llm_judge) if llm_judge else None,
+                reaction_time_server_vad_ms,
             ),
         )
 
 
+def update_response_judge(response_id: str, llm_judge: dict[str, Any]) -> None:
+    with _connect() as conn:
+        conn.execute(
+            "UPDATE responses SET llm_judge_json = ? WHERE id = ?",
+            (json.dumps(llm_judge), response_id),
+        )
+
+
+def save_pending_response(
+    response_id: str,
+    session_id: str,
+    question_id: str,
+    reaction_time_vad_ms: float | None,
+    manual_confirmed: bool | None,
+    audio_path: str | None,
+    answer_text: str | None,
+) -> None:
+    """Store an unscored response and queue its scoring job atomically."""
+    with _connect() as conn:
+        conn.execute(
+            """
+            INSERT INTO responses (
+                id, session_id, question_id, reaction_time_vad_ms, manual_confirmed, scoring_status
+            ) VALUES (?, ?, ?, ?, ?, 'pending')
+            """,
+            (
+                response_id,
+                session_id,
+                question_id,
+                reaction_time_vad_ms,
+                1 if manual_confirmed else 0 if manual_confirmed is not None else None,
+            ),
+        )
+        conn.execute(
+            """
+            INSERT INTO scoring_jobs (response_id, session_id, question_id, audio_path, answer_text)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (response_id, session_id, question_id, audio_path, answer_text),
+        )
+
+
+def claim_scoring_job() -> dict[str, Any] | None:
+    """Mark the oldest queued job as running and return it."""
+    conn = _connect()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute(
+            "SELECT * FROM scoring_jobs WHERE status = 'queued' ORDER BY id LIMIT 1"
+        ).fetchone()
+        if row is not None:
+            conn.execute(
+                """
+                UPDATE scoring_jobs
+                SET status = 'running', attempts = attempts + 1, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+                """,
+                (row["id"],),
+            )
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    if row is None:
+        return None
+    job = dict(row)
+    job["attempts"] += 1
+    return job
+
+
+def complete_scoring_job(
+    job_id: int,
+    response_id: str,
+    transcript: str | None,
+    reaction_time_whisper_ms: float | None,
+    rule_score: dict[str, Any] | None,
+    llm_judge: dict[str, Any] | None,
+    reaction_time_server_vad_ms: float | None = None,
+) -> None:
+    with _connect() as conn:
+        conn.execute(
+            """
+            UPDATE responses
+            SET transcript = ?, reaction_time_whisper_ms = ?, rule_score_json = ?,
+                llm_judge_json = ?, reaction_time_server_vad_ms = ?, scoring_status = 'done'
+            WHERE id = ?
+            """,
+            (
+                transcript,
+                reaction_time_whisper_ms,
+                json.dumps(rule_score) if rule_score else None,
+                json.dumps(llm_judge) if llm_judge else None,
+                reaction_time_server_vad_ms,
+                response_id,
+            ),
+        )
+        conn.execute(
+            "UPDATE scoring_jobs SET status = 'done', error = NULL, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+            (job_id,),
+        )
+
+
+def fail_scoring_job(job_id: int, response_id: str, error: str, retry: bool) -> None:
+    with _connect() as conn:
+        conn.execute(
+            "UPDATE scoring_jobs SET status = ?, error = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+            ("queued" if retry else "failed", error, job_id),
+        )
+        if not retry:
+            conn.execute("UPDATE responses SET scoring_status = 'failed' WHERE id = ?", (response_id,))
+
+
+def requeue_running_jobs(stale_seconds: float) -> int:
+    """Return jobs left 'running' by a crashed worker process to the queue.
+
+    Only jobs untouched for ``stale_seconds`` are requeued, so a restarting
+    process does not steal work another live process is still scoring.
+    """
+    with _connect() as conn:
+        cursor = conn.execute(
+            """
+            UPDATE scoring_jobs SET status = 'queued', updated_at = CURRENT_TIMESTAMP
+            WHERE status = 'running' AND updated_at < datetime('now', ?)
+            """,
+            (f"-{int(stale_seconds)} seconds",),
+        )
+    return cursor.rowcount
+
+
+def requeue_scoring_jobs(job_ids: list[int]) -> int:
+    """Return jobs interrupted by a shutdown to the queue without spending an attempt."""
+    requeued = 0
+    with _connect() as conn:
+        for chunk in _chunks(job_ids):
+            cursor = conn.execute(
+                f"""
+                UPDATE scoring_jobs
+                SET status = 'queued', attempts = MAX(attempts - 1, 0), updated_at = CURRENT_TIMESTAMP
+                WHERE status = 'running' AND id IN ({_placeholders(len(chunk))})
+                """,
+                chunk,
+            )
+            requeued += cursor.rowcount
+    return requeued
+
+
+def list_scoring_status(session_id: str) -> list[dict[str, Any]]:
+    with _connect() as conn:
+        rows = conn.execute(
+            """
+            SELECT r.id AS response_id, r.question_id, COALESCE(r.scoring_status, 'done') AS scoring_status,
+                   j.attempts, j.error
+            FROM responses r
+            LEFT JOIN scoring_jobs j ON j.response_id = r.id
+            WHERE r.session_id = ?
+            ORDER BY r.created_at
+            """,
+            (session_id,),
+        ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def count_pending_scoring(session_id: str) -> int:
+    with _connect() as conn:
+        row = conn.execute(
+            "SELECT COUNT(*) FROM scoring_jobs WHERE session_id = ? AND status IN ('queued', 'running')",
+            (session_id,),
+        ).fetchone()
+    return int(row[0])
+
+
 def list_responses(session_id: str) -> list[dict[str, Any]]:
     with _connect() as conn:
         rows = conn.execute(
@@ -124,6 +614,105 @@ def list_responses(session_id: str) -> list[dict[str, Any]]:
     return [dict(row) for row in rows]
 
 
+def list_response_ids_missing_server_vad(response_ids: list[str]) -> set[str]:
+    missing: set[str] = set()
+    with _connect() as conn:
+        for chunk in _chunks(response_ids):
+            rows = conn.execute(
+                f"""
+                SELECT id FROM responses
+                WHERE id IN ({_placeholders(len(chunk))}) AND reaction_time_server_vad_ms IS NULL
+                """,
+                chunk,
+            ).fetchall()
+            missing.update(row["id"] for row in rows)
+    return missing
+
+
+def update_server_vad(values: list[tuple[float, str]]) -> None:
+    """Store many ``(reaction_time_server_vad_ms, response_id)`` pairs."""
+    with _connect() as conn:
+        conn.executemany(
+            "UPDATE responses SET reaction_time_server_vad_ms = ? WHERE id = ?",
+            values,
+        )
+
+
+def iter_rescore_rows(
+    after_rowid: int,
+    chunk_size: int,
+    question_ids: list[str] | None = None,
+) -> Iterator[list[tuple[Any, ...]]]:
+    """Yield transcribed responses after ``after_rowid`` in rowid order, a chunk at a time.
+
+    Each row is ``(rowid, response_id, question_id, transcript, rule_score_json,
+    created_at, session config_json, overridden)``; ``overridden`` is 1 when a
+    manual or boolean LLM verdict outranks the rule score in reports. No
+    connection is held between chunks, so the caller may write in between.
+    """
+    question_filter = ""
+    params: list[Any] = []
+    if question_ids:
+        question_filter = f"AND r.question_id IN ({_placeholders(len(question_ids))})"
+        params = list(question_ids)
+    while True:
+        with _connect() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT r.rowid, r.id, r.question_id, r.transcript, r.rule_score_json, r.created_at,
+                    s.config_json,
+                    r.manual_confirmed IS NOT NULL
+                        OR COALESCE(json_type(r.llm_judge_json, '$.is_correct') IN ('true', 'false'), 0)
+                FROM responses r
+                JOIN sessions s ON s.id = r.session_id
+                WHERE r.rowid > ? AND r.transcript IS NOT NULL {question_filter}
+                ORDER BY r.rowid
+                LIMIT ?
+                """,
+                (after_rowid, *params, chunk_size),
+            ).fetchall()
+        if not rows:
+            return
+        yield [tuple(row) for row in rows]
+        after_rowid = rows[-1][0]
+
+
+def get_rescore_run(name: str) -> dict[str, Any] | None:
+    with _connect() as conn:
+        row = conn.execute("SELECT * FROM rescore_runs WHERE name = ?", (name,)).fetchone()
+    return dict(row) if row else None
+
+
+def reset_rescore_run(name: str) -> None:
+    with _connect() as conn:
+        conn.execute("DELETE FROM rescore_runs WHERE name = ?", (name,))
+
+
+def save_rescore_chunk(
+    name: str,
+    bank_version: str,
+    last_rowid: int,
+    scanned: int,
+    updates: list[tuple[str | None, int]],
+) -> None:
+    """Write ``(rule_score_json, rowid)`` updates and advance the run's checkpoint atomically."""
+    with _connect() as conn:
+        conn.executemany("UPDATE responses SET rule_score_json = ? WHERE rowid = ?", updates)
+        conn.execute(
+            """
+            INSERT INTO rescore_runs (name, bank_version, last_rowid, scanned, changed, updated_at)
+            VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(name) DO UPDATE SET
+                bank_version = excluded.bank_version,
+                last_rowid = excluded.last_rowid,
+                scanned = rescore_runs.scanned + excluded.scanned,
+                changed = rescore_runs.changed + excluded.changed,
+                updated_at = excluded.updated_at
+            """,
+            (name, bank_version, last_rowid, scanned, len(updates)),
+        )
+
+
 def save_instrument_score(
     score_id: str,
     session_id: str,
@@ -150,55 +739,388 @@ def list_instrument_scores(session_id: str) -> list[dict[str, Any]]:
     return [dict(row) for row in rows]
 
 
+# Batch lookups bind one parameter per id; chunking keeps each statement
+# well under SQLite's host-parameter limit.
+BATCH_CHUNK_SIZE = 500
+
+
+def _chunks(ids: list[str]) -> list[list[str]]:
+    return [ids[i : i + BATCH_CHUNK_SIZE] for i in range(0, len(ids), BATCH_CHUNK_SIZE)]
+
+
+def _placeholders(count: int) -> str:
+    return ", ".join("?" * count)
+
+
+def get_sessions(session_ids: list[str]) -> dict[str, dict[str, Any]]:
+    sessions: dict[str, dict[str, Any]] = {}
+    with _connect() as conn:
+        for chunk in _chunks(session_ids):
+            rows = conn.execute(
+                f"SELECT * FROM sessions WHERE id IN ({_placeholders(len(chunk))})",
+                chunk,
+            ).fetchall()
+            sessions.update((row["id"], dict(row)) for row in rows)
+    return sessions
+
+
+def _group_by_session(table: str, session_ids: list[str]) -> dict[str, list[dict[str, Any]]]:
+    grouped: dict[str, list[dict[str, Any]]] = {session_id: [] for session_id in session_ids}
+    with _connect() as conn:
+        for chunk in _chunks(session_ids):
+            rows = conn.execute(
+                f"""
+                SELECT * FROM {table}
+                WHERE session_id IN ({_placeholders(len(chunk))})
+                ORDER BY session_id, created_at
+                """,
+                chunk,
+            ).fetchall()
+            for row in rows:
+                grouped[row["session_id"]].append(dict(row))
+    return grouped
+
+
+def list_responses_for_sessions(session_ids: list[str]) -> dict[str, list[dict[str, Any]]]:
+    return _group_by_session("responses", session_ids)
+
+
+def list_instrument_scores_for_sessions(session_ids: list[str]) -> dict[str, list[dict[str, Any]]]:
+    return _group_by_session("instrument_scores", session_ids)
+
+
+def count_progress_for_sessions(session_ids: list[str]) -> dict[str, dict[str, int]]:
+    """Return ``{session_id: {"answered": n, "pending_scoring": m}}``."""
+    counts = {session_id: {"answered": 0, "pending_scoring": 0} for session_id in session_ids}
+    with _connect() as conn:
+        for chunk in _chunks(session_ids):
+            marks = _placeholders(len(chunk))
+            for row in conn.execute(
+                f"SELECT session_id, COUNT(*) FROM responses WHERE session_id IN ({marks}) GROUP BY session_id",
+                chunk,
+            ):
+                counts[row[0]]["answered"] = int(row[1])
+            for row in conn.execute(
+                f"""
+                SELECT session_id, COUNT(*) FROM scoring_jobs
+                WHERE session_id IN ({marks}) AND status IN ('queued', 'running')
+                GROUP BY session_id
+                """,
+                chunk,
+            ):
+                counts[row[0]]["pending_scoring"] = int(row[1])
+    return counts
+
+
+def encode_cursor(created_at: str, session_id: str) -> str:
+    return f"{created_at},{session_id}"
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    """Split an ``<created_at>,<id>`` keyset cursor; raises ValueError if malformed."""
+    created_at, sep, session_id = cursor.rpartition(",")
+    if not sep or not created_at or not session_id:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return created_at, session_id
+
+
+# Mirrors reporting's precedence for is_correct: manual confirmation, then a
+# boolean LLM verdict, then a conclusive rule score. NULL when unscored.
+_RESPONSE_VERDICT_SQL = """
+    CASE
+        WHEN r.manual_confirmed IS NOT NULL THEN r.manual_confirmed != 0
+        WHEN json_type(r.llm_judge_json, '$.is_correct') IN ('true', 'false')
+            THEN json_extract(r.llm_judge_json, '$.is_correct')
+        WHEN json_extract(r.rule_score_json, '$.conclusive')
+            AND json_type(r.rule_score_json, '$.is_correct') IN ('true', 'false')
+            THEN json_extract(r.rule_score_json, '$.is_correct')
+    END
+"""
+
+
+def list_patient_timeline(
+    patient_id: str,
+    after: tuple[str, str] | None = None,
+    limit: int = 50,
+) -> list[dict[str, Any]]:
+    """Return per-session response aggregates for a patient, newest first.
+
+    One grouped pass over a keyset page of sessions; reaction times come back
+    as comma-joined strings for the caller to reduce (SQLite has no median).
+    """
+    keyset = "AND (created_at, id) < (?, ?)" if after else ""
+    params: tuple[Any, ...] = (patient_id, *(after or ()), max(1, int(limit)))
+    with _connect() as conn:
+        rows = conn.execute(
+            f"""
+            WITH page AS (
+                SELECT id, instrument, created_at FROM sessions
+                WHERE patient_id = ? {keyset}
+                ORDER BY created_at DESC, id DESC
+                LIMIT ?
+            )
+            SELECT
+                page.id,
+                page.instrument,
+                page.created_at,
+                COUNT(r.id) AS answered,
+                COALESCE(SUM(({_RESPONSE_VERDICT_SQL}) = 1), 0) AS correct,
+                COALESCE(SUM(({_RESPONSE_VERDICT_SQL}) = 0), 0) AS incorrect,
+                group_concat(r.reaction_time_vad_ms) AS reaction_times_vad,
+                group_concat(r.reaction_time_whisper_ms) AS reaction_times_whisper
+            FROM page LEFT JOIN responses r ON r.session_id = page.id
+            GROUP BY page.id
+            ORDER BY page.created_at DESC, page.id DESC
+            """,
+            params,
+        ).fetchall()
+    return [dict(row) for row in rows]
+
+
+SESSION_LIST_COLUMNS = "id, patient_id, patient_name, patient_gender, patient_age, created_at"
+SESSION_PAGE_MAX = 1000
+
+
 def list_sessions(
     patient_id: str | None = None,
     patient_name: str | None = None,
     limit: int = 200,
+    after: tuple[str, str] | None = None,
 ) -> list[dict[str, Any]]:
-    safe_limit = max(1, min(int(limit), 1000))
+    """List sessions newest first.
+
+    Without a name search, ``after`` continues from a ``(created_at, id)``
+    keyset cursor. Name searches are ranked (exact before partial) and
+    cannot be paged.
+    """
+    safe_limit = max(1, min(int(limit), SESSION_PAGE_MAX))
+    needle = (patient_name or "").strip()
+    if needle and after:
+        raise ValueError("Name searches cannot be paged with a cursor")
+    patient_filter = "patient_id = ? AND " if patient_id else ""
+    patient_params: tuple[Any, ...] = (patient_id,) if patient_id else ()
+
     with _connect() as conn:
-        if patient_id:
+        if not needle:
+            conditions = ["patient_id = ?"] if patient_id else []
+            if after:
+                conditions.append("(created_at, id) < (?, ?)")
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
             rows = conn.execute(
-                "SELECT id, patient_id, config_json, created_at FROM sessions WHERE patient_id = ? ORDER BY created_at DESC LIMIT ?",
-                (patient_id, safe_limit),
+                f"""
+                SELECT {SESSION_LIST_COLUMNS} FROM sessions {where}
+                ORDER BY created_at DESC, id DESC LIMIT ?
+                """,
+                (*patient_params, *(after or ()), safe_limit),
+            ).fetchall()
+            return [dict(row) for row in rows]
+
+        # Exact name matches rank ahead of partial ones, newest first in each group.
+        exact = conn.execute(
+            f"""
+            SELECT {SESSION_LIST_COLUMNS} FROM sessions
+            WHERE {patient_filter}patient_name = ?
+            ORDER BY created_at DESC LIMIT ?
+            """,
+            (*patient_params, needle, safe_limit),
+        ).fetchall()
+        remaining = safe_limit - len(exact)
+        if remaining <= 0:
+            return [dict(row) for row in exact]
+
+        if patient_id:
+            partial = conn.execute(
+                f"""
+                SELECT {SESSION_LIST_COLUMNS} FROM sessions
+                WHERE patient_id = ? AND patient_name != ? AND instr(patient_name, ?) > 0
+                ORDER BY created_at DESC LIMIT ?
+                """,
+                (patient_id, needle, needle, remaining),
             ).fetchall()
         else:
-            # Name lookup needs a wider pool before in-Python filter by config_json.name
-            fetch_limit = safe_limit * 8 if patient_name else safe_limit
+            columns = ", ".join(f"s.{column.strip()}" for column in SESSION_LIST_COLUMNS.split(","))
+            partial = conn.execute(
+                f"""
+                SELECT {columns} FROM session_name_grams g
+                JOIN sessions s ON s.id = g.session_id
+                WHERE g.gram = ? AND s.patient_name != ? AND instr(s.patient_name, ?) > 0
+                ORDER BY g.created_at DESC LIMIT ?
+                """,
+                (needle[:NAME_GRAM_MAX], needle, needle, remaining),
+            ).fetchall()
+    return [dict(row) for row in exact] + [dict(row) for row in partial]
+
+
+def iter_sessions(
+    patient_id: str | None = None,
+    batch_size: int = SESSION_PAGE_MAX,
+) -> Iterator[dict[str, Any]]:
+    """Yield every matching session newest first, one keyset page at a time."""
+    batch_size = max(1, min(int(batch_size), SESSION_PAGE_MAX))
+    after: tuple[str, str] | None = None
+    while True:
+        rows = list_sessions(patient_id=patient_id, limit=batch_size, after=after)
+        yield from rows
+        if len(rows) < batch_size:
+            return
+        after = (rows[-1]["created_at"], rows[-1]["id"])
+
+
+def get_session_revision(session_id: str) -> int | None:
+    with _connect() as conn:
+        row = conn.execute("SELECT revision FROM sessions WHERE id = ?", (session_id,)).fetchone()
+    return int(row["revision"]) if row else None
+
+
+def get_cached_report(session_id: str) -> dict[str, Any] | None:
+    """Return the cached report row if it was built at the current revision."""
+    with _connect() as conn:
+        row = conn.execute(
+            """
+            SELECT r.bank_version, r.etag, r.payload_json
+            FROM reports r JOIN sessions s ON s.id = r.session_id
+            WHERE r.session_id = ? AND r.revision = s.revision
+            """,
+            (session_id,),
+        ).fetchone()
+    return dict(row) if row else None
+
+
+def save_cached_report(
+    session_id: str,
+    revision: int,
+    bank_version: str,
+    etag: str,
+    payload_json: str,
+) -> None:
+    with _connect() as conn:
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO reports (session_id, revision, bank_version, etag, payload_json)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (session_id, revision, bank_version, etag, payload_json),
+        )
+
+
+def get_cached_reports(session_ids: list[str]) -> dict[str, dict[str, Any]]:
+    """Batch form of :func:`get_cached_report`, keyed by session id."""
+    cached: dict[str, dict[str, Any]] = {}
+    with _connect() as conn:
+        for chunk in _chunks(session_ids):
             rows = conn.execute(
-                "SELECT id, patient_id, config_json, created_at FROM sessions ORDER BY created_at DESC LIMIT ?",
-                (fetch_limit,),
+                f"""
+                SELECT r.session_id, r.bank_version, r.etag, r.payload_json
+                FROM reports r JOIN sessions s ON s.id = r.session_id
+                WHERE r.session_id IN ({_placeholders(len(chunk))}) AND r.revision = s.revision
+                """,
+                chunk,
             ).fetchall()
+            cached.update((row["session_id"], dict(row)) for row in rows)
+    return cached
 
-    items = [dict(row) for row in rows]
-    if not patient_name:
-        return items[:safe_limit]
 
-    needle = patient_name.strip()
-    if not needle:
-        return items[:safe_limit]
+def get_session_revisions(session_ids: list[str]) -> dict[str, int]:
+    revisions: dict[str, int] = {}
+    with _connect() as conn:
+        for chunk in _chunks(session_ids):
+            rows = conn.execute(
+                f"SELECT id, revision FROM sessions WHERE id IN ({_placeholders(len(chunk))})",
+                chunk,
+            ).fetchall()
+            revisions.update((row["id"], int(row["revision"])) for row in rows)
+    return revisions
 
-    exact_matches: list[dict[str, Any]] = []
-    partial_matches: list[dict[str, Any]] = []
 
-    for item in items:
-        config_raw = item.get("config_json")
-        try:
-            config = json.loads(config_raw) if config_raw else {}
-        except json.JSONDecodeError:
-            config = {}
+def save_cached_reports(rows: list[tuple[str, int, str, str, str]]) -> None:
+    """Store many ``(session_id, revision, bank_version, etag, payload_json)`` rows."""
+    with _connect() as conn:
+        conn.executemany(
+            """
+            INSERT OR REPLACE INTO reports (session_id, revision, bank_version, etag, payload_json)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            rows,
+        )
+
+
+def get_cached_transcription(
+    audio_sha256: str, model: str, language: str, options: str
+) -> tuple[dict[str, Any], float] | None:
+    """The cached payload and its ``lead_in_ms``, or None."""
+    key = (audio_sha256, model, language, options)
+    with _connect() as conn:
+        row = conn.execute(
+            """
+            SELECT payload_json, lead_in_ms FROM transcription_cache
+            WHERE audio_sha256 = ? AND model = ? AND language = ? AND options = ?
+            """,
+            key,
+        ).fetchone()
+        if row is None:
+            return None
+        conn.execute(
+            """
+            UPDATE transcription_cache SET last_used_at = ?
+            WHERE audio_sha256 = ? AND model = ? AND language = ? AND options = ?
+            """,
+            (time.time(), *key),
+        )
+    return json.loads(row["payload_json"]), row["lead_in_ms"]
 
-        name_value = str(config.get("name") or "").strip()
-        if not name_value:
-            continue
 
-        if name_value == needle:
-            exact_matches.append(item)
-        elif needle in name_value:
-            partial_matches.append(item)
+def put_cached_transcription(
+    audio_sha256: str,
+    model: str,
+    language: str,
+    options: str,
+    payload: dict[str, Any],
+    lead_in_ms: float = 0.0,
+) -> None:
+    payload_json = json.dumps(payload, ensure_ascii=False)
+    now = time.time()
+    with _connect() as conn:
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO transcription_cache (
+                audio_sha256, model, language, options, payload_json, size_bytes, created_at, last_used_at,
+                lead_in_ms
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                audio_sha256,
+                model,
+                language,
+                options,
+                payload_json,
+                len(payload_json.encode("utf-8")),
+                now,
+                now,
+                lead_in_ms,
+            ),
+        )
+
 
-    merged = exact_matches + partial_matches
-    return merged[:safe_limit]
+def evict_transcription_cache(max_bytes: int, max_age_seconds: float) -> int:
+    """Drop entries older than the age limit, then least-recently-used ones
+    until the cached payloads fit in ``max_bytes``."""
+    with _connect() as conn:
+        expired = conn.execute(
+            "DELETE FROM transcription_cache WHERE created_at < ?",
+            (time.time() - max_age_seconds,),
+        ).rowcount
+        overflow = conn.execute(
+            """
+            DELETE FROM transcription_cache WHERE rowid IN (
+                SELECT rowid FROM (
+                    SELECT rowid, SUM(size_bytes) OVER (ORDER BY last_used_at DESC, rowid DESC) AS running
+                    FROM transcription_cache
+                ) WHERE running > ?
+            )
+            """,
+            (max_bytes,),
+        ).rowcount
+    return expired + overflow
 
 
 def export_responses_csv(session_id: str, output_path: str) -> None:
@@ -1,8 +1,71 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import os
 from typing import Any
 
+from backend.app import openai_client, storage
+
+CACHE_ENABLED = os.getenv("COGSCREEN_TRANSCRIPTION_CACHE", "1") not in ("0", "false", "no")
+CACHE_MAX_BYTES = int(float(os.getenv("COGSCREEN_TRANSCRIPTION_CACHE_MAX_MB", "64")) * 1024 * 1024)
+CACHE_MAX_AGE_SECONDS = float(os.getenv("COGSCREEN_TRANSCRIPTION_CACHE_MAX_AGE_DAYS", "30")) * 86400
+# Eviction runs every N cache writes rather than on each one.
+CACHE_EVICT_EVERY = 50
+
+_writes_since_evict = 0
+
+
+def audio_sha256(audio_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(audio_path, "rb") as audio_file:
+        for chunk in iter(lambda: audio_file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_key(
+    audio_digest: str,
+    model: str | None,
+    language: str | None,
+    response_format: str,
+    timestamp_granularities: list[str] | None,
+    preprocess: str,
+) -> tuple[str, str, str, str]:
+    model_name = model or os.getenv("OPENAI_TRANSCRIBE_MODEL", "whisper-1")
+    options: list[Any] = [response_format, sorted(timestamp_granularities or ["word"])]
+    if preprocess:
+        options.append(preprocess)
+    return audio_digest, model_name, language or "", json.dumps(options)
+
+
+def cached_transcription(
+    audio_digest: str,
+    model: str | None = None,
+    language: str | None = None,
+    response_format: str = "verbose_json",
+    timestamp_granularities: list[str] | None = None,
+    preprocess: str = "",
+) -> tuple[dict[str, Any], float] | None:
+    """A cached ``(payload, lead_in_ms)`` for an upload digest, without touching the audio.
+
+    ``preprocess`` must match what :func:`transcribe_audio` was given when
+    the entry was stored.
+    """
+    if not CACHE_ENABLED:
+        return None
+    key = _cache_key(audio_digest, model, language, response_format, timestamp_granularities, preprocess)
+    return storage.get_cached_transcription(*key)
+
+
+def _store_in_cache(key: tuple[str, str, str, str], payload: dict[str, Any], lead_in_ms: float) -> None:
+    global _writes_since_evict
+    storage.put_cached_transcription(*key, payload, lead_in_ms)
+    _writes_since_evict += 1
+    if _writes_since_evict >= CACHE_EVICT_EVERY:
+        _writes_since_evict = 0
+        storage.evict_transcription_cache(CACHE_MAX_BYTES, CACHE_MAX_AGE_SECONDS)
+
 
 def transcribe_audio(
     audio_path: str,
@@ -10,21 +73,46 @@ def transcribe_audio(
     language: str | None = None,
     response_format: str = "verbose_json",
     timestamp_granularities: list[str] | None = None,
+    audio_digest: str | None = None,
+    preprocess: str = "",
+    lead_in_ms: float = 0.0,
 ) -> dict[str, Any]:
-    from openai import OpenAI
+    """Transcribe an audio file, reusing a cached result for identical audio.
 
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    The cache key is the SHA-256 of the audio bytes (pass ``audio_digest``
+    when the caller already hashed the upload) plus model, language and
+    output options. When ``audio_path`` is a preprocessed copy of the
+    upload, pass the upload's digest with the preprocessing settings as
+    ``preprocess`` and the trimmed ``lead_in_ms``; both are stored so that
+    :func:`cached_transcription` can answer before the upload is decoded.
+    """
     model_name = model or os.getenv("OPENAI_TRANSCRIBE_MODEL", "whisper-1")
+    granularities = timestamp_granularities or ["word"]
+    cache_key = None
+    if CACHE_ENABLED:
+        if audio_digest is None:
+            # Without the upload digest the file itself is the key.
+            audio_digest, preprocess, lead_in_ms = audio_sha256(audio_path), "", 0.0
+        cache_key = _cache_key(audio_digest, model_name, language, response_format, granularities, preprocess)
+        cached = storage.get_cached_transcription(*cache_key)
+        if cached is not None:
+            return cached[0]
+
+    client = openai_client.get_client()
     with open(audio_path, "rb") as audio_file:
         transcription = client.audio.transcriptions.create(
             file=audio_file,
             model=model_name,
             response_format=response_format,
             language=language,
-            timestamp_granularities=timestamp_granularities or ["word"],
+            timestamp_granularities=granularities,
         )
     if hasattr(transcription, "model_dump"):
-        return transcription.model_dump()
-    if isinstance(transcription, dict):
-        return transcription
-    return dict(transcription)
+        payload = transcription.model_dump()
+    elif isinstance(transcription, dict):
+        payload = transcription
+    else:
+        payload = dict(transcription)
+    if cache_key is not None:
+        _store_in_cache(cache_key, payload, lead_in_ms)
+    return payload
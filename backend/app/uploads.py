@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+from fastapi import Request, UploadFile
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from starlette.concurrency import run_in_threadpool
+
+CHUNK_SIZE = 256 * 1024
+MAX_AUDIO_BYTES = int(float(os.getenv("COGSCREEN_MAX_AUDIO_UPLOAD_MB", "25")) * 1024 * 1024)
+MAX_IMAGE_BYTES = int(float(os.getenv("COGSCREEN_MAX_IMAGE_UPLOAD_MB", "10")) * 1024 * 1024)
+
+# Sniffed kind -> file extension. The audio extension matters downstream:
+# the transcription API infers the container from the file name.
+AUDIO_KINDS = {
+    "webm": ".webm",
+    "ogg": ".ogg",
+    "wav": ".wav",
+    "mp3": ".mp3",
+    "mp4": ".m4a",
+    "flac": ".flac",
+}
+IMAGE_KINDS = {
+    "jpeg": ".jpg",
+    "png": ".png",
+    "gif": ".gif",
+    "webp": ".webp",
+    "bmp": ".bmp",
+}
+SNIFF_BYTES = 16
+# Room for multipart boundaries, part headers and small form fields on top
+# of the file itself when judging a request by its Content-Length.
+FORM_OVERHEAD_BYTES = 64 * 1024
+
+Endpoint = TypeVar("Endpoint", bound=Callable[..., Any])
+
+
+class UploadError(Exception):
+    """An upload was rejected; ``status_code`` is the HTTP status to report."""
+
+    def __init__(self, status_code: int, detail: str) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def limit_request_body(max_bytes: int) -> Callable[[Endpoint], Endpoint]:
+    """Mark an endpoint whose request body may not exceed ``max_bytes`` plus form overhead."""
+
+    def decorate(endpoint: Endpoint) -> Endpoint:
+        endpoint.max_request_bytes = max_bytes  # type: ignore[attr-defined]
+        return endpoint
+
+    return decorate
+
+
+class UploadRoute(APIRoute):
+    """Answers 413 from ``Content-Length`` before FastAPI reads the form.
+
+    FastAPI parses the multipart body (spooling files to disk) before the
+    endpoint runs, so the limit in :func:`save_upload` alone only fires once
+    the whole upload has arrived. Routes without
+    :func:`limit_request_body` are left untouched.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Any]:
+        handler = super().get_route_handler()
+        max_bytes = getattr(self.endpoint, "max_request_bytes", None)
+        if max_bytes is None:
+            return handler
+
+        async def limited_handler(request: Request) -> Any:
+            length = request.headers.get("content-length")
+            if length and length.isdigit() and int(length) > max_bytes + FORM_OVERHEAD_BYTES:
+                return JSONResponse({"detail": f"Upload exceeds {max_bytes} bytes"}, status_code=413)
+            return await handler(request)
+
+        return limited_handler
+
+
+@dataclass(frozen=True)
+class StoredUpload:
+    path: Path
+    size: int
+    sha256: str
+    kind: str
+
+
+def sniff_kind(head: bytes) -> str | None:
+    """Identify a file from its leading bytes, or return None."""
+    if head.startswith(b"\x1a\x45\xdf\xa3"):
+        return "webm"
+    if head.startswith(b"OggS"):
+        return "ogg"
+    if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+        return "wav"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    if head.startswith(b"ID3") or (len(head) > 1 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0):
+        return "mp3"
+    if head[4:8] == b"ftyp":
+        return "mp4"
+    if head.startswith(b"fLaC"):
+        return "flac"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return "gif"
+    if head.startswith(b"BM"):
+        return "bmp"
+    return None
+
+
+async def save_upload(
+    upload: UploadFile,
+    directory: Path,
+    name: str,
+    *,
+    kinds: dict[str, str],
+    max_bytes: int,
+    allow_empty: bool = False,
+) -> StoredUpload | None:
+    """Copy an upload to ``directory / name`` in bounded chunks.
+
+    By the time this runs Starlette has already received the body; requests
+    that announce an oversized body are turned away earlier by
+    :class:`UploadRoute`, and this check catches the rest (chunked or
+    understated requests) before anything is stored. Bytes go to a temp
+    file in the same directory while being hashed and counted; the file is
+    renamed into place only after the size limit and the sniffed type (one
+    of ``kinds``) check out. When ``name`` has no suffix, the sniffed
+    kind's extension is appended. An empty upload is rejected, or with
+    ``allow_empty`` stores nothing and returns None.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(dir=directory, prefix=".upload-", suffix=".part")
+    temp_path = Path(temp_name)
+    digest = hashlib.sha256()
+    size = 0
+    head = b""
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            while chunk := await upload.read(CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadError(413, f"Upload exceeds {max_bytes} bytes")
+                if len(head) < SNIFF_BYTES:
+                    head += chunk[: SNIFF_BYTES - len(head)]
+                digest.update(chunk)
+                await run_in_threadpool(handle.write, chunk)
+        if size == 0:
+            if allow_empty:
+                temp_path.unlink()
+                return None
+            raise UploadError(400, "Uploaded file is empty")
+        kind = sniff_kind(head)
+        if kind not in kinds:
+            raise UploadError(415, f"Unsupported file type; expected one of {', '.join(kinds)}")
+        destination = directory / (name if Path(name).suffix else f"{name}{kinds[kind]}")
+        os.replace(temp_path, destination)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    return StoredUpload(path=destination, size=size, sha256=digest.hexdigest(), kind=kind)
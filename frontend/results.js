@@ -940,21 +940,17 @@ ${worksheetXmlList}
 
     const testRows = [];
     const gameRows = [];
-    let cacheUpdated = false;
+    const uncachedIds = normalizedSessionIds.filter((sessionId) => !reportCache[sessionId]);
+    const [fetchedReports, progressMap] = await Promise.all([
+      fetchReportsBatch(uncachedIds),
+      fetchProgressBatch(normalizedSessionIds),
+    ]);
+    Object.assign(reportCache, fetchedReports);
+    const cacheUpdated = Object.keys(fetchedReports).length > 0;
 
     for (const sessionId of normalizedSessionIds) {
-      let report = reportCache[sessionId] || null;
-      if (!report) {
-        try {
-          report = await fetchReport(sessionId);
-          reportCache[sessionId] = report;
-          cacheUpdated = true;
-        } catch (error) {
-          report = null;
-        }
-      }
-
-      const progress = await fetchProgress(sessionId);
+      const report = reportCache[sessionId] || null;
+      const progress = progressMap[sessionId] || null;
       testRows.push(...buildTestSheetRowsForSession(sessionId, report, progress));
       gameRows.push(...buildGameSheetRowsForSession(sessionId, report, gameMap[sessionId] || null));
     }
@@ -1735,14 +1731,17 @@ ${worksheetXmlList}
       return [];
     }
 
-    const items = (await Promise.all(
-      sessionDirectory.map(async (entry) => {
+    const progressMap = await fetchProgressBatch(
+      sessionDirectory.map((entry) => (entry && entry.session_id ? String(entry.session_id) : "")),
+    );
+    const items = sessionDirectory
+      .map((entry) => {
         const sessionId = entry && entry.session_id ? String(entry.session_id) : "";
         if (!sessionId) {
           return null;
         }
 
-        const progress = await fetchProgress(sessionId);
+        const progress = progressMap[sessionId] || null;
         if (!progress || progress.is_complete) {
           return null;
         }
@@ -1762,8 +1761,8 @@ ${worksheetXmlList}
           totalQuestions,
           completionPct,
         };
-      }),
-    )).filter((item) => Boolean(item));
+      })
+      .filter((item) => Boolean(item));
 
     items.sort((a, b) => {
       const aDate = parseDate(a.createdAt);
@@ -1821,6 +1820,64 @@ ${worksheetXmlList}
     return response.json();
   }
 
+  const BATCH_SIZE = 500;
+
+  async function postBatch(path, sessionIds) {
+    const merged = Object.create(null);
+    const uniqueIds = Array.from(new Set((sessionIds || []).filter(Boolean)));
+    for (let index = 0; index < uniqueIds.length; index += BATCH_SIZE) {
+      const response = await fetch(`${API_ROOT}/${path}`, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ session_ids: uniqueIds.slice(index, index + BATCH_SIZE) }),
+      });
+      if (!response.ok) {
+        throw new Error(`Batch API failed: ${response.status}`);
+      }
+      const payload = await response.json();
+      Object.assign(merged, payload.reports || payload.progress || {});
+    }
+    return merged;
+  }
+
+  const FALLBACK_CONCURRENCY = 6;
+
+  async function fetchEach(sessionIds, fetcher) {
+    const merged = Object.create(null);
+    const uniqueIds = Array.from(new Set((sessionIds || []).filter(Boolean)));
+    for (let index = 0; index < uniqueIds.length; index += FALLBACK_CONCURRENCY) {
+      const chunk = uniqueIds.slice(index, index + FALLBACK_CONCURRENCY);
+      const values = await Promise.all(
+        chunk.map((sessionId) => fetcher(sessionId).catch(() => null)),
+      );
+      chunk.forEach((sessionId, position) => {
+        if (values[position]) {
+          merged[sessionId] = values[position];
+        }
+      });
+    }
+    return merged;
+  }
+
+  // Batch endpoints are an optimization: when one fails (e.g. an older
+  // server), fall back to the per-session endpoints rather than showing
+  // empty reports and progress.
+  async function fetchReportsBatch(sessionIds) {
+    try {
+      return await postBatch("reports:batch", sessionIds);
+    } catch (error) {
+      return fetchEach(sessionIds, fetchReport);
+    }
+  }
+
+  async function fetchProgressBatch(sessionIds) {
+    try {
+      return await postBatch("progress:batch", sessionIds);
+    } catch (error) {
+      return fetchEach(sessionIds, fetchProgress);
+    }
+  }
+
   async function fetchProgress(sessionId) {
     try {
       const response = await fetch(`${API_ROOT}/sessions/${sessionId}/progress`);
@@ -1864,29 +1921,26 @@ ${worksheetXmlList}
     }
 
     const records = [];
-    let cacheUpdated = false;
-
-    for (const sessionId of sessionIds) {
-      const progress = await fetchProgress(sessionId);
-      if (!progress || !progress.is_complete) {
-        continue;
-      }
+    const progressMap = await fetchProgressBatch(sessionIds);
+    const completedIds = sessionIds.filter(
+      (sessionId) => progressMap[sessionId] && progressMap[sessionId].is_complete,
+    );
+    const fetchedReports = await fetchReportsBatch(
+      completedIds.filter(
+        (sessionId) => !reportCache[sessionId] && !(sessionId === currentSessionId && currentReport),
+      ),
+    );
+    Object.assign(reportCache, fetchedReports);
+    const cacheUpdated = Object.keys(fetchedReports).length > 0;
 
+    for (const sessionId of completedIds) {
       let gameEntry = gameResults[sessionId] || null;
       let report = null;
 
       if (sessionId === currentSessionId && currentReport) {
         report = currentReport;
-      } else if (reportCache[sessionId]) {
-        report = reportCache[sessionId];
       } else {
-        try {
-          report = await fetchReport(sessionId);
-          reportCache[sessionId] = report;
-          cacheUpdated = true;
-        } catch (error) {
-          report = null;
-        }
+        report = reportCache[sessionId] || null;
       }
 
       if (!gameEntry) {
@@ -2095,7 +2149,7 @@ ${worksheetXmlList}
       reportCache[currentExportSessionId] = currentExportReport;
     }
 
-    const progressCache = Object.create(null);
+    const progressCache = await fetchProgressBatch(orderedSessionIds);
     const getProgressForSession = async (sessionId) => {
       if (sessionId in progressCache) {
         return progressCache[sessionId];
@@ -2129,19 +2183,14 @@ ${worksheetXmlList}
 
     const testRows = [];
     const gameRows = [];
-    let cacheUpdated = false;
+    const fetchedReports = await fetchReportsBatch(
+      exportSessionIds.filter((sessionId) => !reportCache[sessionId]),
+    );
+    Object.assign(reportCache, fetchedReports);
+    const cacheUpdated = Object.keys(fetchedReports).length > 0;
 
     for (const sessionId of exportSessionIds) {
-      let report = reportCache[sessionId] || null;
-      if (!report) {
-        try {
-          report = await fetchReport(sessionId);
-          reportCache[sessionId] = report;
-          cacheUpdated = true;
-        } catch (error) {
-          report = null;
-        }
-      }
+      const report = reportCache[sessionId] || null;
 
       const progress = await getProgressForSession(sessionId);
       testRows.push(...buildTestSheetRowsForSession(sessionId, report, progress));
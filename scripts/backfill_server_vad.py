@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app import audio_preprocess, reaction_time, storage  # noqa: E402
+
+# Uploads are named <response_id><ext> (older ones <response_id>_<client name>).
+RESPONSE_ID = re.compile(r"^([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})")
+
+
+def find_uploads(upload_dir: Path) -> dict[str, Path]:
+    uploads: dict[str, Path] = {}
+    for path in sorted(upload_dir.iterdir()):
+        match = RESPONSE_ID.match(path.name)
+        if not match or not path.is_file() or path.name.endswith((".16k.wav", ".part")):
+            continue
+        uploads.setdefault(match.group(1), path)
+    return uploads
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfill server-side VAD reaction times from stored uploads.")
+    parser.add_argument("--uploads", type=Path, default=Path("./data/uploads"))
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: min(8, CPUs))")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--force", action="store_true", help="Recompute responses that already have a value")
+    args = parser.parse_args()
+
+    if not audio_preprocess.is_available():
+        raise SystemExit("Missing dependency: numpy. Install with: pip install .[audio]")
+    if not args.uploads.is_dir():
+        raise SystemExit(f"Upload directory not found: {args.uploads}")
+
+    storage.init_db()
+    uploads = find_uploads(args.uploads)
+    response_ids = list(uploads)
+    if not args.force:
+        missing = storage.list_response_ids_missing_server_vad(response_ids)
+        response_ids = [response_id for response_id in response_ids if response_id in missing]
+    print(f"{len(uploads)} uploads, {len(response_ids)} responses to process")
+
+    started = time.perf_counter()
+    updated = undetected = 0
+    for offset in range(0, len(response_ids), args.batch_size):
+        batch = response_ids[offset : offset + args.batch_size]
+        onsets = reaction_time.reaction_time_server_vad_batch(
+            [uploads[response_id] for response_id in batch], workers=args.workers
+        )
+        values = []
+        for response_id in batch:
+            onset = onsets[str(uploads[response_id])]
+            if onset is None:
+                undetected += 1
+            else:
+                values.append((onset, response_id))
+        storage.update_server_vad(values)
+        updated += len(values)
+        print(f"  {offset + len(batch)}/{len(response_ids)} processed")
+
+    elapsed = time.perf_counter() - started
+    print(f"updated {updated}, no speech or undecodable {undetected}, in {elapsed:.2f}s")
+    storage.close_connections()
+
+
+if __name__ == "__main__":
+    main()
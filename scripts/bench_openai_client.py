@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app import openai_client  # noqa: E402
+from scripts.mock_openai_server import Latency, MockConfig, start_server  # noqa: E402
+
+
+def transcribe_once(client, audio_path: Path) -> None:
+    with audio_path.open("rb") as audio_file:
+        client.audio.transcriptions.create(
+            file=audio_file,
+            model="whisper-1",
+            response_format="verbose_json",
+            timestamp_granularities=["word"],
+        )
+
+
+def measure(label: str, calls: int, make_client, audio_path: Path) -> list[float]:
+    latencies = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        transcribe_once(make_client(), audio_path)
+        latencies.append((time.perf_counter() - started) * 1000.0)
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{label:>10}: mean {statistics.mean(latencies):6.2f} ms | p50 {statistics.median(latencies):6.2f} ms | p95 {p95:6.2f} ms")
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-call OpenAI clients vs the shared registry client, against a local mock.")
+    parser.add_argument("--calls", type=int, default=300)
+    args = parser.parse_args()
+
+    server = start_server(MockConfig(transcribe_latency=Latency("fixed", 0.0)))
+    os.environ["OPENAI_API_KEY"] = "mock-key"
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_port}/v1"
+
+    from openai import OpenAI
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        audio_path = Path(tmp_dir) / "answer.wav"
+        audio_path.write_bytes(b"RIFF" + b"\0" * 16000)
+        fresh = measure(
+            "per-call",
+            args.calls,
+            lambda: OpenAI(api_key="mock-key", base_url=os.environ["OPENAI_BASE_URL"]),
+            audio_path,
+        )
+        shared = measure("shared", args.calls, openai_client.get_client, audio_path)
+    openai_client.close_clients()
+    server.shutdown()
+    print(f"median speedup: {statistics.median(fresh) / statistics.median(shared):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from backend.app import storage  # noqa: E402
+
+
+def seed(sessions: int, responses_per_session: int) -> list[str]:
+    session_ids = [str(uuid.uuid4()) for _ in range(sessions)]
+    for session_id in session_ids:
+        storage.create_session(session_id, "bench-patient", "spmsq", {"name": "測試"})
+        for index in range(responses_per_session):
+            storage.save_response(
+                response_id=str(uuid.uuid4()),
+                session_id=session_id,
+                question_id=f"DAILY_Q{index + 1}",
+                transcript="星期三",
+                reaction_time_whisper_ms=1200.0,
+                reaction_time_vad_ms=1100.0,
+                manual_confirmed=None,
+                rule_score={"type": "contains_any", "is_correct": True, "matched": ["星期三"]},
+                llm_judge={"is_correct": True, "confidence": 0.9, "reason": "ok"},
+            )
+        storage.save_instrument_score(
+            str(uuid.uuid4()), session_id, "SPMSQ", 1, {"errors": 1, "severity_band": "normal"}
+        )
+    return session_ids
+
+
+def clear_report_cache() -> None:
+    with storage._connect() as conn:
+        conn.execute("DELETE FROM reports")
+
+
+def per_session(client: TestClient, session_ids: list[str]) -> None:
+    for session_id in session_ids:
+        client.get(f"/api/sessions/{session_id}/report").raise_for_status()
+        client.get(f"/api/sessions/{session_id}/progress").raise_for_status()
+
+
+def batched(client: TestClient, session_ids: list[str]) -> None:
+    client.post("/api/reports:batch", json={"session_ids": session_ids}).raise_for_status()
+    client.post("/api/progress:batch", json={"session_ids": session_ids}).raise_for_status()
+
+
+def timed(label: str, func, client: TestClient, session_ids: list[str], cold: bool) -> float:
+    if cold:
+        clear_report_cache()
+    started = time.perf_counter()
+    func(client, session_ids)
+    elapsed = time.perf_counter() - started
+    print(f"{label:>18}: {elapsed * 1000:8.1f} ms")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare per-session report/progress fetches with the batch endpoints."
+    )
+    parser.add_argument("--sessions", type=int, default=400)
+    parser.add_argument("--responses", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        storage.DB_PATH = Path(tmp_dir) / "bench.db"
+        os.environ["COGSCREEN_QUESTION_RELOAD_SECONDS"] = "0"
+        storage.init_db()
+        session_ids = seed(args.sessions, args.responses)
+
+        from backend.app.main import app
+
+        with TestClient(app) as client:
+            print(f"{args.sessions} sessions x {args.responses} responses")
+            before_cold = timed("per-session cold", per_session, client, session_ids, cold=True)
+            before_warm = timed("per-session warm", per_session, client, session_ids, cold=False)
+            after_cold = timed("batch cold", batched, client, session_ids, cold=True)
+            after_warm = timed("batch warm", batched, client, session_ids, cold=False)
+        storage.close_connections()
+    print(f"speedup cold: {before_cold / after_cold:.1f}x  warm: {before_warm / after_warm:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app import storage  # noqa: E402
+
+
+def legacy_connect() -> sqlite3.Connection:
+    """The pre-pool behaviour: a brand-new default connection per call."""
+    conn = sqlite3.connect(storage.DB_PATH)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def simulated_request(session_id: str) -> None:
+    """Mirror the storage calls made by one POST /responses request."""
+    storage.get_session(session_id)
+    storage.save_response(
+        response_id=str(uuid.uuid4()),
+        session_id=session_id,
+        question_id="DAILY_Q1",
+        transcript="星期三",
+        reaction_time_whisper_ms=1200.0,
+        reaction_time_vad_ms=1100.0,
+        manual_confirmed=None,
+        rule_score={"type": "contains_any", "is_correct": True, "matched": ["星期三"]},
+        llm_judge=None,
+    )
+    storage.list_responses(session_id)
+
+
+def run(label: str, requests: int, threads: int, session_ids: list[str]) -> float:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda i: simulated_request(session_ids[i % len(session_ids)]), range(requests)))
+    elapsed = time.perf_counter() - started
+    rps = requests / elapsed
+    print(f"{label:>8}: {requests} requests / {threads} threads in {elapsed:.2f}s -> {rps:,.0f} req/s")
+    return rps
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare per-call SQLite connections with the pooled WAL layer.")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--sessions", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        storage.DB_PATH = Path(tmp_dir) / "bench.db"
+        storage.init_db()
+        session_ids = [str(uuid.uuid4()) for _ in range(args.sessions)]
+        for session_id in session_ids:
+            storage.create_session(session_id, "bench-patient", "spmsq", {"name": "測試"})
+
+        pooled_connect = storage._connect
+        storage._connect = legacy_connect
+        try:
+            before = run("before", args.requests, args.threads, session_ids)
+        finally:
+            storage._connect = pooled_connect
+        after = run("after", args.requests, args.threads, session_ids)
+        storage.close_connections()
+    print(f"speedup: {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+os.environ.setdefault("COGSCREEN_QUESTION_RELOAD_SECONDS", "0")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from backend.app import question_bank, reporting, scoring_rules, storage  # noqa: E402
+from backend.app.pipeline import scoring_context  # noqa: E402
+from scripts.seed_mock_full_results import seed_synthetic  # noqa: E402
+
+SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+DEFAULT_CACHE_DIR = PROJECT_ROOT / "data" / "bench"
+SAMPLE_SESSIONS = 200
+FILLER = "嗯，讓我想一下，這個我記得好像是"
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def measure(func: Callable[[Any], Any], inputs: list[Any], min_time: float, min_calls: int = 20) -> dict[str, Any]:
+    """Call ``func`` on ``inputs`` round-robin for at least ``min_time`` seconds.
+
+    Each call is timed on its own so the median and p95 are per operation.
+    """
+    timings: list[int] = []
+    deadline = time.perf_counter() + min_time
+    index = 0
+    while len(timings) < min_calls or time.perf_counter() < deadline:
+        item = inputs[index % len(inputs)]
+        started = time.perf_counter_ns()
+        func(item)
+        timings.append(time.perf_counter_ns() - started)
+        index += 1
+    timings.sort()
+    return {
+        "calls": len(timings),
+        "median_us": round(percentile(timings, 50) / 1000.0, 3),
+        "p95_us": round(percentile(timings, 95) / 1000.0, 3),
+        "mean_us": round(sum(timings) / len(timings) / 1000.0, 3),
+    }
+
+
+def _sample_answers(rule: dict[str, Any]) -> list[str]:
+    """A right-looking, a wrong and a long rambling answer for a prepared rule."""
+    if rule.get("type") == "sequence_subtract":
+        start, step = float(rule.get("start", 0)), float(rule.get("step", -1))
+        numbers = " ".join(str(int(start + step * (i + 1))) for i in range(int(rule.get("count", 5))))
+        return [numbers, "我不知道", FILLER * 10 + numbers]
+    expected = [str(item) for item in rule.get("expected") or []]
+    hit = "，".join(expected[:3]) if rule.get("type") in ("contains_all", "sequence") else (expected or ["不知道"])[0]
+    return [f"{FILLER}{hit}", "我不知道，想不起來", FILLER * 10 + hit + FILLER * 5]
+
+
+def scoring_benchmarks(min_time: float) -> dict[str, dict[str, Any]]:
+    context = scoring_context({"age": 72, "phone": "0212345678", "mother_name": "王媽媽"})
+    by_type: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    for question in question_bank.get_question_bank().questions:
+        rule = question.get("scoring_rule") or {}
+        if rule.get("type"):
+            by_type[rule["type"]].append(rule)
+
+    # Timed the way the pipeline calls them: prepare() on the question-bank
+    # rule, then score() on the compiled result.
+    results = {}
+    for rule_type, rules in sorted(by_type.items()):
+        results[f"micro/prepare_rule/{rule_type}"] = measure(
+            lambda rule: scoring_rules.prepare(rule, context), rules, min_time
+        )
+        cases = []
+        for rule in rules:
+            compiled = scoring_rules.prepare(rule, context)
+            cases.extend((compiled, answer) for answer in _sample_answers(compiled.as_rule()))
+        results[f"micro/score_answer/{rule_type}"] = measure(
+            lambda case: case[0].score(case[1]), cases, min_time
+        )
+    return results
+
+
+def database_path(cache_dir: Path, label: str, seed: int, reseed: bool) -> Path:
+    """Seed (or reuse) a synthetic database for one size label."""
+    path = cache_dir / f"synthetic-{label}-seed{seed}.db"
+    if reseed:
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{path}{suffix}").unlink(missing_ok=True)
+    storage.DB_PATH = path
+    if not path.exists():
+        started = time.perf_counter()
+        seed_synthetic(SIZES[label], seed=seed)
+        print(f"  seeded {label} in {time.perf_counter() - started:.1f}s -> {path}")
+    storage.init_db()
+    return path
+
+
+def _search_needles(rng: random.Random) -> dict[str, str]:
+    with storage._connect() as conn:
+        names = [row[0] for row in conn.execute("SELECT DISTINCT patient_name FROM sessions LIMIT 500")]
+    name = rng.choice([name for name in names if len(name) >= 3] or names)
+    return {"exact": name, "partial1": name[:1], "partial2": name[1:3]}
+
+
+def database_benchmarks(label: str, min_time: float, seed: int, client: TestClient) -> dict[str, dict[str, Any]]:
+    rng = random.Random(seed)
+    with storage._connect() as conn:
+        session_ids = [row[0] for row in conn.execute("SELECT id FROM sessions")]
+    sample = rng.sample(session_ids, min(SAMPLE_SESSIONS, len(session_ids)))
+
+    def get(path: str) -> None:
+        # Seeded sessions are complete, so /next usually answers 404 after
+        # doing the same lookups a live request would.
+        response = client.get(path)
+        if response.status_code not in (200, 404):
+            response.raise_for_status()
+
+    results = {
+        f"{label}/build_report": measure(reporting.build_report, sample, min_time),
+        f"{label}/list_sessions/page": measure(lambda _: storage.list_sessions(limit=50), [None], min_time),
+        f"{label}/api/next": measure(lambda sid: get(f"/api/sessions/{sid}/next"), sample, min_time),
+        f"{label}/api/progress": measure(lambda sid: get(f"/api/sessions/{sid}/progress"), sample, min_time),
+    }
+    for kind, needle in _search_needles(rng).items():
+        results[f"{label}/list_sessions/name_{kind}"] = measure(
+            lambda value: storage.list_sessions(patient_name=value, limit=50), [needle], min_time
+        )
+    return results
+
+
+def _git_revision() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def run_suite(args: argparse.Namespace) -> dict[str, Any]:
+    results: dict[str, dict[str, Any]] = {}
+    if not args.skip_micro:
+        print("micro benchmarks")
+        results.update(scoring_benchmarks(args.min_time))
+    if args.sizes:
+        from backend.app.main import app
+
+        args.cache_dir.mkdir(parents=True, exist_ok=True)
+        for label in args.sizes:
+            print(f"{label} database")
+            database_path(args.cache_dir, label, args.seed, args.reseed)
+            with TestClient(app) as client:
+                results.update(database_benchmarks(label, args.min_time, args.seed, client))
+            storage.close_connections()
+    return {
+        "meta": {
+            "created_at": dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds"),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "min_time_s": args.min_time,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], threshold: float) -> list[str]:
+    """Print median changes per benchmark and return the names that regressed."""
+    regressions = []
+    old, new = baseline["results"], current["results"]
+    print(f"{'benchmark':<44}{'baseline us':>13}{'current us':>13}{'change':>9}")
+    for name in sorted(set(old) | set(new)):
+        if name not in old or name not in new:
+            print(f"{name:<44}{'(only in ' + ('baseline' if name in old else 'current') + ')':>35}")
+            continue
+        before, after = old[name]["median_us"], new[name]["median_us"]
+        ratio = after / before if before else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            flag = "  faster"
+        print(f"{name:<44}{before:>13.2f}{after:>13.2f}{(ratio - 1) * 100:>+8.0f}%{flag}")
+    return regressions
+
+
+def print_results(report: dict[str, Any]) -> None:
+    print(f"{'benchmark':<44}{'calls':>8}{'median us':>12}{'p95 us':>12}")
+    for name, row in report["results"].items():
+        print(f"{name:<44}{row['calls']:>8}{row['median_us']:>12.2f}{row['p95_us']:>12.2f}")
+
+
+def _sizes(value: str) -> list[str]:
+    labels = [label.strip().lower() for label in value.split(",") if label.strip()]
+    unknown = [label for label in labels if label not in SIZES]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"Unknown size(s) {unknown}; choose from {', '.join(SIZES)}")
+    return labels
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Time scoring, reporting, storage and API hot paths; save JSON and compare to a baseline."
+    )
+    parser.add_argument("--sizes", type=_sizes, default=["1k"], help="Comma list of 1k,100k,1m ('' for none)")
+    parser.add_argument("--skip-micro", action="store_true", help="Skip the scoring micro benchmarks")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Seconds spent per benchmark")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR, help="Where seeded databases are kept")
+    parser.add_argument("--reseed", action="store_true", help="Rebuild cached synthetic databases")
+    parser.add_argument("--output", type=Path, help="Write results JSON here")
+    parser.add_argument("--baseline", type=Path, help="Compare against this saved results JSON")
+    parser.add_argument("--results", type=Path, help="Compare this saved results JSON instead of running")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Median slowdown flagged as a regression")
+    args = parser.parse_args()
+
+    if args.results:
+        report = json.loads(args.results.read_text(encoding="utf-8"))
+    else:
+        report = run_suite(args)
+        print_results(report)
+        if args.output:
+            args.output.parent.mkdir(parents=True, exist_ok=True)
+            args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+            print(f"results written to {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(baseline, report, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+            raise SystemExit(1)
+        print("no regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import math
+import os
+import random
+import socket
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.mock_openai_server import add_mock_arguments, build_config, start_server  # noqa: E402
+
+
+class Stats:
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+
+    async def call(self, label: str, request) -> httpx.Response | None:
+        started = time.perf_counter()
+        try:
+            response = await request
+        except httpx.HTTPError:
+            self.errors[label] += 1
+            return None
+        self.latencies[label].append((time.perf_counter() - started) * 1000.0)
+        if response.status_code >= 400 and not (label == "GET /next" and response.status_code == 404):
+            self.errors[label] += 1
+        return response
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return float("nan")
+    index = min(len(sorted_values) - 1, max(0, math.ceil(pct / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _render_wav(onset_s: float, seconds: float = 1.5, rate: int = 16000) -> bytes:
+    frames = bytearray()
+    onset = int(rate * onset_s)
+    for index in range(int(rate * seconds)):
+        value = 0 if index < onset else int(9000 * math.sin(2 * math.pi * 220 * index / rate))
+        frames += struct.pack("<h", value)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(rate)
+        wav_file.writeframes(bytes(frames))
+    return buffer.getvalue()
+
+
+# Rendered once up front so the generator's own event loop stays responsive.
+WAV_VARIANTS = [_render_wav(0.3 + 0.05 * step) for step in range(12)]
+WAV_HEADER_BYTES = 44
+
+
+def make_wav(rng: random.Random) -> bytes:
+    """A tone after a random onset; the first sample is randomised so each upload hashes differently."""
+    audio = bytearray(rng.choice(WAV_VARIANTS))
+    audio[WAV_HEADER_BYTES : WAV_HEADER_BYTES + 2] = struct.pack("<h", rng.randint(-30, 30))
+    return bytes(audio)
+
+
+async def run_session(
+    client: httpx.AsyncClient,
+    stats: Stats,
+    index: int,
+    instrument: str,
+    max_questions: int,
+    rng: random.Random,
+) -> None:
+    created = await stats.call(
+        "POST /sessions",
+        client.post(
+            "/api/sessions",
+            json={"patient_id": f"load-{index}", "instrument": instrument, "config": {"name": f"壓測{index}"}},
+        ),
+    )
+    if created is None or created.status_code != 200:
+        return
+    session_id = created.json()["session_id"]
+    for _ in range(max_questions):
+        question = await stats.call("GET /next", client.get(f"/api/sessions/{session_id}/next"))
+        if question is None or question.status_code != 200:
+            break
+        await stats.call(
+            "POST /responses",
+            client.post(
+                f"/api/sessions/{session_id}/responses",
+                params={"question_id": question.json()["question_id"], "reaction_time_vad_ms": 800},
+                files={"audio": ("answer.wav", make_wav(rng), "audio/wav")},
+            ),
+        )
+    await stats.call("GET /progress", client.get(f"/api/sessions/{session_id}/progress"))
+    await stats.call("POST /submit", client.post(f"/api/sessions/{session_id}/submit"))
+    await stats.call("GET /report", client.get(f"/api/sessions/{session_id}/report"))
+
+
+async def drive(args: argparse.Namespace, base_url: str) -> tuple[Stats, float]:
+    stats = Stats()
+    rng = random.Random(args.seed)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+
+        async def bounded(index: int) -> None:
+            async with semaphore:
+                await run_session(client, stats, index, args.instrument, args.questions, rng)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(bounded(index) for index in range(args.sessions)))
+        elapsed = time.perf_counter() - started
+    return stats, elapsed
+
+
+def summarize(stats: Stats, elapsed: float, sessions: int) -> dict[str, object]:
+    endpoints = {}
+    for label in sorted(set(stats.latencies) | set(stats.errors)):
+        values = sorted(stats.latencies[label])
+        endpoints[label] = {
+            "count": len(values),
+            "errors": stats.errors[label],
+            "p50_ms": round(percentile(values, 50), 2),
+            "p95_ms": round(percentile(values, 95), 2),
+            "p99_ms": round(percentile(values, 99), 2),
+            "max_ms": round(values[-1], 2) if values else None,
+        }
+    responses = len(stats.latencies["POST /responses"])
+    return {
+        "sessions": sessions,
+        "elapsed_s": round(elapsed, 2),
+        "sessions_per_s": round(sessions / elapsed, 2),
+        "responses_per_s": round(responses / elapsed, 2),
+        "endpoints": endpoints,
+    }
+
+
+def print_summary(summary: dict[str, object]) -> None:
+    print(
+        f"{summary['sessions']} sessions in {summary['elapsed_s']}s -> "
+        f"{summary['sessions_per_s']} sessions/s, {summary['responses_per_s']} responses/s"
+    )
+    print(f"{'endpoint':<18}{'count':>7}{'errors':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    for label, row in summary["endpoints"].items():
+        print(
+            f"{label:<18}{row['count']:>7}{row['errors']:>8}"
+            f"{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}{row['max_ms'] or 0:>10.1f}"
+        )
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def spawn_app(args: argparse.Namespace, work_dir: Path, mock_root: str) -> tuple[subprocess.Popen, str]:
+    port = _free_port()
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(PROJECT_ROOT),
+        "DATABASE_PATH": str(work_dir / "load.db"),
+        "COGSCREEN_REPORT_DIR": str(work_dir / "reports"),
+        "OPENAI_API_KEY": "mock-key",
+        "OPENAI_BASE_URL": f"{mock_root}/v1",
+        "COGSCREEN_API_URL": f"{mock_root}/v1.0/telemetry/info",
+        "COGSCREEN_QUESTION_RELOAD_SECONDS": "0",
+    }
+    if not args.keep_caches:
+        env["COGSCREEN_TRANSCRIPTION_CACHE"] = "0"
+        env["COGSCREEN_JUDGE_CACHE_SIZE"] = "0"
+    command = [
+        sys.executable, "-m", "uvicorn", "backend.app.main:app",
+        "--host", "127.0.0.1", "--port", str(port), "--workers", str(args.app_workers), "--log-level", "warning",
+    ]
+    process = subprocess.Popen(command, cwd=work_dir, env=env)
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/api/sessions", params={"limit": 1}, timeout=1).status_code == 200:
+                return process, base_url
+        except httpx.HTTPError:
+            pass
+        if process.poll() is not None:
+            break
+        time.sleep(0.2)
+    process.terminate()
+    raise SystemExit("App did not start; run it by hand and pass --base-url")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Drive full screening sessions against the API and report per-endpoint latency percentiles."
+    )
+    parser.add_argument("--base-url", help="Target a running app instead of spawning one with the mock")
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=10, help="Sessions in flight at once")
+    parser.add_argument("--questions", type=int, default=10, help="Max questions answered per session")
+    parser.add_argument("--instrument", default="spmsq")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--app-workers", type=int, default=1)
+    parser.add_argument("--keep-caches", action="store_true", help="Leave transcription/judge caches on")
+    parser.add_argument("--json", dest="json_path", help="Also write the summary to this file")
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+
+    if args.base_url:
+        stats, elapsed = asyncio.run(drive(args, args.base_url))
+    else:
+        mock = start_server(build_config(args))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            process, base_url = spawn_app(args, Path(tmp_dir), f"http://127.0.0.1:{mock.server_port}")
+            try:
+                stats, elapsed = asyncio.run(drive(args, base_url))
+            finally:
+                process.terminate()
+                process.wait(timeout=10)
+        print(f"mock calls: {mock.counts}")
+        mock.shutdown()
+
+    summary = summarize(stats, elapsed, args.sessions)
+    print_summary(summary)
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(summary, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+# Canned answers; each request picks one and jitters its word timestamps.
+DEFAULT_PAYLOADS: list[dict[str, Any]] = [
+    {"text": "星期三", "words": ["星期三"]},
+    {"text": "八 六 四 二", "words": ["八", "六", "四", "二"]},
+    {"text": "在台灣", "words": ["在", "台灣"]},
+    {"text": "民國一百一十五年", "words": ["民國", "一百一十五年"]},
+    {"text": "我不知道", "words": ["我", "不知道"]},
+]
+
+
+@dataclass(frozen=True)
+class Latency:
+    """A latency distribution in milliseconds, parsed from ``kind:a[,b]``.
+
+    ``fixed:200``, ``uniform:100,400``, ``normal:300,50`` (mean, sd) and
+    ``lognormal:600,0.4`` (median, sigma of the underlying normal).
+    """
+
+    kind: str
+    a: float
+    b: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> "Latency":
+        kind, _, args = spec.partition(":")
+        values = [float(value) for value in args.split(",") if value]
+        if kind not in ("fixed", "uniform", "normal", "lognormal") or not values:
+            raise argparse.ArgumentTypeError(f"Invalid latency spec: {spec!r}")
+        if kind != "fixed" and len(values) != 2:
+            raise argparse.ArgumentTypeError(f"{kind} latency needs two values: {spec!r}")
+        return cls(kind, values[0], values[1] if len(values) > 1 else 0.0)
+
+    def sample_ms(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            value = rng.uniform(self.a, self.b)
+        elif self.kind == "normal":
+            value = rng.gauss(self.a, self.b)
+        elif self.kind == "lognormal":
+            value = self.a * rng.lognormvariate(0.0, self.b)
+        else:
+            value = self.a
+        return max(0.0, value)
+
+
+@dataclass
+class MockConfig:
+    transcribe_latency: Latency = Latency("lognormal", 600.0, 0.35)
+    judge_latency: Latency = Latency("lognormal", 400.0, 0.3)
+    error_rate: float = 0.0
+    judge_correct_rate: float = 0.8
+    payloads: list[dict[str, Any]] = field(default_factory=lambda: list(DEFAULT_PAYLOADS))
+    seed: int | None = None
+
+
+class MockOpenAIServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], config: MockConfig) -> None:
+        super().__init__(address, MockHandler)
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.rng_lock = threading.Lock()
+        self.counts: dict[str, int] = {}
+
+    def draw(self, func):
+        with self.rng_lock:
+            return func(self.rng)
+
+
+def _transcription(payload: dict[str, Any], rng: random.Random) -> dict[str, Any]:
+    start = rng.uniform(0.3, 1.8)
+    words = []
+    for word in payload["words"]:
+        end = start + 0.15 + 0.12 * len(word)
+        words.append({"word": word, "start": round(start, 3), "end": round(end, 3)})
+        start = end + rng.uniform(0.05, 0.3)
+    duration = round(start + 0.3, 3)
+    return {
+        "task": "transcribe",
+        "language": "chinese",
+        "duration": duration,
+        "text": payload["text"],
+        "words": words,
+        "segments": [{"id": 0, "start": words[0]["start"] if words else 0.0, "end": duration, "text": payload["text"]}],
+    }
+
+
+def _verdict(is_correct: bool) -> str:
+    return json.dumps(
+        {
+            "normalized_answer": "mock",
+            "is_correct": is_correct,
+            "confidence": 0.9,
+            "reason": "mock judge",
+            "matched_expected": [],
+        },
+        ensure_ascii=False,
+    )
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: MockOpenAIServer
+
+    def _send_json(self, status: int, payload: dict[str, Any]) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        config = self.server.config
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path.endswith("/audio/transcriptions"):
+            endpoint, latency = "transcriptions", config.transcribe_latency
+        elif path.endswith("/chat/completions"):
+            endpoint, latency = "chat.completions", config.judge_latency
+        elif path.endswith("/responses"):
+            endpoint, latency = "responses", config.judge_latency
+        elif path.endswith("/telemetry/info"):
+            # Stand-in for COGSCREEN_API_URL so /submit completes offline.
+            with self.server.rng_lock:
+                self.server.counts["telemetry"] = self.server.counts.get("telemetry", 0) + 1
+            self._send_json(200, {"ok": True})
+            return
+        else:
+            self._send_json(404, {"error": {"message": f"No mock for {path}", "type": "invalid_request_error"}})
+            return
+        with self.server.rng_lock:
+            self.server.counts[endpoint] = self.server.counts.get(endpoint, 0) + 1
+
+        delay_ms, fail, correct = self.server.draw(
+            lambda rng: (
+                latency.sample_ms(rng),
+                rng.random() < config.error_rate,
+                rng.random() < config.judge_correct_rate,
+            )
+        )
+        time.sleep(delay_ms / 1000.0)
+        if fail:
+            status = 429 if self.server.draw(lambda rng: rng.random() < 0.5) else 500
+            self._send_json(status, {"error": {"message": "mock injected error", "type": "server_error"}})
+            return
+
+        created = int(time.time())
+        if endpoint == "transcriptions":
+            payload = self.server.draw(lambda rng: _transcription(rng.choice(config.payloads), rng))
+            self._send_json(200, payload)
+        elif endpoint == "chat.completions":
+            self._send_json(
+                200,
+                {
+                    "id": f"chatcmpl-{uuid.uuid4().hex}",
+                    "object": "chat.completion",
+                    "created": created,
+                    "model": "mock",
+                    "choices": [
+                        {
+                            "index": 0,
+                            "finish_reason": "stop",
+                            "message": {"role": "assistant", "content": _verdict(correct)},
+                        }
+                    ],
+                },
+            )
+        else:
+            self._send_json(
+                200,
+                {
+                    "id": f"resp_{uuid.uuid4().hex}",
+                    "object": "response",
+                    "created_at": created,
+                    "model": "mock",
+                    "status": "completed",
+                    "output": [
+                        {
+                            "id": f"msg_{uuid.uuid4().hex}",
+                            "type": "message",
+                            "role": "assistant",
+                            "status": "completed",
+                            "content": [{"type": "output_text", "text": _verdict(correct), "annotations": []}],
+                        }
+                    ],
+                    "parallel_tool_calls": False,
+                    "tool_choice": "auto",
+                    "tools": [],
+                },
+            )
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+def start_server(config: MockConfig, host: str = "127.0.0.1", port: int = 0) -> MockOpenAIServer:
+    """Serve the mock on a background thread.
+
+    Point ``OPENAI_BASE_URL`` at ``/v1`` and ``COGSCREEN_API_URL`` at
+    ``/v1.0/telemetry/info``.
+    """
+    server = MockOpenAIServer((host, port), config)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def build_config(args: argparse.Namespace) -> MockConfig:
+    payloads = DEFAULT_PAYLOADS
+    if args.payloads:
+        payloads = json.loads(Path(args.payloads).read_text(encoding="utf-8"))
+    return MockConfig(
+        transcribe_latency=args.transcribe_latency,
+        judge_latency=args.judge_latency,
+        error_rate=args.error_rate,
+        judge_correct_rate=args.judge_correct_rate,
+        payloads=payloads,
+        seed=args.seed,
+    )
+
+
+def add_mock_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--transcribe-latency", type=Latency.parse, default=MockConfig.transcribe_latency)
+    parser.add_argument("--judge-latency", type=Latency.parse, default=MockConfig.judge_latency)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of calls answered 429/500")
+    parser.add_argument("--judge-correct-rate", type=float, default=0.8)
+    parser.add_argument("--payloads", help='JSON list of {"text": ..., "words": [...]} transcriptions')
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Offline stand-in for the OpenAI transcription and judge endpoints."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+
+    server = MockOpenAIServer((args.host, args.port), build_config(args))
+    root = f"http://{args.host}:{server.server_port}"
+    print(f"Mock OpenAI listening; export OPENAI_BASE_URL={root}/v1 COGSCREEN_API_URL={root}/v1.0/telemetry/info")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app import rescoring, storage  # noqa: E402
+
+
+def _label(value: bool | None) -> str:
+    return {True: "correct", False: "incorrect", None: "unscored"}[value]
+
+
+def print_diff(summary: rescoring.RescoreSummary) -> None:
+    print(
+        f"scanned {summary.scanned}, scored {summary.scored}, rule scores changed {summary.changed}, "
+        f"verdicts flipped {sum(summary.flips.values())} ({summary.report_flips} visible in reports)"
+    )
+    if summary.flips:
+        print(f"{'question':<16}{'old':>12}{'new':>12}{'count':>8}")
+        for (question_id, old, new), count in sorted(summary.flips.items(), key=lambda item: (item[0][0], -item[1])):
+            print(f"{question_id:<16}{_label(old):>12}{_label(new):>12}{count:>8}")
+    for change in summary.examples:
+        flag = "" if not change.overridden else "  (overridden)"
+        print(
+            f"  {change.response_id} {change.question_id}: {_label(change.old_verdict)} -> "
+            f"{_label(change.new_verdict)}  {change.transcript[:40]!r}{flag}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Re-score stored transcripts with the current question files and report changed verdicts."
+    )
+    parser.add_argument("--name", help="Checkpoint name (default: 'default', or one per --question set)")
+    parser.add_argument("--question", action="append", dest="question_ids", help="Only this question id (repeatable)")
+    parser.add_argument("--chunk-size", type=int, default=rescoring.DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: min(8, CPUs))")
+    parser.add_argument("--restart", action="store_true", help="Ignore the saved checkpoint and start from the first response")
+    parser.add_argument("--dry-run", action="store_true", help="Report the diff without writing scores or checkpoints")
+    parser.add_argument("--json", dest="json_path", type=Path, help="Also write the summary to this file")
+    args = parser.parse_args()
+
+    name = args.name or (
+        "questions:" + ",".join(sorted(args.question_ids)) if args.question_ids else rescoring.DEFAULT_RUN
+    )
+    storage.init_db()
+    started = time.perf_counter()
+
+    def progress(summary: rescoring.RescoreSummary) -> None:
+        print(f"  rowid {summary.last_rowid}: {summary.scanned} scanned, {summary.changed} changed")
+
+    summary = rescoring.rescore(
+        name,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        restart=args.restart,
+        dry_run=args.dry_run,
+        question_ids=args.question_ids,
+        on_chunk=progress,
+    )
+    if summary.started_after:
+        print(f"resumed '{name}' after rowid {summary.started_after}")
+    print_diff(summary)
+    print(f"done in {time.perf_counter() - started:.2f}s{' (dry run, nothing written)' if args.dry_run else ''}")
+    if args.json_path:
+        args.json_path.write_text(json.dumps(summary.to_dict(), indent=2, ensure_ascii=False), encoding="utf-8")
+    storage.close_connections()
+
+
+if __name__ == "__main__":
+    main()
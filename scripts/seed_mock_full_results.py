@@ -1,12 +1,20 @@
 from __future__ import annotations
 
+import argparse
 import json
+import random
 import sqlite3
+import sys
 import uuid
 from datetime import datetime, timedelta
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app import storage  # noqa: E402
+
 DB_PATH = PROJECT_ROOT / "data" / "app.db"
 QUESTION_PATH = PROJECT_ROOT / "data" / "SPMSQ_questions.json"
 
@@ -33,48 +41,6 @@ SESSIONS = [
 ]
 
 
-def ensure_schema(conn: sqlite3.Connection) -> None:
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS sessions (
-            id TEXT PRIMARY KEY,
-            patient_id TEXT NOT NULL,
-            instrument TEXT,
-            config_json TEXT,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP
-        )
-        """
-    )
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS responses (
-            id TEXT PRIMARY KEY,
-            session_id TEXT NOT NULL,
-            question_id TEXT NOT NULL,
-            transcript TEXT,
-            reaction_time_whisper_ms REAL,
-            reaction_time_vad_ms REAL,
-            manual_confirmed INTEGER,
-            rule_score_json TEXT,
-            llm_judge_json TEXT,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP
-        )
-        """
-    )
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS instrument_scores (
-            id TEXT PRIMARY KEY,
-            session_id TEXT NOT NULL,
-            instrument TEXT NOT NULL,
-            score REAL NOT NULL,
-            interpretation_json TEXT,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP
-        )
-        """
-    )
-
-
 def load_questions() -> list[dict]:
     payload = json.loads(QUESTION_PATH.read_text(encoding="utf-8"))
     questions: list[dict] = []
@@ -108,6 +74,7 @@ def build_answer(question_no: int, is_correct: bool) -> str:
 
 
 def reset_session(conn: sqlite3.Connection, session_id: str) -> None:
+    conn.execute("DELETE FROM session_name_grams WHERE session_id = ?", (session_id,))
     conn.execute("DELETE FROM responses WHERE session_id = ?", (session_id,))
     conn.execute("DELETE FROM instrument_scores WHERE session_id = ?", (session_id,))
     conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
@@ -129,11 +96,22 @@ def seed_session(conn: sqlite3.Connection, spec: dict, questions: list[dict]) ->
 
     conn.execute(
         """
-        INSERT INTO sessions (id, patient_id, instrument, config_json, created_at)
-        VALUES (?, ?, ?, ?, ?)
+        INSERT INTO sessions (
+            id, patient_id, instrument, config_json, patient_name, patient_gender, patient_age, created_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
         """,
-        (session_id, PATIENT_ID, "spmsq", json.dumps(config, ensure_ascii=False), spec["created_at"]),
+        (
+            session_id,
+            PATIENT_ID,
+            "spmsq",
+            json.dumps(config, ensure_ascii=False),
+            PATIENT_NAME,
+            PATIENT_GENDER,
+            PATIENT_AGE,
+            spec["created_at"],
+        ),
     )
+    storage._index_session_name(conn, session_id, PATIENT_NAME)
 
     for idx, question in enumerate(questions, start=1):
         is_correct = idx not in wrong_numbers
@@ -167,9 +145,10 @@ def seed_session(conn: sqlite3.Connection, spec: dict, questions: list[dict]) ->
                 manual_confirmed,
                 rule_score_json,
                 llm_judge_json,
+                scoring_status,
                 created_at
             )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'done', ?)
             """,
             (
                 str(uuid.uuid4()),
@@ -210,15 +189,157 @@ def seed_session(conn: sqlite3.Connection, spec: dict, questions: list[dict]) ->
     )
 
 
+# Synthetic bulk data for benchmarks: names are drawn from these pools so
+# exact and partial name searches hit realistic match counts.
+SURNAMES = "陳林黃張李王吳劉蔡楊許鄭謝郭洪曾邱廖賴周"
+GIVEN_CHARS = "志明美玲淑惠俊傑家豪雅婷建宏怡君宗翰佳穎冠宇"
+SYNTHETIC_BATCH_SESSIONS = 2000
+
+
+def synthetic_name(rng: random.Random) -> str:
+    return rng.choice(SURNAMES) + "".join(rng.choice(GIVEN_CHARS) for _ in range(rng.choice((1, 2))))
+
+
+def seed_synthetic(
+    total_responses: int,
+    seed: int = 0,
+    sessions_per_patient: int = 4,
+    start: datetime = datetime(2025, 1, 1, 9, 0, 0),
+) -> int:
+    """Bulk-insert ``total_responses`` scored SPMSQ responses into ``storage.DB_PATH``.
+
+    Sessions get a full question set (the last one may be partial), an
+    instrument score and name-gram rows, so reports, progress and name
+    searches behave as they would on production data. Deterministic for a
+    given ``seed``. Returns the number of sessions written.
+    """
+    questions = load_questions()
+    if not questions:
+        raise RuntimeError("No SPMSQ questions found.")
+    storage.init_db()
+    rng = random.Random(seed)
+    per_session = len(questions)
+    session_count = -(-total_responses // per_session)
+    patients = [
+        (f"synthetic-{index:06d}", synthetic_name(rng), rng.choice(("male", "female")), rng.randint(60, 95))
+        for index in range(max(1, session_count // sessions_per_patient))
+    ]
+    # Pre-rendered JSON per (question number, correct) keeps 1M-row seeds fast.
+    rule_json = {}
+    judge_json = {}
+    for idx in range(1, per_session + 1):
+        for is_correct in (True, False):
+            matched = [build_answer(idx, True)] if is_correct else []
+            rule_json[idx, is_correct] = json.dumps(
+                {"type": "mock", "is_correct": is_correct, "score": int(is_correct), "matched": matched},
+                ensure_ascii=False,
+            )
+            judge_json[idx, is_correct] = json.dumps(
+                {"is_correct": is_correct, "confidence": 0.9, "reason": "synthetic", "matched_expected": matched},
+                ensure_ascii=False,
+            )
+
+    conn = storage._connect()
+    remaining = total_responses
+    for batch_start in range(0, session_count, SYNTHETIC_BATCH_SESSIONS):
+        sessions, grams, responses, scores = [], [], [], []
+        for number in range(batch_start, min(session_count, batch_start + SYNTHETIC_BATCH_SESSIONS)):
+            patient_id, name, gender, age = patients[number % len(patients)]
+            session_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+            created = start + timedelta(minutes=7 * number)
+            created_at = created.strftime("%Y-%m-%d %H:%M:%S")
+            config = {"name": name, "gender": gender, "age": age, "seed_tag": "synthetic"}
+            sessions.append(
+                (session_id, patient_id, "spmsq", json.dumps(config, ensure_ascii=False), name, gender, age, created_at)
+            )
+            grams.extend((gram, created_at, session_id) for gram in storage._name_grams(name))
+            errors = 0
+            for idx, question in enumerate(questions[: min(per_session, remaining)], start=1):
+                is_correct = rng.random() < 0.75
+                errors += not is_correct
+                rt_vad = rng.uniform(600, 4000)
+                responses.append(
+                    (
+                        str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                        session_id,
+                        question["question_id"],
+                        build_answer(idx, is_correct),
+                        rt_vad + rng.uniform(200, 600),
+                        rt_vad,
+                        rt_vad + rng.uniform(-80, 80),
+                        rule_json[idx, is_correct],
+                        judge_json[idx, is_correct],
+                        (created + timedelta(seconds=idx * 41)).strftime("%Y-%m-%d %H:%M:%S"),
+                    )
+                )
+            remaining -= min(per_session, remaining)
+            band = "normal" if errors <= 2 else "mild" if errors <= 4 else "moderate" if errors <= 7 else "severe"
+            scores.append(
+                (
+                    str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                    session_id,
+                    errors,
+                    json.dumps({"errors": errors, "severity_band": band}),
+                    created_at,
+                )
+            )
+        with conn:
+            conn.executemany(
+                """
+                INSERT INTO sessions (
+                    id, patient_id, instrument, config_json, patient_name, patient_gender, patient_age, created_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                sessions,
+            )
+            conn.executemany("INSERT OR IGNORE INTO session_name_grams VALUES (?, ?, ?)", grams)
+            conn.executemany(
+                """
+                INSERT INTO responses (
+                    id, session_id, question_id, transcript, reaction_time_whisper_ms, reaction_time_vad_ms,
+                    reaction_time_server_vad_ms, rule_score_json, llm_judge_json, scoring_status, created_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'done', ?)
+                """,
+                responses,
+            )
+            conn.executemany(
+                """
+                INSERT INTO instrument_scores (id, session_id, instrument, score, interpretation_json, created_at)
+                VALUES (?, ?, 'SPMSQ', ?, ?, ?)
+                """,
+                scores,
+            )
+    return session_count
+
+
 def main() -> None:
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    parser = argparse.ArgumentParser(description="Seed mock SPMSQ sessions with full results.")
+    parser.add_argument("--db", type=Path, default=DB_PATH)
+    parser.add_argument(
+        "--synthetic-responses",
+        type=int,
+        default=0,
+        help="Instead of the two demo sessions, bulk-seed this many synthetic responses",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for --synthetic-responses")
+    args = parser.parse_args()
+
+    storage.DB_PATH = args.db
+    if args.synthetic_responses > 0:
+        sessions = seed_synthetic(args.synthetic_responses, seed=args.seed)
+        storage.close_connections()
+        print(f"Seeded {args.synthetic_responses} responses in {sessions} sessions into {args.db}")
+        return
+
     questions = load_questions()
     if not questions:
         raise RuntimeError("No SPMSQ questions found.")
 
-    conn = sqlite3.connect(DB_PATH)
+    storage.init_db()
+    storage.close_connections()
+    conn = sqlite3.connect(args.db)
+    conn.row_factory = sqlite3.Row
     try:
-        ensure_schema(conn)
         for spec in SESSIONS:
             seed_session(conn, spec, questions)
         conn.commit()
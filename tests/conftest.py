@@ -1,6 +1,18 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+from backend.app import storage  # noqa: E402
+
+
+@pytest.fixture()
+def temp_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "DB_PATH", tmp_path / "app.db")
+    storage.init_db()
+    yield storage.DB_PATH
+    storage.close_connections()
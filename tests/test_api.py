@@ -0,0 +1,151 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app import pipeline, uploads
+from backend.app.main import app
+
+WEBM_AUDIO = b"\x1a\x45\xdf\xa3" + b"\x00" * 60
+
+
+@pytest.fixture()
+def client(temp_db, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def _create_session(client) -> str:
+    response = client.post("/api/sessions", json={"patient_id": "p1", "instrument": "spmsq", "config": {}})
+    return response.json()["session_id"]
+
+
+def test_submit_response_with_answer_text(client, monkeypatch):
+    monkeypatch.setenv("COGSCREEN_DEBUG_TIMINGS", "1")
+    session_id = _create_session(client)
+    response = client.post(
+        f"/api/sessions/{session_id}/responses",
+        params={"question_id": "DAILY_Q11", "answer_text": "8 6 4"},
+        files={"audio": ("answer.webm", WEBM_AUDIO, "audio/webm")},
+    )
+    assert response.status_code == 200
+    assert response.json()["transcript"] == "8 6 4"
+    assert "rule;dur=" in response.headers["Server-Timing"]
+
+    progress = client.get(f"/api/sessions/{session_id}/progress").json()
+    assert progress["answered"] == 1
+    assert progress["pending_scoring"] == 0
+
+
+def test_empty_audio_is_scored_without_a_transcript(client, tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+
+    def no_transcription(*args, **kwargs):
+        raise AssertionError("empty audio must not be transcribed")
+
+    monkeypatch.setattr(pipeline, "transcribe_audio", no_transcription)
+    session_id = _create_session(client)
+    response = client.post(
+        f"/api/sessions/{session_id}/responses",
+        params={"question_id": "DAILY_Q11"},
+        files={"audio": ("answer.webm", b"", "audio/webm")},
+    )
+    assert response.status_code == 200
+    assert response.json()["transcript"] is None
+    assert response.json()["rule_score"] is None
+    assert not any((tmp_path / "data" / "uploads").iterdir())
+
+
+def test_report_is_cached_until_session_changes(client):
+    session_id = _create_session(client)
+    first = client.get(f"/api/sessions/{session_id}/report")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    not_modified = client.get(f"/api/sessions/{session_id}/report", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+
+    client.post(
+        f"/api/sessions/{session_id}/responses",
+        params={"question_id": "DAILY_Q11", "answer_text": "8 6 4"},
+        files={"audio": ("answer.webm", WEBM_AUDIO, "audio/webm")},
+    )
+    changed = client.get(f"/api/sessions/{session_id}/report", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert len(changed.json()["responses"]) == 1
+
+
+def test_batch_reports_and_progress(client):
+    first = _create_session(client)
+    second = _create_session(client)
+    client.post(
+        f"/api/sessions/{first}/responses",
+        params={"question_id": "DAILY_Q11", "answer_text": "8 6 4"},
+        files={"audio": ("answer.webm", WEBM_AUDIO, "audio/webm")},
+    )
+    ids = [first, second, "missing"]
+
+    reports = client.post("/api/reports:batch", json={"session_ids": ids}).json()
+    assert reports["missing"] == ["missing"]
+    assert reports["reports"][first] == client.get(f"/api/sessions/{first}/report").json()
+    assert reports["reports"][second]["responses"] == []
+
+    progress = client.post("/api/progress:batch", json={"session_ids": ids}).json()
+    assert progress["missing"] == ["missing"]
+    assert progress["progress"][first] == client.get(f"/api/sessions/{first}/progress").json()
+    assert progress["progress"][second]["answered"] == 0
+
+
+def test_patient_timeline_pagination(client):
+    session_ids = {_create_session(client) for _ in range(3)}
+    first = client.get("/api/patients/p1/timeline", params={"limit": 2}).json()
+    assert len(first["sessions"]) == 2
+    assert first["sessions"][0]["screening_risk_band"] == "none"
+
+    rest = client.get("/api/patients/p1/timeline", params={"limit": 2, "after": first["next_cursor"]}).json()
+    assert rest["next_cursor"] is None
+    assert {entry["session_id"] for entry in first["sessions"] + rest["sessions"]} == session_ids
+
+    assert client.get("/api/patients/p1/timeline", params={"after": "bogus"}).status_code == 400
+
+
+def test_list_sessions_keyset_pages_and_ndjson(client):
+    created = {_create_session(client) for _ in range(5)}
+
+    seen = []
+    after = None
+    while True:
+        params = {"limit": 2, **({"after": after} if after else {})}
+        page = client.get("/api/sessions", params=params)
+        seen.extend(item["session_id"] for item in page.json())
+        after = page.headers.get("X-Next-Cursor")
+        if not after:
+            break
+    assert len(seen) == 5 and set(seen) == created
+
+    export = client.get("/api/sessions", params={"format": "ndjson"})
+    assert export.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in export.text.splitlines()]
+    assert [line["session_id"] for line in lines] == seen
+    assert lines[0]["patient_name"] == "p1"
+
+    assert client.get("/api/sessions", params={"patient_name": "x", "after": after or "a,b"}).status_code == 400
+
+
+def test_oversized_upload_is_rejected_before_the_form_is_read(client):
+    session_id = _create_session(client)
+    response = client.post(
+        f"/api/sessions/{session_id}/responses",
+        params={"question_id": "DAILY_Q11"},
+        content=b"--x--\r\n",
+        headers={
+            "content-type": "multipart/form-data; boundary=x",
+            "content-length": str(uploads.MAX_AUDIO_BYTES + uploads.FORM_OVERHEAD_BYTES + 1),
+        },
+    )
+    assert response.status_code == 413
+    # A missing form field would have been a 422 had the body been parsed.
+    assert response.json()["detail"].startswith("Upload exceeds")
@@ -0,0 +1,45 @@
+import wave
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from backend.app import audio_preprocess  # noqa: E402
+
+
+def _write_stereo_wav(path, rate=44100, silence_s=1.0, tone_s=0.5, tail_s=0.5):
+    rng = np.random.default_rng(0)
+    noise = lambda seconds: rng.normal(0, 0.001, int(rate * seconds))  # noqa: E731
+    t = np.arange(int(rate * tone_s)) / rate
+    mono = np.concatenate([noise(silence_s), 0.5 * np.sin(2 * np.pi * 440 * t), noise(tail_s)])
+    stereo = np.repeat((mono * 32767).astype("<i2")[:, None], 2, axis=1)
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(2)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(rate)
+        wav_file.writeframes(stereo.tobytes())
+
+
+def test_preprocess_trims_and_downsamples(tmp_path):
+    source = tmp_path / "r1.wav"
+    _write_stereo_wav(source)
+
+    prepared = audio_preprocess.preprocess_for_transcription(source)
+
+    assert prepared is not None
+    assert prepared.lead_in_ms == pytest.approx(1000 - audio_preprocess.PAD_MS, abs=25)
+    assert prepared.duration_ms == pytest.approx(500 + 2 * audio_preprocess.PAD_MS, abs=50)
+    assert prepared.source_duration_ms == pytest.approx(2000, abs=5)
+    with wave.open(str(prepared.path), "rb") as wav_file:
+        assert (wav_file.getnchannels(), wav_file.getframerate()) == (1, 16000)
+
+
+def test_preprocess_skips_silence_and_undecodable_audio(tmp_path, monkeypatch):
+    silent = tmp_path / "silent.wav"
+    audio_preprocess.write_wav(silent, np.zeros(16000, dtype=np.float32))
+    assert audio_preprocess.preprocess_for_transcription(silent) is None
+
+    monkeypatch.setattr(audio_preprocess.shutil, "which", lambda name: None)
+    webm = tmp_path / "r2.webm"
+    webm.write_bytes(b"\x1a\x45\xdf\xa3" + b"\x00" * 64)
+    assert audio_preprocess.preprocess_for_transcription(webm) is None
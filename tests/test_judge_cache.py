@@ -0,0 +1,47 @@
+import datetime as dt
+import time
+from zoneinfo import ZoneInfo
+
+from backend.app import llm_judge, scoring_rules
+
+
+def test_judge_verdicts_are_memoized(monkeypatch):
+    calls = []
+
+    def fake_request(transcript, expected, rule_type, question_text, model):
+        calls.append(transcript)
+        return {"is_correct": True, "confidence": 0.9, "reason": "ok", "matched_expected": expected}
+
+    monkeypatch.setattr(llm_judge, "_request_judgement", fake_request)
+    monkeypatch.setattr(llm_judge, "JUDGE_CACHE", llm_judge.JudgeCache(max_entries=2, ttl_seconds=60))
+
+    llm_judge.judge_answer("台北 ", ["台北"], "contains_any", question_id="Q1")
+    llm_judge.judge_answer("  台北", ["台北"], "contains_any", question_id="Q1")
+    assert calls == ["台北 "]
+    assert llm_judge.JUDGE_CACHE.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+    llm_judge.judge_answer("台北", ["台北"], "contains_any", question_id="Q2")
+    llm_judge.judge_answer("台北", ["台北", "臺北"], "contains_any", question_id="Q1")
+    assert len(calls) == 3
+    assert llm_judge.JUDGE_CACHE.stats()["size"] == 2
+
+
+def test_judge_cache_expiry_and_lru():
+    cache = llm_judge.JudgeCache(max_entries=2, ttl_seconds=60)
+    cache.put(("a",), {"is_correct": True}, expires_at=time.time() - 1)
+    assert cache.get(("a",)) is None
+
+    cache.put(("b",), {"is_correct": True})
+    cache.put(("c",), {"is_correct": False})
+    cache.get(("b",))
+    cache.put(("d",), {"is_correct": True})
+    assert cache.get(("c",)) is None
+    assert cache.get(("b",)) == {"is_correct": True}
+
+
+def test_date_dependent_rules_expire_at_midnight():
+    now = dt.datetime(2026, 3, 18, 22, 15, tzinfo=ZoneInfo("Asia/Taipei"))
+    midnight = dt.datetime(2026, 3, 19, tzinfo=ZoneInfo("Asia/Taipei")).timestamp()
+    rule = {"type": "contains_any", "expected": ["__TODAY_WEEKDAY__"]}
+    assert scoring_rules.expectation_expiry(rule, {"now": now}) == midnight
+    assert scoring_rules.expectation_expiry({"type": "contains_any", "expected": ["台灣"]}, {"now": now}) is None
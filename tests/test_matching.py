@@ -0,0 +1,53 @@
+import random
+
+from backend.app.matching import FuzzyPattern, PatternMatcher
+
+
+def test_automaton_and_scan_agree_with_str_find():
+    rng = random.Random(7)
+    for _ in range(500):
+        patterns = [
+            "".join(rng.choice("藍色火車") for _ in range(rng.randint(0, 3))) for _ in range(rng.randint(1, 8))
+        ]
+        text = "".join(rng.choice("藍色火車悲傷 ") for _ in range(rng.randint(0, 20)))
+        expected = {p: (text.find(p), text.find(p) + len(p)) for p in patterns if p in text}
+        assert PatternMatcher(patterns, automaton=True).find(text) == expected
+        assert PatternMatcher(patterns, automaton=False).find(text) == expected
+
+
+def test_automaton_reports_overlapping_and_nested_patterns():
+    matcher = PatternMatcher(["台北", "台北市", "北市", "市政府", "高雄"], automaton=True)
+    assert matcher.find("我住台北市政府旁邊") == {
+        "台北": (2, 4),
+        "台北市": (2, 5),
+        "北市": (3, 5),
+        "市政府": (4, 7),
+    }
+
+
+def _lcs(a, b):
+    row = [0] * (len(b) + 1)
+    for x in a:
+        diagonal = 0
+        for j, y in enumerate(b, 1):
+            diagonal, row[j] = row[j], diagonal + 1 if x == y else max(row[j], row[j - 1])
+    return row[-1]
+
+
+def test_fuzzy_ratio_is_exact_indel_similarity_with_cutoff():
+    rng = random.Random(11)
+    for _ in range(500):
+        pattern = "".join(rng.choice("白紙寫黑字") for _ in range(rng.randint(1, 7)))
+        text = "".join(rng.choice("白紙真正寫黑字") for _ in range(rng.randint(0, 12)))
+        cutoff = rng.choice([0.0, 0.5, 0.7, 0.85])
+        exact = 2 * _lcs(pattern, text) / (len(pattern) + len(text))
+        assert FuzzyPattern(pattern).ratio(text, cutoff) == (exact if exact >= cutoff else 0.0)
+
+
+def test_partial_ratio_finds_the_best_window():
+    pattern = FuzzyPattern("白紙真正寫黑字")
+    answer = "嗯讓我想一下" * 5 + "白紙真的寫黑字" + "對就是這樣"
+    score, start, end = pattern.partial_ratio(answer, 0.7)
+    assert answer[start:end] == "白紙真的寫黑字"
+    assert score == 6 / 7
+    assert pattern.partial_ratio("嗯讓我想一下" * 5, 0.7) == (0.0, 0, 0)
@@ -0,0 +1,37 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.app import offload
+
+
+def test_run_stage_uses_worker_thread():
+    async def main():
+        return await offload.run_stage("judge", threading.get_ident)
+
+    assert asyncio.run(main()) != threading.get_ident()
+
+
+def test_run_stage_times_out(monkeypatch):
+    monkeypatch.setenv("COGSCREEN_SLOW_TIMEOUT_SECONDS", "0.05")
+
+    async def main():
+        await offload.run_stage("slow", time.sleep, 0.5)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(main())
+    offload.shutdown()
+
+
+def test_event_loop_stays_responsive():
+    async def main():
+        blocking = asyncio.ensure_future(offload.run_stage("transcribe", time.sleep, 0.2))
+        started = time.perf_counter()
+        await asyncio.sleep(0.01)
+        elapsed = time.perf_counter() - started
+        await blocking
+        return elapsed
+
+    assert asyncio.run(main()) < 0.1
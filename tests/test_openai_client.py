@@ -0,0 +1,16 @@
+from backend.app import openai_client
+
+
+def test_client_is_shared_until_closed(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("OPENAI_BASE_URL", "http://127.0.0.1:9/v1")
+    monkeypatch.setenv("OPENAI_MAX_RETRIES", "5")
+    client = openai_client.get_client()
+    try:
+        assert openai_client.get_client() is client
+        assert client.max_retries == 5
+        assert str(client.base_url).startswith("http://127.0.0.1:9/v1")
+    finally:
+        openai_client.close_clients()
+    assert openai_client.get_client() is not client
+    openai_client.close_clients()
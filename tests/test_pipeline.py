@@ -0,0 +1,207 @@
+import asyncio
+import threading
+import time
+import types
+from pathlib import Path
+
+import pytest
+
+from backend.app import openai_client, pipeline
+
+QUESTION = {
+    "question_id": "MMSE_Q6",
+    "text": "我們現在在哪一個國家？",
+    "scoring_rule": {"type": "contains_any", "expected": ["台灣", "臺灣"]},
+}
+
+
+@pytest.fixture()
+def judge_calls(monkeypatch):
+    calls = []
+
+    def fake_judge(transcript, expected, rule_type, question_text="", **kwargs):
+        calls.append(transcript)
+        return {"is_correct": True, "confidence": 0.9, "reason": "stub", "matched_expected": []}
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(pipeline, "judge_answer", fake_judge)
+    return calls
+
+
+def _score(answer: str, **kwargs):
+    return asyncio.run(pipeline.score_submission("s1", QUESTION, {}, "unused.webm", answer, **kwargs))
+
+
+def test_always_policy_runs_rule_and_judge(judge_calls, monkeypatch):
+    monkeypatch.setenv("COGSCREEN_JUDGE_POLICY", "always")
+    result = _score("在台灣")
+    assert result["rule_score"]["is_correct"] is True
+    assert result["llm_judge"]["reason"] == "stub"
+    assert set(result["timings"]) == {"rule", "judge"}
+    assert judge_calls == ["在台灣"]
+
+
+def test_skip_policy_trusts_conclusive_rule_score(judge_calls, monkeypatch):
+    monkeypatch.setenv("COGSCREEN_JUDGE_POLICY", "skip_conclusive")
+    result = _score("在台灣")
+    assert result["llm_judge"] is None
+    assert result["rule_score"]["conclusive"] is True
+    assert judge_calls == []
+
+    result = _score("不知道")
+    assert result["llm_judge"] is not None
+    assert judge_calls == ["不知道"]
+
+
+def test_defer_policy_returns_judge_arguments(judge_calls, monkeypatch):
+    monkeypatch.setenv("COGSCREEN_JUDGE_POLICY", "defer_conclusive")
+    result = _score("臺灣", allow_defer=True)
+    assert result["llm_judge"] is None
+    assert result["deferred_judge"]["transcript"] == "臺灣"
+    assert judge_calls == []
+
+    result = _score("臺灣")
+    assert result["deferred_judge"] is None
+    assert judge_calls == ["臺灣"]
+
+
+def test_local_rule_types_never_call_the_judge(judge_calls, monkeypatch):
+    monkeypatch.setenv("COGSCREEN_JUDGE_POLICY", "always")
+    question = {"question_id": "DAILY_Q11", "scoring_rule": {"type": "sequence", "expected": ["8", "6", "4"]}}
+    result = asyncio.run(pipeline.score_submission("s1", question, {}, "unused.webm", "八 六 三"))
+    assert result["rule_score"]["is_correct"] is False
+    assert result["rule_score"]["conclusive"] is True
+    assert result["llm_judge"] is None
+    assert judge_calls == []
+
+    question = {"question_id": "DAILY_Q3", "scoring_rule": {"type": "open_response"}}
+    result = asyncio.run(pipeline.score_submission("s1", question, {}, "unused.webm", "吃過了"))
+    assert result["rule_score"] is None
+    assert judge_calls == ["吃過了"]
+
+
+def test_server_timing_header():
+    assert pipeline.server_timing_header({"rule": 0.1, "judge": 812.5}) == "rule;dur=0.1, judge;dur=812.5"
+
+
+def test_transcribes_preprocessed_audio_and_restores_lead_in(judge_calls, temp_db, monkeypatch, tmp_path):
+    trimmed = tmp_path / "r1.16k.wav"
+    trimmed.write_bytes(b"pcm")
+    prepared = pipeline.audio_preprocess.PreparedAudio(trimmed, 800.0, 900.0, 2000.0)
+    monkeypatch.setattr(pipeline.audio_preprocess, "preprocess_for_transcription", lambda path: prepared)
+    sent = []
+
+    def fake_transcribe(path, audio_digest=None, **kwargs):
+        sent.append((path, audio_digest))
+        return {"text": "台灣", "words": [{"start": 0.2}]}
+
+    monkeypatch.setattr(pipeline, "transcribe_audio", fake_transcribe)
+    result = _score(None, audio_digest="upload-digest")
+
+    assert sent == [(str(trimmed), "upload-digest")]
+    assert result["reaction_time_whisper_ms"] == 1000.0
+    assert "preprocess" in result["timings"]
+    assert not trimmed.exists()
+
+
+def test_repeated_upload_skips_preprocessing(judge_calls, temp_db, monkeypatch, tmp_path):
+    monkeypatch.setattr(pipeline.audio_preprocess, "settings_key", lambda: "trim-v1")
+    preprocessed = []
+
+    def fake_preprocess(path):
+        trimmed = tmp_path / "r1.16k.wav"
+        trimmed.write_bytes(b"pcm")
+        preprocessed.append(path)
+        return pipeline.audio_preprocess.PreparedAudio(trimmed, 800.0, 900.0, 2000.0)
+
+    class FakeTranscriptions:
+        def create(self, **kwargs):
+            return {"text": "台灣", "words": [{"start": 0.2}]}
+
+    client = types.SimpleNamespace(audio=types.SimpleNamespace(transcriptions=FakeTranscriptions()))
+    monkeypatch.setattr(openai_client, "get_client", lambda: client)
+    monkeypatch.setattr(pipeline.audio_preprocess, "preprocess_for_transcription", fake_preprocess)
+
+    first = _score(None, audio_digest="upload-digest")
+    second = _score(None, audio_digest="upload-digest")
+    assert len(preprocessed) == 1
+    assert "preprocess" not in second["timings"]
+    assert second["reaction_time_whisper_ms"] == first["reaction_time_whisper_ms"] == 1000.0
+
+    monkeypatch.setattr(pipeline.audio_preprocess, "settings_key", lambda: "trim-v2")
+    _score(None, audio_digest="upload-digest")
+    assert len(preprocessed) == 2
+
+
+def test_always_policy_overlaps_judge_and_rule(judge_calls, monkeypatch):
+    monkeypatch.setenv("COGSCREEN_JUDGE_POLICY", "always")
+    judge_running = threading.Event()
+    fake_judge = pipeline.judge_answer
+    rule_score_for = pipeline.rule_score_for
+
+    def judge(*args, **kwargs):
+        judge_running.set()
+        return fake_judge(*args, **kwargs)
+
+    def slow_rule(compiled_rule, transcript):
+        # Only passes if the judge started before rule scoring finished.
+        assert judge_running.wait(timeout=5)
+        return rule_score_for(compiled_rule, transcript)
+
+    monkeypatch.setattr(pipeline, "judge_answer", judge)
+    monkeypatch.setattr(pipeline, "rule_score_for", slow_rule)
+    result = _score("在台灣")
+    assert result["rule_score"]["is_correct"] is True
+    assert judge_calls == ["在台灣"]
+
+
+def test_server_vad_overlaps_transcription(judge_calls, monkeypatch, tmp_path):
+    upload = tmp_path / "r1.webm"
+    upload.write_bytes(b"audio")
+    monkeypatch.setattr(pipeline.audio_preprocess, "PREPROCESS_ENABLED", False)
+    monkeypatch.setattr(pipeline.audio_preprocess, "is_available", lambda: True)
+    vad_running = threading.Event()
+
+    def fake_vad(path):
+        vad_running.set()
+        time.sleep(0.05)
+        return 420.0
+
+    def fake_transcribe(path, **kwargs):
+        # Only returns if the VAD stage started before transcription finished.
+        assert vad_running.wait(timeout=5)
+        return {"text": "台灣", "words": [{"start": 0.5}]}
+
+    monkeypatch.setattr(pipeline.reaction_time, "reaction_time_server_vad_ms", fake_vad)
+    monkeypatch.setattr(pipeline, "transcribe_audio", fake_transcribe)
+    result = asyncio.run(pipeline.score_submission("s1", QUESTION, {}, str(upload)))
+    assert result["reaction_time_server_vad_ms"] == 420.0
+    assert {"transcribe", "vad"} <= set(result["timings"])
+
+
+def test_trimmed_file_outlives_a_timed_out_transcription(judge_calls, monkeypatch, tmp_path):
+    trimmed = tmp_path / "r1.16k.wav"
+    trimmed.write_bytes(b"pcm")
+    prepared = pipeline.audio_preprocess.PreparedAudio(trimmed, 800.0, 900.0, 2000.0)
+    monkeypatch.setattr(pipeline.audio_preprocess, "preprocess_for_transcription", lambda path: prepared)
+    monkeypatch.setenv("COGSCREEN_TRANSCRIBE_TIMEOUT_SECONDS", "0.05")
+    release = threading.Event()
+    seen = []
+
+    def slow_transcribe(path, **kwargs):
+        release.wait(timeout=5)
+        seen.append(Path(path).read_bytes())
+        return {"text": "台灣"}
+
+    monkeypatch.setattr(pipeline, "transcribe_audio", slow_transcribe)
+    result = _score(None)
+    assert result["transcript"] is None
+    assert trimmed.exists()
+
+    release.set()
+    for _ in range(100):
+        if not trimmed.exists():
+            break
+        time.sleep(0.01)
+    assert seen == [b"pcm"]
+    assert not trimmed.exists()
@@ -0,0 +1,40 @@
+from backend.app import question_bank
+
+
+def test_question_bank_indexes_match_linear_helpers():
+    questions = question_bank.load_all_questions()
+    bank = question_bank.QuestionBank.from_questions(questions)
+
+    assert list(bank.for_instrument("spmsq")) == question_bank.filter_questions(questions, "spmsq")
+    assert bank.for_instrument(None) == bank.for_instrument(question_bank.DEFAULT_INSTRUMENT)
+    assert {question["instrument"] for question in bank.questions} == set(question_bank.INSTRUMENT_FILES)
+    assert bank.for_instrument("unknown") == ()
+    for question in questions:
+        assert bank.get(question["question_id"]) is question
+    assert bank.get("missing") is None
+
+
+def test_shared_question_bank_is_built_once():
+    assert question_bank.get_question_bank() is question_bank.get_question_bank()
+
+
+def test_registry_swaps_snapshot_when_file_changes(tmp_path):
+    path = tmp_path / "SPMSQ_questions.json"
+    path.write_text('[{"id": "Q1", "text": "今天星期幾？"}]', encoding="utf-8")
+    registry = question_bank.QuestionBankRegistry(tmp_path, {"spmsq": path.name})
+
+    first = registry.current()
+    assert [q["question_id"] for q in first.for_instrument("spmsq")] == ["Q1"]
+    assert registry.refresh() is False
+    assert registry.current() is first
+
+    path.write_text('[{"id": "Q1", "text": "今天星期幾？"}, {"id": "Q2", "text": "現在幾點？"}]', encoding="utf-8")
+    assert registry.refresh() is True
+    second = registry.current()
+    assert second.version != first.version
+    assert second.get("Q2")["text"] == "現在幾點？"
+    assert first.get("Q2") is None
+
+    path.write_text("[{broken", encoding="utf-8")
+    assert registry.refresh() is False
+    assert registry.current() is second
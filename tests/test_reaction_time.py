@@ -1,4 +1,6 @@
-from backend.app.reaction_time import reaction_time_whisper_ms
+import pytest
+
+from backend.app.reaction_time import reaction_time_whisper_ms, speech_onset_ms
 
 
 def test_reaction_time_from_words():
@@ -14,3 +16,21 @@ def test_reaction_time_from_segments():
 def test_reaction_time_none():
     transcription = {}
     assert reaction_time_whisper_ms(transcription) is None
+
+
+def test_reaction_time_adds_trimmed_lead_in():
+    transcription = {"words": [{"start": 0.2}]}
+    assert reaction_time_whisper_ms(transcription, offset_ms=800.0) == 1000.0
+
+
+def test_server_vad_finds_speech_onset_and_ignores_hiss():
+    np = pytest.importorskip("numpy")
+    rate = 16000
+    rng = np.random.default_rng(0)
+    hiss = rng.uniform(-0.02, 0.02, rate)  # quiet, high zero-crossing noise
+    t = np.arange(rate // 2) / rate
+    samples = np.concatenate([rng.normal(0, 0.001, rate // 2), hiss, 0.4 * np.sin(2 * np.pi * 220 * t)])
+
+    onset = speech_onset_ms(samples.astype(np.float32), rate)
+    assert onset == pytest.approx(1500, abs=20)
+    assert speech_onset_ms(np.zeros(rate, dtype=np.float32), rate) is None
@@ -0,0 +1,88 @@
+import asyncio
+import json
+
+from backend.app import pipeline, question_bank, rescoring, storage
+
+STALE = {"type": "unknown", "is_correct": False, "reason": "Unsupported scoring rule"}
+
+
+def _seed() -> None:
+    storage.create_session("s1", "p1", "spmsq", {"name": "王小明"})
+    answers = [
+        ("r1", "DAILY_Q11", "八 六 四", None),
+        ("r2", "DAILY_Q11", "八 五 四", None),
+        ("r3", "DAILY_Q12", "蘋果 鎖匙 火車", None),
+        ("r4", "DAILY_Q11", "八 六 四", {"is_correct": False, "reason": "judge"}),
+        ("r5", "DAILY_Q3", "吃過了", None),
+    ]
+    for response_id, question_id, transcript, judge in answers:
+        storage.save_response(response_id, "s1", question_id, transcript, None, None, None, STALE, judge)
+
+
+def _rule_scores() -> dict[str, dict | None]:
+    rows = storage.list_responses("s1")
+    return {row["id"]: json.loads(row["rule_score_json"]) if row["rule_score_json"] else None for row in rows}
+
+
+def test_rescore_rewrites_stale_scores_and_reports_flips(temp_db):
+    _seed()
+    preview = rescoring.rescore(workers=1, dry_run=True)
+    assert preview.changed == 5
+    assert _rule_scores()["r1"] == STALE
+    assert storage.get_rescore_run("default") is None
+
+    summary = rescoring.rescore(workers=1, chunk_size=2)
+    assert (summary.scanned, summary.scored, summary.changed) == (5, 5, 5)
+    assert summary.flips[("DAILY_Q11", False, True)] == 2
+    assert summary.flips[("DAILY_Q3", False, None)] == 1
+    # r4's LLM verdict outranks the rule score, so its flip is not visible in reports.
+    assert summary.report_flips == 3
+
+    scores = _rule_scores()
+    assert scores["r1"]["is_correct"] is True and scores["r1"]["conclusive"] is True
+    assert scores["r2"]["correct_count"] == 2
+    assert scores["r3"]["count"] == 3
+    assert scores["r5"] is None
+
+
+def test_rescore_resumes_from_checkpoint(temp_db):
+    _seed()
+    first = rescoring.rescore(workers=2, chunk_size=2)
+    checkpoint = storage.get_rescore_run("default")
+    assert checkpoint["last_rowid"] == first.last_rowid
+    assert checkpoint["scanned"] == 5
+
+    storage.save_response("r6", "s1", "DAILY_Q11", "十 八 六", None, None, None, None, None)
+    resumed = rescoring.rescore(workers=1)
+    assert resumed.started_after == first.last_rowid
+    assert (resumed.scanned, resumed.changed) == (1, 1)
+
+    assert rescoring.rescore(workers=1, restart=True).changed == 0
+
+
+def test_scores_stored_by_the_pipeline_are_unchanged(temp_db, monkeypatch):
+    # Scored with a judge configured; the re-scoring run has none.
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("COGSCREEN_JUDGE_POLICY", "skip_conclusive")
+    monkeypatch.setattr(pipeline, "judge_answer", lambda *args, **kwargs: None)
+    storage.create_session("s1", "p1", "mmse", {"name": "王小明"})
+    bank = question_bank.get_question_bank()
+    answers = [
+        ("MMSE_Q6", "在台灣"),
+        ("MMSE_Q13", "藍色 火車"),
+        ("MMSE_Q16", "白紙真的寫黑字"),
+        ("MMSE_Q12", "13 6 -1 -8 -15"),
+        ("DAILY_Q11", "八 六 四"),
+    ]
+    for index, (question_id, answer) in enumerate(answers):
+        result = asyncio.run(
+            pipeline.score_submission("s1", bank.get(question_id), {}, "unused.webm", answer)
+        )
+        storage.save_response(f"r{index}", "s1", question_id, answer, None, None, None, result["rule_score"], None)
+    stored = _rule_scores()
+    assert stored["r0"]["conclusive"] is True
+
+    monkeypatch.delenv("OPENAI_API_KEY")
+    monkeypatch.delenv("COGSCREEN_JUDGE_POLICY")
+    assert rescoring.rescore(workers=1).changed == 0
+    assert _rule_scores() == stored
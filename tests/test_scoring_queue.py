@@ -0,0 +1,93 @@
+import asyncio
+import sqlite3
+import threading
+
+from backend.app import pipeline, scoring_queue, storage
+
+
+def _queue_answer(response_id: str, answer_text: str) -> None:
+    storage.save_pending_response(
+        response_id=response_id,
+        session_id="s1",
+        question_id="DAILY_Q11",
+        reaction_time_vad_ms=850.0,
+        manual_confirmed=None,
+        audio_path="missing.webm",
+        answer_text=answer_text,
+    )
+
+
+def test_pending_response_is_scored_by_worker(temp_db, monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    storage.create_session("s1", "p1", "spmsq", {"name": "王小明"})
+    _queue_answer("r1", "八 六 四")
+    assert storage.count_pending_scoring("s1") == 1
+    assert storage.list_scoring_status("s1")[0]["scoring_status"] == "pending"
+
+    job = storage.claim_scoring_job()
+    assert job["response_id"] == "r1" and job["attempts"] == 1
+    assert storage.claim_scoring_job() is None
+    asyncio.run(scoring_queue.process_job(job))
+
+    row = storage.list_responses("s1")[0]
+    assert row["scoring_status"] == "done"
+    assert row["transcript"] == "八 六 四"
+    assert row["reaction_time_vad_ms"] == 850.0
+    assert storage.count_pending_scoring("s1") == 0
+
+
+def test_failed_job_is_retried_then_marked_failed(temp_db, monkeypatch):
+    async def boom(*args, **kwargs):
+        raise RuntimeError("upstream down")
+
+    monkeypatch.setattr(pipeline, "score_submission", boom)
+    monkeypatch.setattr(scoring_queue, "MAX_ATTEMPTS", 2)
+    storage.create_session("s1", "p1", "spmsq", {})
+    _queue_answer("r1", "8 6 4")
+
+    asyncio.run(scoring_queue.process_job(storage.claim_scoring_job()))
+    assert storage.list_scoring_status("s1")[0]["scoring_status"] == "pending"
+
+    asyncio.run(scoring_queue.process_job(storage.claim_scoring_job()))
+    status = storage.list_scoring_status("s1")[0]
+    assert status["scoring_status"] == "failed"
+    assert status["error"] == "upstream down"
+    assert storage.count_pending_scoring("s1") == 0
+
+
+def test_workers_survive_storage_errors_and_requeue_on_shutdown(temp_db, monkeypatch):
+    monkeypatch.setattr(scoring_queue, "ERROR_BACKOFF_SECONDS", 0)
+    monkeypatch.setenv("COGSCREEN_SCORING_WORKERS", "1")
+    started = asyncio.Event()
+
+    async def hang(*args, **kwargs):
+        started.set()
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(pipeline, "score_submission", hang)
+    claim = storage.claim_scoring_job
+    calls = []
+
+    def flaky_claim():
+        calls.append(threading.get_ident())
+        if len(calls) == 1:
+            raise sqlite3.OperationalError("database is locked")
+        return claim()
+
+    monkeypatch.setattr(storage, "claim_scoring_job", flaky_claim)
+    storage.create_session("s1", "p1", "spmsq", {})
+    _queue_answer("r1", "8 6 4")
+
+    async def run():
+        scoring_queue.start_workers()
+        await asyncio.wait_for(started.wait(), timeout=5)
+        await scoring_queue.stop_workers()
+
+    asyncio.run(run())
+    assert len(calls) >= 2
+    # Claims run on worker threads, never on the event loop.
+    assert threading.get_ident() not in calls
+    status = storage.list_scoring_status("s1")[0]
+    assert status["scoring_status"] == "pending"
+    assert status["attempts"] == 0
+    assert storage.claim_scoring_job()["response_id"] == "r1"
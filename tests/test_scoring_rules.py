@@ -0,0 +1,130 @@
+import datetime as dt
+from zoneinfo import ZoneInfo
+
+from backend.app import scoring_rules
+
+TAIPEI = ZoneInfo("Asia/Taipei")
+
+
+def test_compiled_rule_is_reused_until_the_rule_changes():
+    rule = {"type": "contains_all", "expected": ["藍色", "悲傷", "火車"]}
+    compiled = scoring_rules.compile_rule(rule)
+    assert scoring_rules.compile_rule(rule) is compiled
+    assert compiled.normalized == ("藍色", "悲傷", "火車")
+
+    result = compiled.score("藍色的火車")
+    assert result["matched"] == ["藍色", "火車"]
+    assert result["missing"] == ["悲傷"]
+    assert result["is_correct"] is False
+
+    rule["expected"].append("蘋果")
+    assert scoring_rules.compile_rule(rule) is not compiled
+    assert scoring_rules.score_answer("藍色 悲傷 火車 蘋果", rule)["is_correct"] is True
+
+
+def test_date_tokens_resolve_once_per_day():
+    rule = {"type": "contains_any", "expected": ["__TODAY_WEEKDAY__", "今天"]}
+    morning = {"now": dt.datetime(2026, 3, 18, 8, tzinfo=TAIPEI)}
+    evening = {"now": dt.datetime(2026, 3, 18, 21, tzinfo=TAIPEI)}
+    tomorrow = {"now": dt.datetime(2026, 3, 19, 8, tzinfo=TAIPEI)}
+
+    resolved = scoring_rules.prepare(rule, morning)
+    assert resolved.expected == ("星期三", "週三", "禮拜三", "今天")
+    assert scoring_rules.prepare(rule, evening) is resolved
+    assert scoring_rules.prepare(rule, tomorrow).expected[0] == "星期四"
+    assert resolved.score("應該是禮拜三")["matched"] == ["禮拜三"]
+
+
+def test_prepare_rule_keeps_dict_interface_and_skips_unresolved_tokens():
+    prepared, skip = scoring_rules.prepare_rule(
+        {"type": "contains_any", "expected": ["__PATIENT_AGE__", "72歲"]}, {"patient_age": 72}
+    )
+    assert prepared["expected"] == ["72", "72歲"]
+    assert skip is False
+
+    prepared, skip = scoring_rules.prepare_rule({"type": "contains_any", "expected": ["__PATIENT_PHONE__"]}, {})
+    assert prepared["expected"] == ["__PATIENT_PHONE__"]
+    assert skip is True
+
+
+def test_contains_spans_point_into_the_raw_transcript():
+    rule = {"type": "contains_any", "expected": ["Taipei 101", "台北"]}
+    answer = "  我去過  TAIPEI   101 和台北"
+    result = scoring_rules.score_answer(answer, rule)
+    assert result["matched"] == ["Taipei 101", "台北"]
+    assert [answer[start:end] for start, end in result["spans"]] == ["TAIPEI   101", "台北"]
+
+
+def test_fuzzy_threshold_and_partial_mode():
+    rule = {"type": "fuzzy", "expected": ["白紙真正寫黑字"], "threshold": 0.7}
+    assert scoring_rules.score_answer("白紙真的寫黑字", rule)["is_correct"] is True
+    miss = scoring_rules.score_answer("我不知道", rule)
+    assert miss["is_correct"] is False
+
+    rambling = "嗯讓我想一下，我記得是 白紙真的寫黑字 對"
+    assert scoring_rules.score_answer(rambling, rule)["is_correct"] is False
+    partial = scoring_rules.score_answer(rambling, {**rule, "mode": "partial"})
+    assert partial["is_correct"] is True
+    assert [rambling[start:end] for start, end in partial["spans"]] == ["白紙真的寫黑字"]
+
+
+def test_fuzzy_below_threshold_reports_the_closest_candidate():
+    expected = ["白紙真正寫黑字", "我不知"]
+    for partial in (False, True):
+        result = scoring_rules.score_fuzzy("我不太知道", expected, threshold=0.9, partial=partial)
+        assert result["is_correct"] is False
+        assert result["matched"] == ["我不知"]
+        assert 0.0 < result["score"] < 0.9
+        assert "spans" not in result
+
+    assert scoring_rules.score_fuzzy("你好", expected, threshold=0.7)["matched"] == []
+
+
+def test_extract_numbers_reads_digits_and_chinese_numerals():
+    assert scoring_rules.extract_numbers("8-6-4") == [8, 6, 4]
+    assert scoring_rules.extract_numbers("二十、十三、負一") == [20, 13, -1]
+    assert scoring_rules.extract_numbers("八六四") == [8, 6, 4]
+    assert scoring_rules.score_sequence_subtract("嗯 93 86 79 72 65", 93, -7)["is_correct"] is True
+
+
+def test_dynamic_date_and_time_period_are_conclusive():
+    context = {"now": dt.datetime(2026, 3, 18, 12, 30, tzinfo=TAIPEI)}
+    weekday = scoring_rules.prepare({"type": "dynamic_date", "expected": "weekday"}, context)
+    assert weekday.score("今天拜三")["is_correct"] is True
+    hedged = weekday.score("星期三還是星期四")
+    assert hedged["is_correct"] is False
+    assert hedged["contradicted"] == ["星期四"]
+
+    # The MMSE weekday item (contains_any) keeps the plain spellings and
+    # does not treat another weekday as a contradiction.
+    mmse = scoring_rules.prepare({"type": "contains_any", "expected": ["__TODAY_WEEKDAY__"]}, context)
+    assert mmse.score("今天拜三")["is_correct"] is False
+    assert mmse.score("星期三還是星期四")["is_correct"] is True
+
+    rule = {"type": "time_period", "expected": ["早上", "中午", "下午", "晚上"]}
+    noon = scoring_rules.prepare(rule, context)
+    assert noon.expected == ("中午", "下午")
+    assert noon.score("下午吧")["conclusive"] is True
+    assert noon.score("早上")["is_correct"] is False
+    night = scoring_rules.prepare(rule, {"now": dt.datetime(2026, 3, 18, 21, tzinfo=TAIPEI)})
+    assert night.expected == ("晚上",)
+
+
+def test_count_sequence_and_instruction_rules():
+    recall = {
+        "type": "contains_any_count",
+        "expected": ["蘋果", "鑰匙", "鎖匙", "火車"],
+        "groups": [["蘋果"], ["鑰匙", "鎖匙"], ["火車"]],
+        "score_by_count": True,
+    }
+    result = scoring_rules.score_answer("蘋果、鎖匙，還有鑰匙", recall)
+    assert (result["count"], result["score"], result["is_correct"]) == (2, 2, False)
+    assert result["missing"] == ["火車"]
+
+    sequence = {"type": "sequence", "expected": ["8", "6", "4"]}
+    assert scoring_rules.score_answer("十，八，六，四", sequence)["is_correct"] is True
+    assert scoring_rules.score_answer("八，五，四", sequence)["correct_count"] == 2
+
+    repeated = scoring_rules.score_answer("蘋果 火車", {"type": "instruction_only", "expected": ["蘋果", "火車"]})
+    assert repeated["is_correct"] is None
+    assert repeated["matched"] == ["蘋果", "火車"]
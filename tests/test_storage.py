@@ -0,0 +1,170 @@
+import re
+import sqlite3
+import threading
+
+from backend.app import storage
+
+
+def test_connection_is_reused_per_thread(temp_db):
+    assert storage._connect() is storage._connect()
+
+    other: list = []
+    thread = threading.Thread(target=lambda: other.append(storage._connect()))
+    thread.start()
+    thread.join()
+    assert other[0] is not storage._connect()
+
+
+def test_connection_pragmas(temp_db):
+    conn = storage._connect()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == storage.BUSY_TIMEOUT_MS
+
+
+def test_close_connections_reopens_lazily(temp_db):
+    storage.create_session("s1", "p1", "spmsq", {"name": "王小明"})
+    first = storage._connect()
+    storage.close_connections()
+    assert storage._connect() is not first
+    assert storage.get_session("s1")["patient_id"] == "p1"
+
+
+def _query_plan(sql: str, params: tuple) -> str:
+    rows = storage._connect().execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    return " | ".join(row["detail"] for row in rows)
+
+
+def _plan_indexes(plan: str) -> list[str]:
+    return re.findall(r"USING (?:COVERING )?INDEX (\w+)", plan)
+
+
+def test_migrations_record_schema_version(temp_db):
+    assert storage.schema_version() == storage.MIGRATIONS[-1][0]
+    storage.init_db()
+    assert storage.schema_version() == storage.MIGRATIONS[-1][0]
+
+
+def test_legacy_database_is_migrated(tmp_path, monkeypatch):
+    legacy = tmp_path / "legacy.db"
+    conn = sqlite3.connect(legacy)
+    conn.execute(
+        "CREATE TABLE responses (id TEXT PRIMARY KEY, session_id TEXT NOT NULL, "
+        "question_id TEXT NOT NULL, transcript TEXT, created_at TEXT DEFAULT CURRENT_TIMESTAMP)"
+    )
+    conn.close()
+    monkeypatch.setattr(storage, "DB_PATH", legacy)
+    try:
+        storage.init_db()
+        assert storage._has_column(storage._connect(), "responses", "manual_confirmed")
+    finally:
+        storage.close_connections()
+
+
+def test_session_queries_use_indexes(temp_db):
+    plan = _query_plan("SELECT * FROM responses WHERE session_id = ? ORDER BY created_at", ("s1",))
+    assert _plan_indexes(plan) == ["idx_responses_session_created"]
+    assert "TEMP B-TREE" not in plan
+
+    plan = _query_plan("SELECT * FROM instrument_scores WHERE session_id = ? ORDER BY created_at", ("s1",))
+    assert _plan_indexes(plan) == ["idx_instrument_scores_session_created"]
+
+    # The keyset migrations replaced the (patient_id, created_at) and
+    # (created_at) indexes with ones that end in id.
+    plan = _query_plan(
+        "SELECT id FROM sessions WHERE patient_id = ? ORDER BY created_at DESC LIMIT ?", ("p1", 10)
+    )
+    assert _plan_indexes(plan) == ["idx_sessions_patient_created_id"]
+    assert "TEMP B-TREE" not in plan
+
+    plan = _query_plan("SELECT id FROM sessions ORDER BY created_at DESC LIMIT ?", (10,))
+    assert _plan_indexes(plan) == ["idx_sessions_created_id"]
+
+
+def test_list_sessions_name_search(temp_db):
+    storage.create_session("s1", "p1", "spmsq", {"name": "王小明", "gender": "male", "age": "72"})
+    storage.create_session("s2", "p2", "spmsq", {"name": "小明"})
+    storage.create_session("s3", "p3", "spmsq", {"name": "陳大華"})
+
+    ids = [row["id"] for row in storage.list_sessions(patient_name="小明")]
+    assert ids == ["s2", "s1"]
+    assert [row["id"] for row in storage.list_sessions(patient_name="華")] == ["s3"]
+    assert storage.list_sessions(patient_name="林") == []
+
+    row = storage.list_sessions(patient_id="p1", patient_name="王")[0]
+    assert (row["patient_name"], row["patient_gender"], row["patient_age"]) == ("王小明", "male", 72)
+
+
+def test_patient_columns_are_backfilled(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "DB_PATH", tmp_path / "app.db")
+    monkeypatch.setattr(storage, "MIGRATIONS", storage.MIGRATIONS[:2])
+    storage.init_db()
+    with storage._connect() as conn:
+        conn.execute(
+            "INSERT INTO sessions (id, patient_id, config_json) VALUES (?, ?, ?)",
+            ("old", "p1", '{"name": "林美玲", "gender": "female"}'),
+        )
+    monkeypatch.undo()
+    monkeypatch.setattr(storage, "DB_PATH", tmp_path / "app.db")
+    try:
+        storage.init_db()
+        assert [row["id"] for row in storage.list_sessions(patient_name="美玲")] == ["old"]
+    finally:
+        storage.close_connections()
+
+
+def test_partial_name_search_uses_gram_index(temp_db):
+    plan = _query_plan(
+        "SELECT s.id FROM session_name_grams g JOIN sessions s ON s.id = g.session_id "
+        "WHERE g.gram = ? AND instr(s.patient_name, ?) > 0 ORDER BY g.created_at DESC LIMIT ?",
+        ("小明", "小明", 10),
+    )
+    assert "SCAN" not in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_report_cache_invalidated_by_response_write(temp_db):
+    session_id = "s1"
+    storage.create_session(session_id, "p1", "spmsq", {})
+    revision = storage.get_session_revision(session_id)
+    storage.save_cached_report(session_id, revision, "v1", "etag", "{}")
+    assert storage.get_cached_report(session_id)["etag"] == "etag"
+
+    storage.save_response("r1", session_id, "Q1", "answer", None, None, None, None, None)
+    assert storage.get_session_revision(session_id) == revision + 1
+    assert storage.get_cached_report(session_id) is None
+
+
+def test_patient_timeline_aggregates_and_pages(temp_db):
+    for session_id in ("s1", "s2", "s3"):
+        storage.create_session(session_id, "p1", "spmsq", {})
+    storage.create_session("other", "p2", "spmsq", {})
+    storage.save_response("r1", "s3", "Q1", "a", 900.0, 800.0, True, None, {"is_correct": False})
+    storage.save_response("r2", "s3", "Q2", "b", 1500.0, None, None, None, {"is_correct": False})
+    storage.save_response(
+        "r3", "s3", "Q3", "c", 1200.0, 1000.0, None, {"is_correct": True, "conclusive": True}, None
+    )
+    storage.save_response("r4", "s3", "Q4", "d", None, None, None, {"is_correct": True}, None)
+
+    first = storage.list_patient_timeline("p1", limit=2)
+    assert [row["id"] for row in first] == ["s3", "s2"]
+    assert (first[0]["answered"], first[0]["correct"], first[0]["incorrect"]) == (4, 2, 1)
+    assert sorted(float(v) for v in first[0]["reaction_times_whisper"].split(",")) == [900.0, 1200.0, 1500.0]
+
+    cursor = storage.decode_cursor(storage.encode_cursor(first[-1]["created_at"], first[-1]["id"]))
+    rest = storage.list_patient_timeline("p1", after=cursor, limit=2)
+    assert [row["id"] for row in rest] == ["s1"]
+    assert rest[0]["answered"] == 0 and rest[0]["reaction_times_vad"] is None
+
+
+def test_iter_sessions_pages_through_ties(temp_db):
+    for index in range(7):
+        storage.create_session(f"s{index}", "p1", "spmsq", {})
+    ids = [row["id"] for row in storage.iter_sessions(batch_size=3)]
+    assert ids == [f"s{index}" for index in reversed(range(7))]
+
+    plan = _query_plan(
+        "SELECT id FROM sessions WHERE (created_at, id) < (?, ?) ORDER BY created_at DESC, id DESC LIMIT ?",
+        ("2026-01-01", "x", 10),
+    )
+    assert "idx_sessions_created_id" in plan
+    assert "TEMP B-TREE" not in plan
@@ -0,0 +1,41 @@
+import types
+
+from backend.app import openai_client, storage, transcribe
+
+
+def _install_fake_openai(monkeypatch, calls):
+    class FakeTranscriptions:
+        def create(self, **kwargs):
+            calls.append(kwargs["model"])
+            return {"text": "星期三", "words": [{"word": "星期三", "start": 0.8}]}
+
+    client = types.SimpleNamespace(audio=types.SimpleNamespace(transcriptions=FakeTranscriptions()))
+    monkeypatch.setattr(openai_client, "get_client", lambda: client)
+
+
+def test_identical_audio_is_transcribed_once(temp_db, tmp_path, monkeypatch):
+    calls = []
+    _install_fake_openai(monkeypatch, calls)
+    first = tmp_path / "a.webm"
+    second = tmp_path / "b.webm"
+    first.write_bytes(b"same audio")
+    second.write_bytes(b"same audio")
+
+    assert transcribe.transcribe_audio(str(first))["text"] == "星期三"
+    assert transcribe.transcribe_audio(str(second))["words"][0]["start"] == 0.8
+    assert calls == ["whisper-1"]
+
+    transcribe.transcribe_audio(str(first), language="zh")
+    assert len(calls) == 2
+
+
+def test_cache_eviction_by_size_and_age(temp_db):
+    for index in range(3):
+        storage.put_cached_transcription(f"hash{index}", "whisper-1", "", "[]", {"text": "x" * 100})
+    storage.get_cached_transcription("hash0", "whisper-1", "", "[]")
+
+    assert storage.evict_transcription_cache(max_bytes=250, max_age_seconds=3600) == 1
+    assert storage.get_cached_transcription("hash1", "whisper-1", "", "[]") is None
+    assert storage.get_cached_transcription("hash0", "whisper-1", "", "[]") is not None
+
+    assert storage.evict_transcription_cache(max_bytes=10_000, max_age_seconds=-1) == 2
@@ -0,0 +1,44 @@
+import asyncio
+import hashlib
+import io
+
+import pytest
+from fastapi import UploadFile
+
+from backend.app import uploads
+
+WAV_HEADER = b"RIFF\x24\x00\x00\x00WAVEfmt "
+
+
+def _save(tmp_path, content, name="r1", max_bytes=1024):
+    upload = UploadFile(io.BytesIO(content), filename="client-name.webm")
+    return asyncio.run(
+        uploads.save_upload(upload, tmp_path, name, kinds=uploads.AUDIO_KINDS, max_bytes=max_bytes)
+    )
+
+
+def test_save_upload_streams_hashes_and_names_by_kind(tmp_path, monkeypatch):
+    monkeypatch.setattr(uploads, "CHUNK_SIZE", 7)
+    content = WAV_HEADER + b"\x01" * 100
+    stored = _save(tmp_path, content)
+    assert stored.path == tmp_path / "r1.wav"
+    assert stored.path.read_bytes() == content
+    assert (stored.size, stored.kind) == (len(content), "wav")
+    assert stored.sha256 == hashlib.sha256(content).hexdigest()
+
+
+@pytest.mark.parametrize(
+    ("content", "status"),
+    [(WAV_HEADER + b"\x00" * 2000, 413), (b"<html>not audio</html>", 415), (b"", 400)],
+)
+def test_save_upload_rejects_without_leaving_files(tmp_path, content, status):
+    with pytest.raises(uploads.UploadError) as excinfo:
+        _save(tmp_path, content)
+    assert excinfo.value.status_code == status
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_sniff_kind_recognizes_images():
+    assert uploads.sniff_kind(b"\x89PNG\r\n\x1a\n\x00") == "png"
+    assert uploads.sniff_kind(b"RIFF\x00\x00\x00\x00WEBPVP8 ") == "webp"
+    assert uploads.sniff_kind(b"\x00\x00\x00\x20ftypM4A ") == "mp4"